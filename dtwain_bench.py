@@ -0,0 +1,1182 @@
+# name: dtwain_bench
+# author: joshua dwight
+# github/jadwight
+
+# this module times the stages of dtwain_pull so changes to the refresh path can be compared.
+
+# usage: python dtwain_bench.py [search_path]
+#        python dtwain_bench.py clone [repo_url]
+#        python dtwain_bench.py pipeline [repo_url]
+#        python dtwain_bench.py verify [variant_folder]
+#        python dtwain_bench.py delta [block_size ...]
+#        python dtwain_bench.py resume [failures]
+#        python dtwain_bench.py constants [repeat]
+#        python dtwain_bench.py variants [repeat]
+#        python dtwain_bench.py flags [distinct_masks]
+#        python dtwain_bench.py twaininfo [twaininfo.txt]
+#        python dtwain_bench.py states [sessions]
+#        python dtwain_bench.py fetch [--size BYTES] [--files N] [--output results.json] [--compare baseline.json]
+
+# imports
+import os
+import sys
+import time
+import shutil
+import zipfile
+import tempfile
+import asyncio
+import json
+import argparse
+import contextlib
+import multiprocessing
+import random
+import zlib
+import runpy
+import subprocess
+
+import git
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS and block I/O are then not reported
+    resource = None
+
+import dtwain_pull
+import dtwain_constants
+import dtwain_flags
+import dtwain_twaininfo
+import dtwain_states
+
+def time_call(func, *args, repeat=5):
+    """
+    Run a callable several times and keep the best wall-clock time.
+
+    Parameters:
+        func (callable): The function to time.
+        *args: Arguments passed to func.
+        repeat (int): How many times to run func.
+
+    Returns:
+        tuple: (best time in seconds, result of the last call).
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+def per_file_walk(manifests, search_path):
+    # The original lookup: one os.walk per manifest entry
+    return {
+        variant: {name: dtwain_pull.locate_file(name, search_path) for name in files}
+        for variant, files in manifests.items()
+    }
+
+def classify_tree(manifests, search_path):
+    # One walk, one compiled matcher, one pass over the file names
+    index = dtwain_pull.build_file_index(search_path)
+    return dtwain_pull.classify_files(dtwain_pull.compile_manifests(manifests), index)
+
+def bench_locators(search_path, manifests=None, repeat=5):
+    """
+    Compare one os.walk per manifest file against a single indexed walk, and against
+    classifying the indexed names with the compiled manifest matcher.
+
+    Parameters:
+        search_path (str): The checkout to search, normally ./twain_library.
+        manifests (dict): Variant manifests; defaults to dtwain_pull.dtwain_manifests.
+        repeat (int): How many times to run each locator.
+
+    Returns:
+        dict: Best time in seconds for each locator, and whether their results agree.
+    """
+    if manifests is None:
+        manifests = dtwain_pull.dtwain_manifests
+
+    walk_time, walk_result = time_call(per_file_walk, manifests, search_path, repeat=repeat)
+    index_time, index_result = time_call(dtwain_pull.resolve_manifests, manifests, search_path, repeat=repeat)
+    classify_time, _ = time_call(classify_tree, manifests, search_path, repeat=repeat)
+
+    return {
+        "lookups": sum(len(files) for files in manifests.values()),
+        "per_file_walk": walk_time,
+        "indexed": index_time,
+        "classified": classify_time,
+        "results_match": walk_result == index_result,
+    }
+
+def directory_size(path):
+    """
+    Add up the size of every file below a directory.
+
+    Parameters:
+        path (str): The directory to measure.
+
+    Returns:
+        int: The total size in bytes.
+    """
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if not os.path.islink(file_path):
+                total += os.path.getsize(file_path)
+    return total
+
+def write_release_archive(zip_file_path, binaries, binary_size, extra_members=0):
+    # A release_libraries.zip with random (incompressible) binaries and optional unrelated members
+    with zipfile.ZipFile(zip_file_path, "w") as zip_ref:
+        for name in binaries:
+            zip_ref.writestr(f"release_libraries/{name}", os.urandom(binary_size))
+        for number in range(extra_members):
+            zip_ref.writestr(f"release_libraries/extra/extra{number}.bin", os.urandom(binary_size))
+
+def make_bare_repository(path, commits=5, binary_size=2 * 1024 * 1024, manifests=None, source_files=50,
+                         extra_members=0):
+    """
+    Build a local bare repository shaped like twain_library, for offline benchmarks.
+
+    Every commit rewrites release_libraries.zip with new random binaries, so the history
+    carries weight that a shallow or partial clone can skip. Commit N is tagged v1.0.N.
+
+    Parameters:
+        path (str): The directory to create; the bare repository is written to path/twain_library.git.
+        commits (int): How many commits to create.
+        binary_size (int): Size in bytes of each fake binary in the archive.
+        manifests (dict): Variant manifests; defaults to dtwain_pull.dtwain_manifests.
+        source_files (int): How many unrelated 16 KiB source files to add outside the manifests.
+        extra_members (int): How many unrelated binary_size members to add to the archive.
+
+    Returns:
+        str: A file:// URL for the bare repository.
+    """
+    if manifests is None:
+        manifests = dtwain_pull.dtwain_manifests
+
+    work_path = os.path.join(path, "work")
+    bare_path = os.path.join(path, "twain_library.git")
+    repo = git.Repo.init(work_path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "dtwain bench")
+        config.set_value("user", "email", "bench@localhost")
+
+    names = dtwain_pull.sparse_checkout_paths(manifests)
+    binaries = [name for name in names if name.endswith((".dll", ".lib", ".pdb"))]
+    resources = [name for name in names if name not in binaries and name != "release_libraries.zip"]
+
+    # Unrelated sources and documentation that the sparse checkout should leave out
+    for number in range(source_files):
+        source_dir = os.path.join(work_path, "source", f"module{number}")
+        os.makedirs(source_dir, exist_ok=True)
+        with open(os.path.join(source_dir, "module.cpp"), "wb") as source_file:
+            source_file.write(os.urandom(16 * 1024))
+
+    for name in resources:
+        resource_dir = os.path.join(work_path, "text_resources" if name.endswith(".txt") else "python")
+        os.makedirs(resource_dir, exist_ok=True)
+        with open(os.path.join(resource_dir, name), "w") as resource_file:
+            resource_file.write(f"{name}\n")
+
+    binaries_dir = os.path.join(work_path, "binaries")
+    os.makedirs(binaries_dir, exist_ok=True)
+    for number in range(commits):
+        write_release_archive(os.path.join(binaries_dir, "release_libraries.zip"), binaries, binary_size,
+                              extra_members)
+        repo.git.add(A=True)
+        repo.index.commit(f"release {number}")
+        repo.create_tag(f"v1.0.{number}")
+
+    git.Repo.clone_from(work_path, bare_path, bare=True)
+    with git.Repo(bare_path).config_writer() as config:
+        # Needed for blob-less clones over file://
+        config.set_value("uploadpack", "allowFilter", "true")
+    shutil.rmtree(work_path)
+    return "file://" + os.path.abspath(bare_path).replace(os.sep, "/")
+
+def push_release(repo_url, binary_size=2 * 1024 * 1024, manifests=None, extra_members=0):
+    """
+    Add one more release commit to a repository made by make_bare_repository.
+
+    Parameters:
+        repo_url (str): The file:// URL returned by make_bare_repository.
+        binary_size (int): Size in bytes of each fake binary in the archive.
+        manifests (dict): Variant manifests; defaults to dtwain_pull.dtwain_manifests.
+        extra_members (int): How many unrelated members to add to the archive.
+    """
+    if manifests is None:
+        manifests = dtwain_pull.dtwain_manifests
+    binaries = [name for name in dtwain_pull.sparse_checkout_paths(manifests)
+                if name.endswith((".dll", ".lib", ".pdb"))]
+    with tempfile.TemporaryDirectory() as work_path:
+        repo = git.Repo.clone_from(repo_url, work_path)
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "dtwain bench")
+            config.set_value("user", "email", "bench@localhost")
+        write_release_archive(os.path.join(work_path, "binaries", "release_libraries.zip"), binaries,
+                              binary_size, extra_members)
+        repo.git.add(A=True)
+        repo.index.commit(f"release {len(list(repo.iter_commits()))}")
+        repo.remote().push()
+
+def bench_clone_strategies(repo_url, strategies=None, manifests=None):
+    """
+    Clone a repository once with each clone strategy, measure it and check that the checkout
+    holds the release archive and every required manifest file.
+
+    Parameters:
+        repo_url (str): The repository to clone; use a file:// URL for local repositories.
+        strategies (list): Strategy names; defaults to every key of dtwain_pull.CLONE_STRATEGIES.
+        manifests (dict): Variant manifests used for the sparse paths.
+
+    Returns:
+        dict: Maps each strategy to its wall-clock seconds, bytes on disk and the required files
+            it left out (empty when complete).
+    """
+    if strategies is None:
+        strategies = list(dtwain_pull.CLONE_STRATEGIES)
+    if manifests is None:
+        manifests = dtwain_pull.dtwain_manifests
+    sparse_paths = dtwain_pull.sparse_checkout_paths(manifests)
+
+    results = {}
+    for strategy in strategies:
+        with tempfile.TemporaryDirectory() as clone_root:
+            local_path = os.path.join(clone_root, "twain_library")
+            start = time.perf_counter()
+            progress = dtwain_pull.Progress(dtwain_pull.SilentProgressSink())
+            dtwain_pull.clone_repository(repo_url, local_path, strategy, sparse_paths, progress)
+            elapsed = time.perf_counter() - start
+            index = dtwain_pull.build_file_index(local_path)
+            missing = [] if "release_libraries.zip" in index else ["release_libraries.zip"]
+            for patterns in dtwain_pull.classify_checkout(manifests, local_path, "release_libraries.zip", index)[1].values():
+                missing.extend(patterns)
+            results[strategy] = {
+                "seconds": elapsed,
+                "bytes_on_disk": directory_size(local_path),
+                "git_bytes": directory_size(os.path.join(local_path, ".git")),
+                "missing": missing,
+            }
+    return results
+
+def print_clone_results(repo_url, results):
+    print(f"Cloning {repo_url}")
+    for strategy, numbers in results.items():
+        print(f"  {strategy:8} {numbers['seconds'] * 1000:9.1f} ms"
+              f"  {numbers['bytes_on_disk'] / 1024:10.0f} KiB on disk"
+              f"  ({numbers['git_bytes'] / 1024:.0f} KiB in .git)"
+              + (f"  MISSING {', '.join(numbers['missing'])}" if numbers["missing"] else ""))
+
+def published_snapshot(manifests, state_path=dtwain_pull.STATE_FILE):
+    """
+    Capture what a refresh delivered, for comparing two runs.
+
+    Parameters:
+        manifests (dict): The variant manifests of the run.
+        state_path (str): The state file the run wrote.
+
+    Returns:
+        dict: The SHA-256 of every file of every variant folder, the size and SHA-256 each
+            integrity manifest records (mtimes differ between runs), and the state file.
+    """
+    snapshot = {"folders": {}, "manifests": {}, "state": None}
+    for variant in manifests:
+        if not os.path.isdir(variant):
+            continue
+        snapshot["folders"][variant] = dtwain_pull.folder_hashes(variant)
+        try:
+            with open(os.path.join(variant, dtwain_pull.INTEGRITY_MANIFEST), 'r') as manifest_file:
+                files = json.load(manifest_file)["files"]
+            snapshot["manifests"][variant] = {name: (entry["size"], entry["sha256"]) for name, entry in files.items()}
+        except (OSError, ValueError, KeyError):
+            snapshot["manifests"][variant] = None
+    try:
+        with open(state_path, 'r') as state_file:
+            snapshot["state"] = json.load(state_file)
+    except (OSError, ValueError):
+        pass
+    return snapshot
+
+def bench_pipelines(repo_url, strategy="shallow", manifests=None):
+    """
+    Run a cold refresh into an empty directory with run_stages and with run_pipeline_async, and
+    check that both publish the same folders and state file.
+
+    Parameters:
+        repo_url (str): The repository to refresh from; use a file:// URL for local repositories.
+        strategy (str): The clone strategy.
+        manifests (dict): Variant manifests; defaults to dtwain_pull.dtwain_manifests.
+
+    Returns:
+        dict: Maps "stages" and "async" to the run's timings, total seconds and whether what it
+            published matches the run_stages run.
+    """
+    if manifests is None:
+        manifests = dtwain_pull.dtwain_manifests
+
+    results = {}
+    snapshots = {}
+    cwd = os.getcwd()
+    for mode in ("stages", "async"):
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            try:
+                run = dtwain_pull.new_run(manifests, repo_url, strategy=strategy,
+                                          progress=dtwain_pull.Progress(dtwain_pull.SilentProgressSink()))
+                start = time.perf_counter()
+                if mode == "async":
+                    asyncio.run(dtwain_pull.run_pipeline_async(run))
+                else:
+                    dtwain_pull.run_stages(run, ("fetch", "extract", "package", "publish"))
+                results[mode] = {"seconds": time.perf_counter() - start, "timings": run["timings"]}
+                snapshots[mode] = published_snapshot(manifests)
+            finally:
+                os.chdir(cwd)
+    for mode, numbers in results.items():
+        numbers["matches"] = snapshots[mode] == snapshots["stages"] and bool(snapshots[mode]["folders"])
+    return results
+
+def bench_verify(folder, repeat=5):
+    """
+    Compare the size-and-mtime verify of a variant folder against re-hashing every file.
+
+    Parameters:
+        folder (str): A packaged variant folder with an integrity manifest.
+        repeat (int): How many times to run each verify.
+
+    Returns:
+        dict: Best time in seconds for each rehash mode, and the number of files checked.
+    """
+    results = {}
+    for rehash in ("suspect", "all"):
+        seconds, report = time_call(dtwain_pull.verify_integrity, folder, rehash, repeat=repeat)
+        results[rehash] = seconds
+    results["files"] = len(report["ok"]) + len(report["modified"])
+    return results
+
+def process_io():
+    """
+    Read the I/O counters of this process and the children it has waited for.
+
+    Returns:
+        dict: "rchar"/"wchar" (bytes passed through read and write calls) and
+            "read_bytes"/"write_bytes" (bytes fetched from or sent to storage). Counters the
+            platform does not provide are missing.
+    """
+    counters = {}
+    try:
+        with open("/proc/self/io", "r") as io_file:
+            for line in io_file:
+                name, _, value = line.partition(":")
+                if name in ("rchar", "wchar", "read_bytes", "write_bytes"):
+                    counters[name] = int(value)
+    except OSError:
+        if resource is not None:
+            # Block counts are in 512-byte units
+            usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+            counters["read_bytes"] = sum(u.ru_inblock for u in usage) * 512
+            counters["write_bytes"] = sum(u.ru_oublock for u in usage) * 512
+    return counters
+
+def peak_rss(who):
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def stage_worker(connection, func, args, cwd):
+    # Runs in a fresh process so the peak RSS and I/O counters belong to this stage alone
+    os.chdir(cwd)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        before = process_io()
+        start = time.perf_counter()
+        func(*args)
+        seconds = time.perf_counter() - start
+        after = process_io()
+    result = {"seconds": seconds}
+    for name, value in after.items():
+        result[name] = value - before.get(name, 0)
+    if resource is not None:
+        result["peak_rss"] = peak_rss(resource.RUSAGE_SELF)
+        result["peak_child_rss"] = peak_rss(resource.RUSAGE_CHILDREN)
+    connection.send(result)
+    connection.close()
+
+def measure_stage(func, args, cwd):
+    """
+    Run one stage in a child process and measure it.
+
+    Parameters:
+        func (callable): A module-level function, so it can be sent to the child.
+        args (tuple): Arguments passed to func.
+        cwd (str): The working directory of the child; variant folders are written there.
+
+    Returns:
+        dict: "seconds", the I/O counters from process_io, "peak_rss" (bytes, the Python process)
+            and "peak_child_rss" (bytes, the largest git subprocess).
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    child = multiprocessing.Process(target=stage_worker, args=(sender, func, args, cwd))
+    child.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        child.join()
+        raise RuntimeError(f"{func.__name__} failed in the benchmark child (exit code {child.exitcode})")
+    child.join()
+    return result
+
+def copy_all_manifests(manifests, search_path):
+    # The original packaging pass: one search_and_copy_file per manifest entry
+    return dtwain_pull.copy_manifests(manifests, search_path)
+
+def bench_fetch_stages(repo_url, strategy="shallow", binary_size=2 * 1024 * 1024, extra_members=0,
+                       manifests=None):
+    """
+    Measure each stage of the refresh path against a repository: the first clone, a pull with
+    nothing new, a pull after a new release, indexing the checkout, streaming the manifest
+    members out of the archive, the original full search_and_extract_file, and copying every
+    manifest file with search_and_copy_file.
+
+    Parameters:
+        repo_url (str): A file:// URL from make_bare_repository; a release is pushed to it.
+        strategy (str): The clone strategy.
+        binary_size (int): Size in bytes of each fake binary in the pushed release.
+        extra_members (int): Unrelated archive members in the pushed release.
+        manifests (dict): Variant manifests; defaults to dtwain_pull.dtwain_manifests.
+
+    Returns:
+        dict: Maps each stage name to its measurements from measure_stage.
+    """
+    if manifests is None:
+        manifests = dtwain_pull.dtwain_manifests
+    sparse_paths = dtwain_pull.sparse_checkout_paths(manifests)
+    progress = dtwain_pull.Progress(dtwain_pull.SilentProgressSink())
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        checkout = os.path.join(work_dir, "twain_library")
+        zip_file_path = os.path.join(checkout, "binaries", "release_libraries.zip")
+        pull_args = (repo_url, checkout, strategy, sparse_paths, progress)
+
+        results["clone"] = measure_stage(dtwain_pull.pull_latest_from_repository, pull_args, work_dir)
+        results["pull_unchanged"] = measure_stage(dtwain_pull.pull_latest_from_repository, pull_args, work_dir)
+        push_release(repo_url, binary_size, manifests, extra_members)
+        results["pull_changed"] = measure_stage(dtwain_pull.pull_latest_from_repository, pull_args, work_dir)
+        results["index"] = measure_stage(dtwain_pull.build_file_index, (checkout,), work_dir)
+        results["extract_stream"] = measure_stage(dtwain_pull.stream_manifest_members,
+                                                  (zip_file_path, manifests), work_dir)
+        results["extract_all"] = measure_stage(dtwain_pull.search_and_extract_file,
+                                               ("release_libraries.zip", checkout), work_dir)
+        results["copy"] = measure_stage(copy_all_manifests, (manifests, checkout), work_dir)
+    return results
+
+def compare_results(results, baseline, threshold):
+    """
+    Find the stages that got slower than a saved run.
+
+    Parameters:
+        results (dict): Stage measurements from bench_fetch_stages.
+        baseline (dict): Stage measurements from an earlier run.
+        threshold (float): Allowed ratio of new to old seconds, e.g. 1.25.
+
+    Returns:
+        list: (stage, old seconds, new seconds) for each stage over the threshold.
+    """
+    regressions = []
+    for stage, numbers in results.items():
+        old = baseline.get(stage)
+        if old and numbers["seconds"] > old["seconds"] * threshold:
+            regressions.append((stage, old["seconds"], numbers["seconds"]))
+    return regressions
+
+def fetch_main(args):
+    parser = argparse.ArgumentParser(prog="dtwain_bench.py fetch",
+                                     description="Time the fetch, extract and copy stages against a synthetic repository.")
+    parser.add_argument("--size", type=int, default=2 * 1024 * 1024, help="bytes per fake binary")
+    parser.add_argument("--files", type=int, default=0, help="unrelated archive members of --size bytes each")
+    parser.add_argument("--sources", type=int, default=50, help="unrelated 16 KiB source files in the tree")
+    parser.add_argument("--commits", type=int, default=5, help="releases in the history")
+    parser.add_argument("--strategy", default="shallow", choices=list(dtwain_pull.CLONE_STRATEGIES))
+    parser.add_argument("--repeat", type=int, default=1, help="runs; the fastest run of each stage is kept")
+    parser.add_argument("--output", help="write the JSON report here instead of standard output")
+    parser.add_argument("--compare", metavar="BASELINE", help="a saved JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio that counts as a regression (default 1.25)")
+    options = parser.parse_args(args)
+
+    config = {key: getattr(options, key) for key in ("size", "files", "sources", "commits", "strategy", "repeat")}
+    stages = {}
+    with tempfile.TemporaryDirectory() as fixture_root:
+        repo_url = make_bare_repository(fixture_root, options.commits, options.size,
+                                        source_files=options.sources, extra_members=options.files)
+        for _ in range(options.repeat):
+            for stage, numbers in bench_fetch_stages(repo_url, options.strategy, options.size,
+                                                     options.files).items():
+                if stage not in stages or numbers["seconds"] < stages[stage]["seconds"]:
+                    stages[stage] = numbers
+
+    report = {"config": config, "python": sys.version.split()[0], "platform": sys.platform, "stages": stages}
+    if options.output:
+        with open(options.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if options.compare:
+        with open(options.compare, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_results(stages, baseline["stages"], options.threshold)
+        for stage, old, new in regressions:
+            print(f"Regression: {stage} took {new * 1000:.1f} ms, was {old * 1000:.1f} ms", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+# Pairs of real import libraries from this repository: the ANSI and unicode builds differ
+# in their exported names, much like two releases differ
+DELTA_PAIRS = [
+    ("dtwain_x64/dtwain64.lib", "dtwain_x64_unicode/dtwain64u.lib"),
+    ("dtwain_x86/dtwain32.lib", "dtwain_x86_unicode/dtwain32u.lib"),
+    ("dtwain_x86/dtwain32_embarcadero.lib", "dtwain_x86_unicode/dtwain32u_embarcadero.lib"),
+]
+
+# Size of the synthetic DLL-sized files the delta benchmark adds to DELTA_PAIRS: one edited copy
+# and one unrelated file, the worst case for the rolling checksum
+DELTA_LARGE_SIZE = 8 * 1024 * 1024
+
+def mutate_file(file_path, output_path, edits=20, seed=0):
+    """
+    Write a copy of a file with a few random insertions and deletions, like a release that
+    changes some functions and leaves the rest of the binary alone.
+
+    Parameters:
+        file_path (str): The file to copy.
+        output_path (str): Where to write the edited copy.
+        edits (int): How many insertions (and as many deletions) to make.
+        seed (int): Seed for the edits, so runs are comparable.
+    """
+    generator = random.Random(seed)
+    with open(file_path, "rb") as source:
+        data = bytearray(source.read())
+    for _ in range(edits):
+        position = generator.randrange(len(data))
+        data[position:position] = bytes(generator.randrange(256) for _ in range(generator.randrange(1, 300)))
+        position = generator.randrange(len(data))
+        del data[position:position + generator.randrange(1, 200)]
+    with open(output_path, "wb") as output:
+        output.write(data)
+
+def bench_deltas(pairs, block_sizes=(512, 2048, 8192)):
+    """
+    Time make_delta and apply_delta on pairs of files and compare the delta with shipping
+    the new file zlib-compressed.
+
+    Parameters:
+        pairs (list): (old file, new file) tuples.
+        block_sizes (iterable): Delta block sizes to try.
+
+    Returns:
+        list: One dict per pair and block size with the sizes and times.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        output_path = os.path.join(work_dir, "patched")
+        for old_path, new_path in pairs:
+            with open(new_path, "rb") as source:
+                compressed = len(zlib.compress(source.read(), 6))
+            for block_size in block_sizes:
+                make_time, delta = time_call(dtwain_pull.make_delta, old_path, new_path, block_size, repeat=3)
+                apply_time, digest = time_call(dtwain_pull.apply_delta, old_path, delta, output_path, repeat=3)
+                results.append({
+                    "old": old_path,
+                    "new": new_path,
+                    "size": os.path.getsize(new_path),
+                    "compressed": compressed,
+                    "block_size": block_size,
+                    "delta": len(delta),
+                    "make": make_time,
+                    "apply": apply_time,
+                    "match": digest["sha256"] == dtwain_pull.file_digest(new_path)["sha256"],
+                })
+    return results
+
+# Stands in for git-upload-pack on a flaky link: the first $FLAKY_FAILURES connections are
+# cut after $FLAKY_LIMIT bytes, which is more than a ref listing but less than a pack
+FLAKY_UPLOAD_PACK = """
+import os, subprocess, sys, threading
+
+state = os.environ["FLAKY_STATE"]
+count = int(open(state).read()) if os.path.exists(state) else 0
+with open(state, "w") as state_file:
+    state_file.write(str(count + 1))
+if count >= int(os.environ["FLAKY_FAILURES"]):
+    os.execvp("git-upload-pack", ["git-upload-pack"] + sys.argv[1:])
+
+child = subprocess.Popen(["git-upload-pack"] + sys.argv[1:], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+def relay_requests():
+    try:
+        while True:
+            data = os.read(0, 65536)
+            if not data:
+                break
+            child.stdin.write(data)
+            child.stdin.flush()
+    except OSError:
+        pass
+
+threading.Thread(target=relay_requests, daemon=True).start()
+remaining = int(os.environ["FLAKY_LIMIT"])
+while remaining > 0:
+    data = os.read(child.stdout.fileno(), min(65536, remaining))
+    if not data:
+        sys.exit(child.wait())
+    os.write(1, data)
+    remaining -= len(data)
+child.kill()
+os._exit(1)
+"""
+
+@contextlib.contextmanager
+def flaky_remote(work_dir, failures, limit=64 * 1024):
+    """
+    Make git fetches over file:// fail the first `failures` times, part way through the
+    transfer. Uses an executable script, so it needs a POSIX system.
+
+    Parameters:
+        work_dir (str): Where the wrapper script and its connection counter are written.
+        failures (int): How many connections to cut.
+        limit (int): How many bytes a cut connection delivers.
+
+    Yields:
+        str: The counter file; it holds the number of connections made.
+    """
+    script = os.path.join(work_dir, "flaky-upload-pack")
+    state = os.path.join(work_dir, "connections")
+    with open(script, "w") as script_file:
+        script_file.write(f"#!{sys.executable}\n{FLAKY_UPLOAD_PACK}")
+    os.chmod(script, 0o755)
+    settings = {
+        "FLAKY_STATE": state,
+        "FLAKY_FAILURES": str(failures),
+        "FLAKY_LIMIT": str(limit),
+        # Every git command (and so every fetch) picks the wrapper up from the environment
+        "GIT_CONFIG_COUNT": "1",
+        "GIT_CONFIG_KEY_0": "remote.origin.uploadpack",
+        "GIT_CONFIG_VALUE_0": script,
+    }
+    saved = {name: os.environ.get(name) for name in settings}
+    os.environ.update(settings)
+    try:
+        yield state
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def connections_made(state):
+    with open(state, "r") as state_file:
+        return int(state_file.read())
+
+def bench_resume(repo_url, failures=3, strategy="full"):
+    """
+    Clone through a remote that drops connections, two ways: resumable_clone retrying with
+    backoff, and a resumable clone interrupted outright (one attempt per fetch) and then
+    resumed by a second call. Both checkouts must end at the remote's HEAD.
+
+    Parameters:
+        repo_url (str): A file:// URL, e.g. from make_bare_repository.
+        failures (int): How many connections the remote drops.
+        strategy (str): The clone strategy.
+
+    Returns:
+        dict: Per scenario: seconds, connections made and whether the checkout matches.
+    """
+    head = dtwain_pull.remote_head(repo_url)
+    progress = dtwain_pull.Progress(dtwain_pull.SilentProgressSink())
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        local_path = os.path.join(work_dir, "retried")
+        with flaky_remote(work_dir, failures) as state:
+            start = time.perf_counter()
+            repo = dtwain_pull.resumable_clone(repo_url, local_path, strategy, progress=progress,
+                                               retries=failures + 1, backoff=0.01)
+            results["retried"] = {"seconds": time.perf_counter() - start,
+                                  "connections": connections_made(state),
+                                  "matches": repo.head.commit.hexsha == head}
+
+        local_path = os.path.join(work_dir, "resumed")
+        os.remove(state)
+        with flaky_remote(work_dir, failures) as state:
+            start = time.perf_counter()
+            runs = 0
+            while True:
+                runs += 1
+                try:
+                    repo = dtwain_pull.resumable_clone(repo_url, local_path, strategy, progress=progress,
+                                                       retries=1)
+                    break
+                except git.GitCommandError:
+                    # The next run finds the marked repository and resumes it
+                    if runs > failures + 1:
+                        raise
+            results["resumed"] = {"seconds": time.perf_counter() - start,
+                                  "connections": connections_made(state),
+                                  "runs": runs,
+                                  "matches": repo.head.commit.hexsha == head}
+    return results
+
+# Imports a module in a fresh interpreter and prints the import time and the time until the
+# first constant has been read, so neither sees the other's cached modules
+IMPORT_PROBE = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter() - start
+{module}.DTWAIN_TIFFG4MULTI
+print(imported, time.perf_counter() - start)
+"""
+
+def time_import(module, path, repeat=10):
+    """
+    Time importing a module in fresh interpreters, after one run that writes its .pyc.
+
+    Parameters:
+        module (str): The module to import.
+        path (str): The directory it is imported from.
+        repeat (int): How many interpreters to start.
+
+    Returns:
+        tuple: Best (import, import plus first constant) times in seconds.
+    """
+    probe = IMPORT_PROBE.format(module=module)
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+    times = []
+    for _ in range(repeat + 1):
+        output = subprocess.run([sys.executable, "-c", probe, path], capture_output=True, text=True, check=True,
+                                env=env)
+        times.append(tuple(float(value) for value in output.stdout.split()))
+    return min(times[1:])
+
+def bench_constants(source_path, repeat=10):
+    """
+    Compare importing dtwain.py with importing the lazy dtwain_constants module, and check that
+    both give the same names and values.
+
+    Parameters:
+        source_path (str): The shared dtwain.py.
+        repeat (int): How many interpreters to start for each module.
+
+    Returns:
+        dict: Best times for each module, the number of constants, whether they match, and the
+            time per TN code label from the reverse index and from scanning the module.
+    """
+    eager = {name: value for name, value in runpy.run_path(source_path).items() if not name.startswith("__")}
+    dtwain_constants.load_constants()
+    lazy = {name: getattr(dtwain_constants, name) for name in dtwain_constants.__all__}
+    codes = [value for name, value in eager.items() if name.startswith("DTWAIN_TN_")]
+
+    def indexed():
+        for code in codes:
+            dtwain_constants.code_label("TN", code)
+
+    def scanned():
+        for code in codes:
+            "|".join(name for name, value in eager.items() if name.startswith("DTWAIN_TN_") and value == code)
+
+    return {
+        "indexed": time_call(indexed)[0] / len(codes),
+        "scanned": time_call(scanned)[0] / len(codes),
+        "eager": time_import("dtwain", os.path.dirname(os.path.abspath(source_path)), repeat),
+        "lazy": time_import("dtwain_constants", dtwain_constants.MODULE_DIR, repeat),
+        "constants": len(eager),
+        "match": eager == lazy and list(eager) == list(lazy),
+    }
+
+# Loads every dtwain.py given on the command line as its own module, as a process using several
+# variants does, and prints the time taken
+VARIANTS_PROBE = """
+import sys, time, importlib.util
+start = time.perf_counter()
+for number, path in enumerate(sys.argv[1:]):
+    spec = importlib.util.spec_from_file_location(f"dtwain_{number}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.DTWAIN_TIFFG4MULTI
+print(time.perf_counter() - start)
+"""
+
+def bench_variants(shared_path, variants, repeat=10):
+    """
+    Compare loading the four variant dtwain.py modules as full copies of the constants with
+    loading their shims over the one shared module.
+
+    Parameters:
+        shared_path (str): The shared dtwain.py.
+        variants (list): The variant folders holding the shims.
+        repeat (int): How many interpreters to start for each layout.
+
+    Returns:
+        dict: For each layout, the first load (which compiles every .pyc) and the best load
+            once the .pyc files exist, in seconds.
+    """
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        copies = []
+        for variant in variants:
+            os.makedirs(os.path.join(work_dir, "copies", variant))
+            copies.append(shutil.copy(shared_path, os.path.join(work_dir, "copies", variant, "dtwain.py")))
+        # The shims and the shared module are copied too, so both layouts start without .pyc files
+        shims = []
+        shutil.copytree(os.path.dirname(shared_path), os.path.join(work_dir, "shims", dtwain_pull.SHARED_CONSTANTS),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        for variant in variants:
+            os.makedirs(os.path.join(work_dir, "shims", variant))
+            shims.append(shutil.copy(os.path.join(variant, "dtwain.py"), os.path.join(work_dir, "shims", variant)))
+        for layout, paths in (("copies", copies), ("shims", shims)):
+            times = []
+            for _ in range(repeat + 1):
+                output = subprocess.run([sys.executable, "-c", VARIANTS_PROBE] + paths, capture_output=True,
+                                        text=True, check=True, env=env)
+                times.append(float(output.stdout))
+            results[layout] = (times[0], min(times[1:]))
+    return results
+
+def bench_flags(distinct=64, decodes=100000, seed=0):
+    """
+    Time decoding masks of every flag family by testing each flag in turn, through the slice
+    tables, and through the cache, on a stream of masks drawn from a few distinct values as in
+    a log.
+
+    Parameters:
+        distinct (int): How many different masks the stream repeats.
+        decodes (int): How many masks to decode per family.
+        seed (int): Seed for the masks, so runs are comparable.
+
+    Returns:
+        dict: Family to {method: nanoseconds per decode}, and whether the methods agreed.
+    """
+    generator = random.Random(seed)
+    results = {}
+    for family in dtwain_flags.FLAG_FAMILIES:
+        flags = dtwain_flags.flag_set(family)
+        pool = [generator.getrandbits(32) for _ in range(distinct)]
+        masks = [generator.choice(pool) for _ in range(decodes)]
+
+        def scanned():
+            return [tuple(name for value, name in flags.flags if mask & value == value) for mask in masks]
+
+        def sliced():
+            return [flags.decode_mask(mask) for mask in masks]
+
+        def cached():
+            return [flags.decode(mask) for mask in masks]
+
+        timings = {}
+        outputs = []
+        for method, func in (("scanned", scanned), ("sliced", sliced), ("cached", cached)):
+            seconds, output = time_call(func, repeat=3)
+            timings[method] = seconds / decodes * 1e9
+            outputs.append(output)
+        timings["match"] = outputs[0] == outputs[1] == outputs[2]
+        results[family] = timings
+    return results
+
+def bench_twaininfo(source_path, repeat=20):
+    """
+    Compare parsing twaininfo.txt at start-up with opening its compiled form, and time lookups
+    in the memory-mapped tables.
+
+    Parameters:
+        source_path (str): A twaininfo.txt.
+        repeat (int): How many times to run each step.
+
+    Returns:
+        dict: Best times in seconds for parsing the text, compiling it, opening the compiled file
+            (hash check included) and one lookup of each kind, and whether the tables match.
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def parse():
+            with open(source_path, "rb") as source:
+                return dtwain_twaininfo.parse_twaininfo(source.read().decode("latin-1"))
+
+        def opened():
+            dtwain_twaininfo.open_twaininfo(source_path, cache_dir).close()
+
+        parse_time, tables = time_call(parse, repeat=repeat)
+        compile_time, _ = time_call(dtwain_twaininfo.compile_twaininfo, source_path,
+                                    os.path.join(cache_dir, "compiled.bin"), repeat=repeat)
+        dtwain_twaininfo.open_twaininfo(source_path, cache_dir).close()
+        open_time, _ = time_call(opened, repeat=repeat)
+        with dtwain_twaininfo.open_twaininfo(source_path, cache_dir) as info:
+            triplets = [values[1:4] for values in tables["triplets"][1]]
+            capabilities = [values[0] for values in tables["capabilities"][1]]
+
+            def triplet_lookups():
+                for triplet in triplets:
+                    info.triplet(*triplet)
+
+            def capability_lookups():
+                for capability in capabilities:
+                    info.lookup("capabilities", capability)
+
+            match = all(sorted(records, key=lambda values: values[0]) == list(info.records(name))
+                        for name, (_, records) in tables.items())
+            return {
+                "parse": parse_time,
+                "compile": compile_time,
+                "open": open_time,
+                "triplet": time_call(triplet_lookups, repeat=repeat)[0] / len(triplets),
+                "capability": time_call(capability_lookups, repeat=repeat)[0] / len(capabilities),
+                "match": match,
+            }
+
+# One scan of a session as an application logs it: open the source manager and the source, set
+# up and transfer two pages, then close everything again
+STATES_SESSION = [
+    ("DG_CONTROL", "DAT_PARENT", "MSG_OPENDSM"),
+    ("DG_CONTROL", "DAT_STATUS", "MSG_GET"),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_GETDEFAULT"),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_OPENDS"),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_GETCURRENT"),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_SET"),
+    ("DG_IMAGE", "DAT_IMAGELAYOUT", "MSG_SET"),
+    ("DG_CONTROL", "DAT_USERINTERFACE", "MSG_ENABLEDS"),
+    ("DG_CONTROL", "DAT_EVENT", "MSG_PROCESSEVENT"),
+    ("DG_CONTROL", "DAT_NULL", "MSG_XFERREADY"),
+    ("DG_IMAGE", "DAT_IMAGEINFO", "MSG_GET"),
+    ("DG_IMAGE", "DAT_IMAGENATIVEXFER", "MSG_GET"),
+    ("DG_CONTROL", "DAT_PENDINGXFERS", "MSG_ENDXFER"),
+    ("DG_IMAGE", "DAT_IMAGEINFO", "MSG_GET"),
+    ("DG_IMAGE", "DAT_IMAGEMEMXFER", "MSG_GET"),
+    ("DG_IMAGE", "DAT_IMAGEMEMXFER", "MSG_GET"),
+    ("DG_IMAGE", "DAT_EXTIMAGEINFO", "MSG_GET"),
+    ("DG_CONTROL", "DAT_PENDINGXFERS", "MSG_ENDXFER"),
+    ("DG_CONTROL", "DAT_PENDINGXFERS", "MSG_RESET"),
+    ("DG_CONTROL", "DAT_USERINTERFACE", "MSG_DISABLEDS"),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_CLOSEDS"),
+    ("DG_CONTROL", "DAT_PARENT", "MSG_CLOSEDSM"),
+]
+
+def replay_by_rules(lines):
+    # Check a log against TRIPLET_STATES directly, following the set of possible states
+    violations = []
+    states = set(range(1, 8))
+    for position, line in enumerate(lines):
+        match = dtwain_states.LOG_TRIPLET.search(line)
+        if match is None:
+            continue
+        rule = dtwain_states.TRIPLET_STATES.get(match.groups())
+        allowed = states & set(range(rule[0], rule[1] + 1)) if rule else set()
+        if not allowed:
+            violations.append(position)
+        elif dtwain_states.LOG_FAILURE not in line:
+            states = {state for current in allowed for state in rule[2].get(current, (current,))}
+    return violations
+
+def bench_states(sessions=20000, seed=0):
+    """
+    Time replaying a synthetic call log through the compiled state machine, against checking
+    each line with the TRIPLET_STATES rules themselves.
+
+    Parameters:
+        sessions (int): How many copies of STATES_SESSION the log holds. Every hundredth session
+            has one call moved out of place and one call that fails.
+        seed (int): Seed for the damaged sessions, so runs are comparable.
+
+    Returns:
+        dict: Lines in the log, lines per minute of each method, the violations found, and
+            whether both methods found the same ones.
+    """
+    generator = random.Random(seed)
+    machine = dtwain_states.load_state_machine()
+    lines = []
+    for number in range(sessions):
+        calls = list(STATES_SESSION)
+        failed = None
+        if number % 100 == 99:
+            calls.insert(generator.randrange(len(calls)), calls.pop(generator.randrange(len(calls))))
+            failed = generator.randrange(len(calls))
+        for position, (dg, dat, msg) in enumerate(calls):
+            result = "TWRC_FAILURE" if position == failed else "TWRC_SUCCESS"
+            lines.append(f"DSM_Entry({dg}, {dat}, {msg}) returned {result}")
+        # A line that names no triplet, as logs mix in their own messages
+        lines.append("Acquisition done")
+
+    def compiled():
+        return [position for position, _, _ in machine.replay_log(lines)]
+
+    compiled_time, compiled_found = time_call(compiled, repeat=3)
+    rules_time, rules_found = time_call(replay_by_rules, lines, repeat=3)
+    return {
+        "lines": len(lines),
+        "compiled": len(lines) / compiled_time * 60,
+        "rules": len(lines) / rules_time * 60,
+        "violations": len(compiled_found),
+        "match": compiled_found == rules_found,
+    }
+
+def with_fixture(bench, args):
+    # Run a repository benchmark against args[0], or against a fresh local fixture
+    if args:
+        return args[0], bench(args[0])
+    with tempfile.TemporaryDirectory() as fixture_root:
+        repo_url = make_bare_repository(fixture_root)
+        return repo_url, bench(repo_url)
+
+def main(args):
+    if args and args[0] == "delta":
+        block_sizes = [int(value) for value in args[1:]] or [512, 2048, 8192]
+        pairs = [pair for pair in DELTA_PAIRS if all(os.path.isfile(path) for path in pair)]
+        if not pairs:
+            print("The dtwain_x* .lib files are missing. Run from the repository root.")
+            return 1
+        with tempfile.TemporaryDirectory() as work_dir:
+            # Simulated releases: each .lib against an edited copy of itself
+            for number, (old_path, _) in enumerate(list(pairs)):
+                edited = os.path.join(work_dir, os.path.basename(old_path) + ".edited")
+                mutate_file(old_path, edited, seed=number)
+                pairs.append((old_path, edited))
+            large = os.path.join(work_dir, "large.dll")
+            unrelated = os.path.join(work_dir, "unrelated.dll")
+            for file_path in (large, unrelated):
+                with open(file_path, "wb") as output:
+                    output.write(os.urandom(DELTA_LARGE_SIZE))
+            mutate_file(large, large + ".edited")
+            pairs.extend([(large, large + ".edited"), (large, unrelated)])
+            results = bench_deltas(pairs, block_sizes)
+        print(f"{'old -> new':72} {'block':>6} {'size':>8} {'zlib':>8} {'delta':>8} {'make':>9} {'apply':>8}")
+        for result in results:
+            pair = f"{result['old']} -> {os.path.basename(result['new'])}"
+            print(f"{pair:72} {result['block_size']:6} {result['size'] / 1024:7.0f}K {result['compressed'] / 1024:7.0f}K"
+                  f" {result['delta'] / 1024:7.1f}K {result['make'] * 1000:7.1f}ms {result['apply'] * 1000:6.1f}ms"
+                  + ("" if result["match"] else "  MISMATCH"))
+        return 0
+
+    if args and args[0] == "resume":
+        failures = int(args[1]) if len(args) > 1 else 3
+        if len(args) > 2:
+            repo_url, results = args[2], bench_resume(args[2], failures)
+        else:
+            with tempfile.TemporaryDirectory() as fixture_root:
+                # Small binaries keep the run short; the cuts are what is being measured
+                repo_url = make_bare_repository(fixture_root, binary_size=256 * 1024)
+                results = bench_resume(repo_url, failures)
+        print(f"Cloning {repo_url} while the first {failures} connections are cut")
+        for scenario, numbers in results.items():
+            runs = f", {numbers['runs']} runs" if "runs" in numbers else ""
+            print(f"  {scenario:8} {numbers['seconds'] * 1000:9.1f} ms  {numbers['connections']} connections{runs}"
+                  f"  matches remote HEAD: {numbers['matches']}")
+        return 0 if all(numbers["matches"] for numbers in results.values()) else 1
+
+    if args and args[0] == "constants":
+        source_path = dtwain_constants.constants_source()
+        if source_path is None:
+            print(f"{dtwain_constants.CONSTANTS_SOURCES[0]} is missing. Run from the repository root.")
+            return 1
+        results = bench_constants(source_path, int(args[1]) if len(args) > 1 else 10)
+        print(f"Importing {results['constants']} constants, fresh interpreter each time")
+        for module in ("eager", "lazy"):
+            imported, first = results[module]
+            print(f"  {module:6} import {imported * 1000:7.3f} ms  first constant {first * 1000:7.3f} ms")
+        print(f"  TN code label: reverse index {results['indexed'] * 1e9:.0f} ns, scanning the names {results['scanned'] * 1e9:.0f} ns")
+        print(f"  names and values match: {results['match']}")
+        return 0 if results["match"] else 1
+
+    if args and args[0] == "variants":
+        shared_path = os.path.join(dtwain_pull.SHARED_CONSTANTS, "dtwain.py")
+        variants = [variant for variant in dtwain_pull.variant_shims(dtwain_pull.dtwain_manifests)
+                    if os.path.isfile(os.path.join(variant, "dtwain.py"))]
+        if not os.path.isfile(shared_path) or not variants:
+            print(f"{shared_path} or the variant shims are missing. Run from the repository root.")
+            return 1
+        results = bench_variants(shared_path, variants, int(args[1]) if len(args) > 1 else 10)
+        print(f"Loading the dtwain.py of {len(variants)} variants in one process")
+        for layout, (first, best) in results.items():
+            print(f"  {layout:6} first load {first * 1000:7.2f} ms  with .pyc {best * 1000:7.2f} ms")
+        return 0
+
+    if args and args[0] == "flags":
+        results = bench_flags(int(args[1]) if len(args) > 1 else 64)
+        print(f"{'family':10} {'scanned':>9} {'sliced':>9} {'cached':>9}  (ns per decode)")
+        for family, timings in results.items():
+            print(f"{family:10} {timings['scanned']:9.0f} {timings['sliced']:9.0f} {timings['cached']:9.0f}"
+                  + ("" if timings["match"] else "  MISMATCH"))
+        return 0 if all(timings["match"] for timings in results.values()) else 1
+
+    if args and args[0] == "twaininfo":
+        source_path = args[1] if len(args) > 1 else dtwain_twaininfo.twaininfo_source()
+        if source_path is None:
+            print("The dtwain_x* folders are missing. Run from the repository root or pass twaininfo.txt.")
+            return 1
+        results = bench_twaininfo(source_path)
+        print(f"Reading {source_path}")
+        print(f"  parse the text:          {results['parse'] * 1000:8.3f} ms")
+        print(f"  compile it:              {results['compile'] * 1000:8.3f} ms")
+        print(f"  open the compiled file:  {results['open'] * 1000:8.3f} ms")
+        print(f"  triplet lookup:          {results['triplet'] * 1e6:8.2f} us")
+        print(f"  capability lookup:       {results['capability'] * 1e6:8.2f} us")
+        print(f"  tables match:            {results['match']}")
+        return 0 if results["match"] else 1
+
+    if args and args[0] == "states":
+        results = bench_states(int(args[1]) if len(args) > 1 else 20000)
+        print(f"Replaying {results['lines']} log lines through the TWAIN state machine")
+        print(f"  TRIPLET_STATES rules:   {results['rules'] / 1e6:6.2f} million lines per minute")
+        print(f"  compiled tables:        {results['compiled'] / 1e6:6.2f} million lines per minute")
+        print(f"  out-of-sequence calls:  {results['violations']}")
+        print(f"  methods agree:          {results['match']}")
+        return 0 if results["match"] else 1
+
+    if args and args[0] == "fetch":
+        return fetch_main(args[1:])
+
+    if args and args[0] == "clone":
+        repo_url, results = with_fixture(bench_clone_strategies, args[1:])
+        print_clone_results(repo_url, results)
+        return 0 if not any(numbers["missing"] for numbers in results.values()) else 1
+
+    if args and args[0] == "pipeline":
+        repo_url, results = with_fixture(bench_pipelines, args[1:])
+        print(f"Cold refresh from {repo_url}")
+        for mode, numbers in results.items():
+            stages = ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in numbers["timings"].items())
+            print(f"  {mode:7} {numbers['seconds'] * 1000:9.1f} ms  ({stages})  matches run_stages: {numbers['matches']}")
+        return 0 if all(numbers["matches"] for numbers in results.values()) else 1
+
+    if args and args[0] == "verify":
+        folder = args[1] if len(args) > 1 else "dtwain_x64"
+        if not os.path.isfile(os.path.join(folder, dtwain_pull.INTEGRITY_MANIFEST)):
+            print(f"{folder} has no {dtwain_pull.INTEGRITY_MANIFEST}. Run dtwain_pull.py first or pass a variant folder.")
+            return 1
+        results = bench_verify(folder)
+        print(f"Verifying {results['files']} files in {folder}")
+        print(f"  size and mtime: {results['suspect'] * 1000:.2f} ms")
+        print(f"  full re-hash:   {results['all'] * 1000:.2f} ms")
+        return 0
+
+    search_path = args[0] if args else "./twain_library"
+    if not os.path.isdir(search_path):
+        print(f"{search_path} does not exist. Run dtwain_pull.py first or pass a checkout path.")
+        return 1
+
+    result = bench_locators(search_path)
+    print(f"Locating {result['lookups']} files in {search_path}")
+    print(f"  per-file os.walk: {result['per_file_walk'] * 1000:.2f} ms")
+    print(f"  indexed scandir:  {result['indexed'] * 1000:.2f} ms")
+    print(f"  classified:       {result['classified'] * 1000:.2f} ms")
+    print(f"  results match:    {result['results_match']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,326 @@
+# name: dtwain_constants
+# author: joshua dwight
+# github/jadwight
+
+# this module gives the DTWAIN constants of dtwain.py without running its ~1,400 assignments on import.
+# the names and values are compiled once into a small table next to this file, the table is read the
+# first time a constant is used, only that constant is decoded, and it is cached in the module.
+# the table also holds a reverse index per family, so a logged code maps back to its names.
+
+# usage: import dtwain_constants as dtwain
+#        dtwain.DTWAIN_TIFFG4MULTI
+#        dtwain.code_names("TN", 1010)   # ('DTWAIN_TN_TRANSFERDONE', 'DTWAIN_TN_ACQUIREPAGEDONE')
+#        python dtwain_constants.py [path/to/dtwain.py]   # recompile the table
+
+# imports
+import os as _os
+import sys as _sys
+import marshal as _marshal
+
+# The dtwain.py the table is compiled from: the one copy shared by the variant folders, whose own
+# dtwain.py only names their DLL
+CONSTANTS_SOURCES = (
+    "dtwain_shared/dtwain.py",
+)
+
+# The compiled table: a marshalled (version, source size, source mtime, names, values, index) tuple.
+# names holds b"\nNAME OFFSET" for each constant in dtwain.py order, OFFSET being where its
+# marshalled value starts in values, so one constant is found with a bytes search and decoded on its
+# own. index is the marshalled {family: {code: names}}, decoded when a code is first looked up. The
+# table is rebuilt whenever the size or mtime of the source no longer match
+CONSTANTS_TABLE = "dtwain_constants.table"
+CONSTANTS_VERSION = 3
+
+# Where the sources and the table are looked up
+MODULE_DIR = _os.path.dirname(_os.path.abspath(__file__))
+
+# Every constant as {name: value}, decoded only when all of them are needed; None until then
+constants_table = None
+
+# The names, values and index parts of the table, and the decoded {family: {code: names}} index;
+# None until first used
+_constant_names = None
+_constant_values = None
+_reverse_index_data = None
+_reverse_index = None
+
+# Log labels of codes already looked up, per family
+_code_labels = {}
+
+def constants_source(module_dir=MODULE_DIR):
+    """
+    Find the dtwain.py the constants are compiled from.
+
+    Parameters:
+        module_dir (str): The directory holding the variant folders.
+
+    Returns:
+        str or None: The path of the first dtwain.py that exists, or None if there is none.
+    """
+    for source in CONSTANTS_SOURCES:
+        source_path = _os.path.join(module_dir, source)
+        if _os.path.isfile(source_path):
+            return source_path
+    return None
+
+def evaluate_constant(node, constants):
+    # dtwain.py only uses literals, earlier names, unary minus and |, but keep the usual integer operators
+    import ast
+    operators = {
+        ast.BitOr: lambda left, right: left | right,
+        ast.BitAnd: lambda left, right: left & right,
+        ast.BitXor: lambda left, right: left ^ right,
+        ast.LShift: lambda left, right: left << right,
+        ast.RShift: lambda left, right: left >> right,
+        ast.Add: lambda left, right: left + right,
+        ast.Sub: lambda left, right: left - right,
+        ast.Mult: lambda left, right: left * right,
+    }
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in constants:
+        return constants[node.id]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd, ast.Invert)):
+        operand = evaluate_constant(node.operand, constants)
+        return -operand if isinstance(node.op, ast.USub) else ~operand if isinstance(node.op, ast.Invert) else operand
+    if isinstance(node, ast.BinOp) and type(node.op) in operators:
+        return operators[type(node.op)](evaluate_constant(node.left, constants), evaluate_constant(node.right, constants))
+    raise ValueError(f"line {node.lineno}: not a constant expression")
+
+def parse_constants(source_path):
+    """
+    Read the constants of a dtwain.py without executing it.
+
+    Parameters:
+        source_path (str): The dtwain.py to read.
+
+    Returns:
+        dict: Constant name to value, in the order they are assigned.
+
+    Raises:
+        ValueError: If the file holds anything other than constant assignments.
+    """
+    import ast
+    with open(source_path, encoding="utf-8") as source:
+        tree = ast.parse(source.read(), source_path)
+    constants = {}
+    for statement in tree.body:
+        if not (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                and isinstance(statement.targets[0], ast.Name)):
+            raise ValueError(f"{source_path} line {statement.lineno}: not a constant assignment")
+        constants[statement.targets[0].id] = evaluate_constant(statement.value, constants)
+    return constants
+
+def constant_family(name):
+    """
+    Name the family a constant belongs to, as used by the reverse index.
+
+    Parameters:
+        name (str): A constant name.
+
+    Returns:
+        str: "TN" for DTWAIN_TN_TRANSFERDONE, "TWAIN_ERR" for TWAIN_ERR_BADVALUE, and the first
+            part for names without a family, e.g. "DTWAIN" for DTWAIN_ANYSUPPORT.
+    """
+    parts = name.split("_")
+    if len(parts) < 3:
+        return parts[0]
+    return parts[1] if parts[0] == "DTWAIN" else "_".join(parts[:2])
+
+def build_reverse_index(constants):
+    """
+    Group the integer constants by family and value.
+
+    Parameters:
+        constants (dict): Constant name to value, in dtwain.py order.
+
+    Returns:
+        dict: Family to {code: tuple of names}. Codes that several names share, such as TN 1010
+            (DTWAIN_TN_TRANSFERDONE and DTWAIN_TN_ACQUIREPAGEDONE), list every name in dtwain.py order.
+    """
+    index = {}
+    for name, value in constants.items():
+        if isinstance(value, int):
+            index.setdefault(constant_family(name), {}).setdefault(value, []).append(name)
+    return {family: {code: tuple(names) for code, names in codes.items()} for family, codes in index.items()}
+
+def encode_constants(constants):
+    """
+    Marshal each value on its own and list where it starts, for the names and values of the table.
+
+    Parameters:
+        constants (dict): Constant name to value, in dtwain.py order.
+
+    Returns:
+        tuple: The names and values parts of the table, as bytes.
+    """
+    names = []
+    values = []
+    offset = 0
+    for name, value in constants.items():
+        data = _marshal.dumps(value)
+        names.append(f"\n{name} {offset}".encode())
+        values.append(data)
+        offset += len(data)
+    return b"".join(names), b"".join(values)
+
+def compile_constants(source_path=None, table_path=None):
+    """
+    Compile the constants of a dtwain.py into the table read by this module.
+
+    Parameters:
+        source_path (str): The dtwain.py to compile. Defaults to the first of CONSTANTS_SOURCES.
+        table_path (str): Where to write the table. Defaults to CONSTANTS_TABLE next to this module.
+
+    Returns:
+        tuple: Constant name to value, and the (names, values, index) parts of the table.
+    """
+    source_path = source_path or constants_source()
+    table_path = table_path or _os.path.join(MODULE_DIR, CONSTANTS_TABLE)
+    source_stat = _os.stat(source_path)
+    constants = parse_constants(source_path)
+    names, values = encode_constants(constants)
+    index = _marshal.dumps(build_reverse_index(constants))
+    data = _marshal.dumps((CONSTANTS_VERSION, source_stat.st_size, source_stat.st_mtime_ns, names, values, index))
+    temp_path = table_path + ".tmp"
+    try:
+        with open(temp_path, "wb") as output:
+            output.write(data)
+        _os.replace(temp_path, table_path)
+    except OSError:
+        # A read-only install still works; the table is just rebuilt in memory by each process
+        pass
+    return constants, (names, values, index)
+
+def _read_table(source_path=None, table_path=None):
+    # Read the names, values and index of the table, recompiling it if it is missing, unreadable or
+    # older than its source
+    global _constant_names, _constant_values, _reverse_index_data, _reverse_index, constants_table
+    source_path = source_path or constants_source()
+    table_path = table_path or _os.path.join(MODULE_DIR, CONSTANTS_TABLE)
+    try:
+        with open(table_path, "rb") as table:
+            version, size, mtime_ns, names, values, index = _marshal.loads(table.read())
+    except (OSError, ValueError, EOFError, TypeError):
+        version = None
+    if version == CONSTANTS_VERSION and source_path is not None:
+        source_stat = _os.stat(source_path)
+        if (source_stat.st_size, source_stat.st_mtime_ns) != (size, mtime_ns):
+            version = None
+    if version != CONSTANTS_VERSION:
+        if source_path is None:
+            raise FileNotFoundError(f"Neither {CONSTANTS_TABLE} nor any of {', '.join(CONSTANTS_SOURCES)} was found")
+        names, values, index = compile_constants(source_path, table_path)[1]
+    _constant_names, _constant_values, _reverse_index_data = names, values, index
+    _reverse_index = None
+    _code_labels.clear()
+    constants_table = None
+
+def load_constants(source_path=None, table_path=None):
+    """
+    Load every constant of the table, recompiling it if it is missing, unreadable or older than
+    its source. Reading one constant does not need this; see constant_value.
+
+    Parameters:
+        source_path (str): The dtwain.py the table was compiled from. Defaults to the first of
+            CONSTANTS_SOURCES.
+        table_path (str): The table to read. Defaults to CONSTANTS_TABLE next to this module.
+
+    Returns:
+        dict: Constant name to value, in dtwain.py order.
+    """
+    global constants_table
+    _read_table(source_path, table_path)
+    values = memoryview(_constant_values)
+    constants = {}
+    for entry in _constant_names.split(b"\n")[1:]:
+        name, offset = entry.split(b" ")
+        constants[name.decode()] = _marshal.loads(values[int(offset):])
+    constants_table = constants
+    return constants
+
+def constant_value(name):
+    """
+    Decode one constant from the table, without decoding the others.
+
+    Parameters:
+        name (str): The constant name.
+
+    Returns:
+        int, float or str: Its value.
+
+    Raises:
+        KeyError: If dtwain.py has no such constant.
+    """
+    if _constant_names is None:
+        _read_table()
+    key = f"\n{name} ".encode()
+    start = _constant_names.find(key)
+    if start < 0:
+        raise KeyError(name)
+    start += len(key)
+    end = _constant_names.find(b"\n", start)
+    offset = int(_constant_names[start:end if end >= 0 else len(_constant_names)])
+    return _marshal.loads(memoryview(_constant_values)[offset:])
+
+def code_names(family, code):
+    """
+    Find the names of a code within one family, e.g. for a notification or error code in a log.
+
+    Parameters:
+        family (str): The family, as named by constant_family: "TN", "ERR", "TWAIN_ERR", ...
+        code (int): The logged value.
+
+    Returns:
+        tuple: Every name of the family with that value, in dtwain.py order; empty if none.
+    """
+    global _reverse_index
+    if _reverse_index is None:
+        if _reverse_index_data is None:
+            _read_table()
+        _reverse_index = _marshal.loads(_reverse_index_data)
+    codes = _reverse_index.get(family)
+    return codes.get(code, ()) if codes is not None else ()
+
+def code_label(family, code):
+    """
+    Format a code for a log line. The label is kept, so logging the same code again only costs
+    two dict lookups.
+
+    Parameters:
+        family (str): The family, as named by constant_family.
+        code (int): The logged value.
+
+    Returns:
+        str: The name, names joined by "|" when the code is shared, or "family code" if unknown.
+    """
+    labels = _code_labels.get(family)
+    if labels is None:
+        labels = _code_labels[family] = {}
+    label = labels.get(code)
+    if label is None:
+        label = labels[code] = "|".join(code_names(family, code)) or f"{family} {code}"
+    return label
+
+def __getattr__(name):
+    # Only called for names not yet in the module; the constant is stored so later lookups skip this
+    if name == "__all__":
+        return list(constants_table if constants_table is not None else load_constants())
+    try:
+        value = constant_value(name)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+def __dir__():
+    constants = constants_table if constants_table is not None else load_constants()
+    return sorted(set(globals()) | set(constants))
+
+if __name__ == "__main__":
+    source_path = _sys.argv[1] if len(_sys.argv) > 1 else constants_source()
+    if source_path is None:
+        print(f"None of {', '.join(CONSTANTS_SOURCES)} was found. Pass the dtwain.py to compile.")
+        _sys.exit(1)
+    constants, table = compile_constants(source_path)
+    print(f"Compiled {len(constants)} constants from {source_path} into {_os.path.join(MODULE_DIR, CONSTANTS_TABLE)}")
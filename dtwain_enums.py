@@ -0,0 +1,125 @@
+# name: dtwain_enums
+# author: joshua dwight
+# github/jadwight
+
+# this module groups the loose DTWAIN constants into one enum per family, generated from the
+# dtwain_constants table: IntEnum for the plain codes, IntFlag for the bitmasks. each member keeps its
+# dtwain.py name as an alias, so dtwain_enums.FF.TIFF is dtwain_enums.FF.DTWAIN_FF_TIFF. masks are
+# decoded by dtwain_flags, so both modules split a mask the same way.
+
+# usage: import dtwain_enums
+#        dtwain_enums.FF.TIFF                        # <FF.TIFF: 0>
+#        dtwain_enums.lookup(dtwain_enums.TN, 1010)  # O(1) value -> member
+#        dtwain_enums.decompose(dtwain_enums.LOG, dtwain_enums.LOG.ALL)   # tuple of flags
+
+# imports
+import enum
+import functools
+
+import dtwain_constants
+import dtwain_flags
+
+# The constant families: enum class name -> (prefix of its dtwain.py names, enum type)
+ENUM_FAMILIES = {
+    "FF": ("DTWAIN_FF_", enum.IntEnum),
+    "CP": ("DTWAIN_CP_", enum.IntEnum),
+    "FS": ("DTWAIN_FS_", enum.IntEnum),
+    "TN": ("DTWAIN_TN_", enum.IntEnum),
+    "ERR": ("DTWAIN_ERR_", enum.IntEnum),
+    "LOG": ("DTWAIN_LOG_", enum.IntFlag),
+    "PDFTEXT": ("DTWAIN_PDFTEXT_", enum.IntFlag),
+    "DLG": ("DTWAIN_DLG_", enum.IntFlag),
+}
+
+# Built families, and for each its value -> member table and, for flag families, its mask ->
+# members decoder: dtwain_flags decodes the mask and the members are cached per mask, as the flag
+# names are, so decoding a repeated mask allocates nothing
+families = {}
+value_maps = {}
+decoders = {}
+
+def family_members(prefix, constants):
+    """
+    Collect the members of one family from the constants table.
+
+    Parameters:
+        prefix (str): The dtwain.py prefix of the family, e.g. "DTWAIN_FF_".
+        constants (dict): Constant name to value.
+
+    Returns:
+        list: (name, value) pairs: the short names in dtwain.py order, then the full names.
+            A short name that starts with a digit, such as FS "4A0", is only reachable
+            through FS["4A0"] and its full name.
+    """
+    names = [name for name, value in constants.items() if name.startswith(prefix) and isinstance(value, int)]
+    return ([(name[len(prefix):], constants[name]) for name in names]
+            + [(name, constants[name]) for name in names])
+
+def build_family(name):
+    """
+    Generate the enum of one family and the tables used by lookup and decompose.
+
+    Parameters:
+        name (str): A key of ENUM_FAMILIES.
+
+    Returns:
+        type: The IntEnum or IntFlag class.
+    """
+    prefix, enum_type = ENUM_FAMILIES[name]
+    constants = dtwain_constants.constants_table or dtwain_constants.load_constants()
+    family = enum_type(name, family_members(prefix, constants), module=__name__)
+    # Every name shares its member with the first name given that value, so this maps each
+    # value to its canonical member, aliases and multi-bit masks such as LOG.ALL included
+    value_map = {}
+    for member in family.__members__.values():
+        value_map.setdefault(member.value, member)
+    value_maps[family] = value_map
+    if issubclass(enum_type, enum.IntFlag):
+        flags = dtwain_flags.flag_set(name)
+        members = {flag: family[flag] for _, flag in flags.flags}
+        decoders[family] = functools.lru_cache(maxsize=dtwain_flags.FLAG_CACHE_SIZE)(
+            lambda mask: tuple(members[flag] for flag in flags.decode(mask)))
+    families[name] = family
+    globals()[name] = family
+    return family
+
+def lookup(family, value, default=None):
+    """
+    Find the member of a family with a value, without the exception or pseudo-member that
+    calling the enum can produce.
+
+    Parameters:
+        family (type): An enum from this module.
+        value (int): The code or mask.
+        default: Returned when no name in the family has that value.
+
+    Returns:
+        The canonical member, or default.
+    """
+    return value_maps[family].get(value, default)
+
+def decompose(family, mask):
+    """
+    Split a mask into the members of a flag family, as dtwain_flags decodes it: single-bit
+    members lowest bit first, then multi-bit members with bits of their own, such as
+    PDFTEXT.IGNOREALL, when all their bits are set. Summary masks such as LOG.ALL are never
+    returned. The decode goes through the dtwain_flags slice tables, and the members of recent
+    masks are cached, so the same mask gives the same tuple.
+
+    Parameters:
+        family (type): LOG, PDFTEXT or DLG.
+        mask (int): The combined flags. Bits no member defines are left out.
+
+    Returns:
+        tuple: The members set in mask.
+    """
+    return decoders[family](int(mask))
+
+def __getattr__(name):
+    # Families are generated the first time they are used, then found in the module like any name
+    if name in ENUM_FAMILIES:
+        return build_family(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(ENUM_FAMILIES))
@@ -0,0 +1,200 @@
+# name: dtwain_flags
+# author: joshua dwight
+# github/jadwight
+
+# this module decodes and encodes the combined DTWAIN bitmasks: the DTWAIN_LOG_* logging flags, the
+# DTWAIN_DLG_* dialog options, the DTWAIN_PDF_ALLOW* permissions, the DTWAIN_DE_* device events and the
+# DTWAIN_PDFTEXT_* text options. each family gets a table of names for every value of every 8-bit
+# slice of a 32-bit mask, so a decode is a few table lookups, and recent masks are kept in an LRU cache.
+# dtwain_enums.decompose decodes its LOG, PDFTEXT and DLG flags through the same tables and cache.
+
+# usage: import dtwain_flags
+#        dtwain_flags.decode_flags("DE", 0x3000)      # ('DTWAIN_DE_PAPERDOUBLEFEED', 'DTWAIN_DE_PAPERJAM')
+#        dtwain_flags.encode_flags("LOG", "USEFILE|CALLSTACK")
+#        python dtwain_flags.py DE 12288              # decode a mask from the command line
+
+# imports
+import sys
+import functools
+
+import dtwain_constants
+
+# The flag families: name -> prefix of their dtwain.py names
+FLAG_FAMILIES = {
+    "LOG": "DTWAIN_LOG_",
+    "DLG": "DTWAIN_DLG_",
+    "PDF_ALLOW": "DTWAIN_PDF_ALLOW",
+    "DE": "DTWAIN_DE_",
+    "PDFTEXT": "DTWAIN_PDFTEXT_",
+}
+
+# Width of the slices a mask is decoded in. 16-bit slices need two lookups instead of four for a
+# 32-bit mask, but each table then has 65,536 entries instead of 256
+FLAG_SLICE_BITS = 8
+FLAG_MASK_BITS = 32
+
+# Number of distinct masks (and name lists) whose result is kept per family
+FLAG_CACHE_SIZE = 4096
+
+class FlagSet:
+    """
+    The decoder and encoder of one flag family.
+
+    A mask decodes to its single-bit flags, lowest bit first, then to the multi-bit flags whose
+    bits are all set in it, by value. A multi-bit flag is only a flag of its own if it has a bit
+    no single-bit flag names, such as DTWAIN_PDF_ALLOWPRINTING (0x804) or
+    DTWAIN_PDFTEXT_IGNOREALL (0xFFF00000); summary masks made only of other flags (DTWAIN_LOG_ALL)
+    are never decoded. Names that share a value with an earlier name (DTWAIN_DE_CUSTOMEVENTS is
+    DTWAIN_DE_POWERSAVE) are left out.
+    """
+    def __init__(self, prefix, constants, slice_bits=FLAG_SLICE_BITS, cache_size=FLAG_CACHE_SIZE):
+        self.prefix = prefix
+        self.slice_bits = slice_bits
+        self.values = {name: value for name, value in constants.items()
+                       if name.startswith(prefix) and isinstance(value, int)}
+
+        flags = {}
+        for name, value in self.values.items():
+            value &= (1 << FLAG_MASK_BITS) - 1
+            if value and value not in flags.values():
+                flags[name] = value
+        single_bits = 0
+        for value in flags.values():
+            if value & (value - 1) == 0:
+                single_bits |= value
+        # A multi-bit flag is only worth reporting if it sets a bit no single-bit flag names
+        self.flags = sorted(((value, name) for name, value in flags.items()
+                             if value & (value - 1) == 0 or value & ~single_bits),
+                            key=lambda flag: (flag[0] & (flag[0] - 1) != 0, flag[0]))
+
+        # One table per slice that holds a single-bit flag, of the names decoded from each value
+        # of the slice; the few multi-bit flags are checked one by one after them
+        slice_mask = (1 << slice_bits) - 1
+        single = [(value, name) for value, name in self.flags if value & (value - 1) == 0]
+        self.multi_bit = [(value, name) for value, name in self.flags if value & (value - 1)]
+        self.slices = []
+        for shift in range(0, FLAG_MASK_BITS, slice_bits):
+            inside = [(value >> shift, name) for value, name in single if value & (slice_mask << shift)]
+            if inside:
+                table = [tuple(name for value, name in inside if index & value) for index in range(slice_mask + 1)]
+                self.slices.append((shift, table))
+        self.slice_mask = slice_mask
+
+        self.decode = functools.lru_cache(maxsize=cache_size)(self.decode_mask)
+        self.encode = functools.lru_cache(maxsize=cache_size)(self.encode_names)
+
+    def decode_mask(self, mask):
+        """
+        Decode a mask without the cache; use decode, which keeps recent results.
+
+        Parameters:
+            mask (int): The combined flags; negative values are read as signed 32-bit masks.
+
+        Returns:
+            tuple: The names of the flags set in mask.
+        """
+        mask &= (1 << FLAG_MASK_BITS) - 1
+        names = ()
+        for shift, table in self.slices:
+            part = (mask >> shift) & self.slice_mask
+            if part:
+                names += table[part]
+        for value, name in self.multi_bit:
+            if mask & value == value:
+                names += (name,)
+        return names
+
+    def encode_names(self, names):
+        """
+        Encode flag names without the cache; use encode, which keeps recent results.
+
+        Parameters:
+            names (str or tuple): Names joined by "|", or a tuple of names. Each is a full name
+                (DTWAIN_LOG_USEFILE) or the part after the family prefix (USEFILE).
+
+        Returns:
+            int: The combined mask.
+
+        Raises:
+            KeyError: If a name is not in the family.
+        """
+        if isinstance(names, str):
+            names = [name.strip() for name in names.split("|") if name.strip()]
+        mask = 0
+        for name in names:
+            value = self.values.get(name)
+            if value is None:
+                value = self.values.get(self.prefix + name)
+            if value is None:
+                raise KeyError(f"{name} is not a {self.prefix}* flag")
+            mask |= value
+        return mask
+
+    def unknown(self, mask):
+        """
+        Return the bits of a mask that no decoded flag accounts for.
+
+        Parameters:
+            mask (int): The combined flags.
+
+        Returns:
+            int: The bits set in mask that are not part of a flag decode returns for it, e.g.
+                0x800 of DTWAIN_PDF_ALLOWPRINTING when 0x4 is not set as well.
+        """
+        return mask & ((1 << FLAG_MASK_BITS) - 1) & ~self.encode(self.decode(mask))
+
+# FlagSets already built, by family
+flag_sets = {}
+
+def flag_set(family):
+    """
+    Get the FlagSet of a family, building it on first use.
+
+    Parameters:
+        family (str): A key of FLAG_FAMILIES.
+
+    Returns:
+        FlagSet: The decoder and encoder of the family.
+    """
+    flags = flag_sets.get(family)
+    if flags is None:
+        constants = dtwain_constants.constants_table or dtwain_constants.load_constants()
+        flags = flag_sets[family] = FlagSet(FLAG_FAMILIES[family], constants)
+    return flags
+
+def decode_flags(family, mask):
+    """
+    Decode a mask into the names of its flags.
+
+    Parameters:
+        family (str): A key of FLAG_FAMILIES.
+        mask (int): The combined flags.
+
+    Returns:
+        tuple: The flag names: single-bit flags lowest bit first, then multi-bit flags (see
+            FlagSet). The same mask returns the same tuple while it stays in the cache.
+    """
+    return flag_set(family).decode(mask)
+
+def encode_flags(family, names):
+    """
+    Combine flag names into a mask.
+
+    Parameters:
+        family (str): A key of FLAG_FAMILIES.
+        names (str or tuple): Names joined by "|", or a tuple of names, full or without the prefix.
+
+    Returns:
+        int: The combined mask.
+    """
+    return flag_set(family).encode(names if isinstance(names, str) else tuple(names))
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] not in FLAG_FAMILIES:
+        print(f"usage: python dtwain_flags.py {{{','.join(FLAG_FAMILIES)}}} MASK")
+        sys.exit(1)
+    flags = flag_set(sys.argv[1])
+    mask = int(sys.argv[2], 0)
+    print("|".join(flags.decode(mask)) or "(none)")
+    if flags.unknown(mask):
+        print(f"Unknown bits: {flags.unknown(mask):#x}")
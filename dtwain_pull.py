@@ -6,6 +6,13 @@
 
 # pre-requisites: must have git installed or this module will not work!
 
+# usage: python dtwain_pull.py [--stages fetch,extract,package,publish,clean] [--dry-run] ...
+#        python dtwain_pull.py --help
+#
+# the same stages can be driven from python:
+#     run = dtwain_pull.new_run(dtwain_pull.dtwain_manifests)
+#     dtwain_pull.run_stages(run, ["fetch", "extract", "package", "publish"])
+
 # imports
 import git
 import os
@@ -13,22 +20,477 @@ import shutil
 import zipfile
 import time
 import subprocess
+import posixpath
+import contextlib
+import hashlib
+import json
+import zlib
+import sys
+import tempfile
+import re
+import stat
+import fnmatch
+import io
+import tarfile
+import struct
+import py_compile
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import dtwain_constants
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; reflinks are only attempted on Linux
+    fcntl = None
+
+# Upstream repository and where it is checked out
+DEFAULT_REPO_URL = "https://github.com/dynarithmic/twain_library.git"
+DEFAULT_LOCAL_PATH = "./twain_library"
+
+# Records the upstream commit and a hash of every delivered file between runs
+STATE_FILE = "dtwain_pull_state.json"
+STATE_VERSION = 1
+
+# Number of threads used to extract and copy the variant files
+PACKAGE_WORKERS = 4
+
+# Content-addressed store holding one copy of every delivered file, keyed by SHA-256
+ARTIFACT_STORE = "dtwain_store"
+
+# Maximum number of progress reports per second while git is transferring
+PROGRESS_RATE = 2
+
+# Removal of the checkout: attempts per locked file, and the first delay between attempts
+# in seconds (doubled after every failed attempt)
+CLEANUP_RETRIES = 6
+CLEANUP_BACKOFF = 0.05
+
+# Resumable clones: attempts per fetch, the first delay between attempts in seconds (doubled
+# after every failure, up to FETCH_BACKOFF_MAX), and the first --deepen step for history
+FETCH_RETRIES = 6
+FETCH_BACKOFF = 1.0
+FETCH_BACKOFF_MAX = 60.0
+RESUME_DEEPEN_STEP = 50
+RESUME_SECTION = "dtwain"
+
+# Caps on the memory git uses while indexing and reading packs during a resumable clone
+RESUMABLE_CLONE_CONFIG = {
+    "core.packedGitLimit": "128m",
+    "core.packedGitWindowSize": "16m",
+    "core.deltaBaseCacheLimit": "32m",
+    "pack.threads": "1",
+}
+
+# Published variant folders are symlinks into a generation under this directory
+GENERATIONS_DIR = "dtwain_generations"
+GENERATION_POINTER = "CURRENT"
+RETAIN_GENERATIONS = 3
+
+# Integrity manifest written into every variant folder: size, mtime and SHA-256 of each file
+INTEGRITY_MANIFEST = "dtwain_manifest.json"
+INTEGRITY_VERSION = 1
+
+# The offline bundle: a compressed tar holding an index and one member per distinct file
+BUNDLE_INDEX = "dtwain_bundle.json"
+BUNDLE_VERSION = 1
+BUNDLE_COMPRESSION = "gz"
+
+# Delta patches between generations: rsync-style blocks with a rolling Adler-32.
+# 512-byte blocks gave the smallest patches for the .lib files (dtwain_bench.py delta)
+DELTA_INDEX = "dtwain_patch.json"
+DELTA_MAGIC = b"DTWDELTA"
+DELTA_VERSION = 1
+DELTA_BLOCK_SIZE = 512
+ADLER_MODULUS = 65521
+
+# make_delta reads the new file in windows of this many bytes, so memory does not grow with it
+DELTA_WINDOW = 1024 * 1024
+
+# Where the new file stops matching, make_delta slides its checksum over every offset of one
+# block, then over fewer blocks while nothing matches: at most one in this many. 16 kept the
+# .lib deltas within a few percent of a full scan (dtwain_bench.py delta)
+DELTA_ROLL_BACKOFF = 16
+
+# The DTWAIN constants are the same for every build, so dtwain.py is delivered once, to this folder.
+# Each variant folder gets VARIANT_SHIM as its dtwain.py: it names the DLL of the build and reads
+# everything else from the shared module, which a process then compiles and holds only once, as
+# the private module _dtwain_shared. The shim binds the shared objects as its own names, so
+# reading a constant through it is a plain module attribute
+SHARED_CONSTANTS = "dtwain_shared"
+VARIANT_SHIM = """#
+#  dtwain.py ({variant})
+#
+#  Written by dtwain_pull. The DTWAIN constants are the same for every build, so they are
+#  kept once, in ../{shared}/dtwain.py. This module names the DLL of this build and takes
+#  every other name from the shared module, which a process loads only once.
+#
+import os as _os
+import sys as _sys
+import importlib.util as _importlib_util
+
+DTWAIN_DLL = "{dll}"
+
+_shared_path = _os.path.join(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))), "{shared}", "dtwain.py")
+_shared = _sys.modules.get("_{shared}")
+if _shared is None or _shared.__file__ != _shared_path:
+    _spec = _importlib_util.spec_from_file_location("_{shared}", _shared_path)
+    _shared = _importlib_util.module_from_spec(_spec)
+    _spec.loader.exec_module(_shared)
+    _sys.modules.setdefault("_{shared}", _shared)
+    del _spec
+del _os, _sys, _importlib_util, _shared_path
+
+globals().update({{_name: _value for _name, _value in vars(_shared).items()
+                  if not _name.startswith("_") and _name != "DTWAIN_DLL"}})"""
+
+# Side-by-side installs of tagged releases, each linked from the shared store, with
+# a "current" symlink (and a pointer file for platforms without symlinks)
+VERSIONS_DIR = "dtwain_versions"
+VERSION_LINK = "current"
+VERSION_POINTER = "current_version"
+VERSION_INFO = "dtwain_version.json"
+VERSION_CHECKOUT = "./twain_library_tags"
+
+# Permissions of store objects; mkstemp would otherwise leave them readable by the owner only
+STORE_FILE_MODE = 0o644
+
+# Linux ioctl that makes a copy-on-write clone of a file (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+# Size of the buffer used when streaming archive members to disk
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+
+# Extra `git clone` options for each clone strategy
+#   full:    complete history and every blob
+#   shallow: only the tip commit (depth 1)
+#   partial: full history, but file contents are fetched only when checked out
+#   sparse:  tip commit, blob-less, and only the paths given to sparse checkout
+CLONE_STRATEGIES = {
+    "full": [],
+    "shallow": ["--depth=1"],
+    "partial": ["--filter=blob:none"],
+    "sparse": ["--depth=1", "--filter=blob:none", "--no-checkout"],
+}
+
+class ConsoleProgressSink:
+    """
+    Writes each progress report as one human-readable line.
+    """
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def emit(self, event):
+        line = f"Progress: {event['stage']} {event['objects']}"
+        if event["total_objects"]:
+            line += f"/{event['total_objects']} ({100 * event['objects'] // event['total_objects']}%)"
+        line += f" objects, {event['objects_per_second']:.0f} objects/s"
+        if event["bytes_per_second"] is not None:
+            line += f", {event['bytes'] / 1048576:.2f} MiB at {event['bytes_per_second'] / 1048576:.2f} MiB/s"
+        if event["done"]:
+            line += ", done"
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+class JsonLinesProgressSink:
+    """
+    Writes each progress report as one JSON object per line, for CI logs and tooling.
+    """
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def emit(self, event):
+        self.stream.write(json.dumps(event, sort_keys=True) + "\n")
+        self.stream.flush()
+
+class SilentProgressSink:
+    """
+    Discards progress reports.
+    """
+    def emit(self, event):
+        pass
+
+PROGRESS_SINKS = {
+    "console": ConsoleProgressSink,
+    "jsonl": JsonLinesProgressSink,
+    "silent": SilentProgressSink,
+}
+
+# Matches the transfer size git appends to receiving/writing lines, e.g. "12.50 MiB | 3.10 MiB/s",
+# or "224 bytes | 224.00 KiB/s" for small transfers
+TRANSFER_PATTERN = re.compile(r"([\d.]+) (bytes|[KMG]iB) \| ([\d.]+) (bytes|[KMG]iB)/s")
+TRANSFER_UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
 
 class Progress(git.RemoteProgress):
+    """
+    Git progress handler that samples GitPython's callbacks.
+
+    Git reports progress many times a second on large clones. A report is passed to the sink
+    at most `rate` times per second, plus once at the start and end of every stage.
+    """
+    STAGE_NAMES = {
+        git.RemoteProgress.COUNTING: "counting",
+        git.RemoteProgress.COMPRESSING: "compressing",
+        git.RemoteProgress.WRITING: "writing",
+        git.RemoteProgress.RECEIVING: "receiving",
+        git.RemoteProgress.RESOLVING: "resolving",
+        git.RemoteProgress.FINDING_SOURCES: "finding sources",
+        git.RemoteProgress.CHECKING_OUT: "checking out",
+    }
+
+    def __init__(self, sink=None, rate=PROGRESS_RATE):
+        super().__init__()
+        self.sink = sink if sink is not None else ConsoleProgressSink()
+        self.interval = 1.0 / rate if rate else 0.0
+        self._last_report = None
+        self._last_count = 0
+        self._stage_start = time.monotonic()
+
     def update(self, op_code, cur_count, max_count=None, message=''):
-        print(f"Progress: {self._cur_line}")
+        now = time.monotonic()
+        boundary = op_code & (self.BEGIN | self.END)
+        if op_code & self.BEGIN:
+            self._stage_start = now
+            self._last_report = None
+            self._last_count = 0
+        if not boundary and self._last_report is not None and now - self._last_report < self.interval:
+            return
+
+        # Objects per second since the last report (or since the stage started)
+        since = self._last_report if self._last_report is not None else self._stage_start
+        elapsed = now - since
+        count = int(cur_count or 0)
+        objects_per_second = (count - self._last_count) / elapsed if elapsed > 0 else 0.0
+        self._last_report = now
+        self._last_count = count
+
+        transferred = None
+        bytes_per_second = None
+        match = TRANSFER_PATTERN.search(message or "")
+        if match:
+            transferred = int(float(match.group(1)) * TRANSFER_UNITS[match.group(2)])
+            bytes_per_second = int(float(match.group(3)) * TRANSFER_UNITS[match.group(4)])
+
+        stage = op_code & self.OP_MASK
+        self.sink.emit({
+            "op_code": op_code,
+            "stage": self.STAGE_NAMES.get(stage, str(stage)),
+            "objects": count,
+            "total_objects": int(max_count) if max_count else None,
+            "objects_per_second": objects_per_second,
+            "bytes": transferred,
+            "bytes_per_second": bytes_per_second,
+            "elapsed": now - self._stage_start,
+            "done": bool(op_code & self.END),
+        })
+
+def git_config_env(settings, environ=None):
+    """
+    Build the environment variables that pass config settings to a git command, after the
+    GIT_CONFIG_COUNT/KEY/VALUE settings the environment already carries.
+
+    Parameters:
+        settings (dict): Config key to value, e.g. {"advice.detachedHead": "false"}.
+        environ (dict): The environment to extend; defaults to os.environ.
+
+    Returns:
+        dict: The variables to set: GIT_CONFIG_COUNT and a KEY/VALUE pair per setting.
+    """
+    if environ is None:
+        environ = os.environ
+    try:
+        count = int(environ.get("GIT_CONFIG_COUNT") or 0)
+    except ValueError:
+        # git itself refuses a malformed count, so there are no settings of the caller to keep
+        count = 0
+    env = {}
+    for key, value in settings.items():
+        env[f"GIT_CONFIG_KEY_{count}"] = key
+        env[f"GIT_CONFIG_VALUE_{count}"] = value
+        count += 1
+    env["GIT_CONFIG_COUNT"] = str(count)
+    return env
+
+def clone_repository(repo_url, local_path, strategy="full", sparse_paths=None, progress=None, branch=None):
+    """
+    Clone a Git repository using one of the CLONE_STRATEGIES.
+
+    Parameters:
+        repo_url (str): The URL of the Git repository to clone. Use a file:// URL for local
+            repositories, since git ignores --depth for plain local paths.
+        local_path (str): The empty directory to clone into.
+        strategy (str): One of "full", "shallow", "partial" or "sparse".
+        sparse_paths (list): File names or patterns to check out with the "sparse" strategy.
+        progress (Progress): Progress handler; defaults to throttled console output.
+        branch (str): Branch or tag to check out instead of the remote's default branch.
+
+    Returns:
+        git.Repo: The cloned repository.
+    """
+    if strategy not in CLONE_STRATEGIES:
+        raise ValueError(f"Unknown clone strategy {strategy}; expected one of {', '.join(CLONE_STRATEGIES)}")
+
+    if progress is None:
+        progress = Progress()
+    options = list(CLONE_STRATEGIES[strategy])
+    env = None
+    if branch is not None:
+        options.append(f"--branch={branch}")
+        # Tags check out as a detached HEAD; that is expected, so skip git's advice about it.
+        # GitPython rejects --config in multi_options, so the setting goes in the environment.
+        env = git_config_env({"advice.detachedHead": "false"})
+    repo = git.Repo.clone_from(repo_url, local_path, progress=progress, env=env, multi_options=options)
+
+    if strategy == "sparse":
+        # Non-cone patterns match a file name at any depth, e.g. "release_libraries.zip"
+        print(f"Limiting checkout to {', '.join(sparse_paths or [])}")
+        repo.git.sparse_checkout("set", "--no-cone", *(sparse_paths or []))
+        repo.git.checkout(branch or repo.active_branch.name)
+    return repo
 
-def pull_latest_from_repository(repo_url, local_path):
+def retry_git(operation, description, retries=FETCH_RETRIES, backoff=FETCH_BACKOFF):
+    """
+    Run a git operation, retrying with exponential backoff when it fails, e.g. because the
+    connection dropped.
+
+    Parameters:
+        operation (callable): Runs the git command; called with no arguments.
+        description (str): What the operation does, for the retry messages.
+        retries (int): The maximum number of attempts.
+        backoff (float): The delay before the second attempt, in seconds.
+
+    Returns:
+        The operation's result. The last error is raised once every attempt has failed.
+    """
+    delay = backoff
+    for attempt in range(1, retries + 1):
+        try:
+            return operation()
+        except git.GitCommandError as e:
+            if attempt >= retries:
+                raise
+            reason = (e.stderr or str(e)).strip().strip("'").splitlines()[-1:] or ["unknown error"]
+            print(f"{description} failed ({reason[0].strip()}); attempt {attempt + 1} of {retries} in {delay:.1f}s...")
+            time.sleep(delay)
+            delay = min(delay * 2, FETCH_BACKOFF_MAX)
+
+def clone_is_resumable(repo):
+    # A clone started by resumable_clone is marked in its config until it completes
+    with repo.config_reader() as config:
+        return config.has_option(RESUME_SECTION, "strategy")
+
+def resumable_clone(repo_url, local_path, strategy="full", sparse_paths=None, progress=None,
+                    retries=FETCH_RETRIES, backoff=FETCH_BACKOFF):
+    """
+    Clone a repository in steps that each leave their objects on disk, so an interrupted clone
+    picks up where it stopped instead of starting over.
+
+    git clone deletes everything when the transfer fails. Here the repository is initialised
+    first and filled by separate fetches: the tip at depth 1, then (for the "full" and "partial"
+    strategies) history in doubling --deepen steps. Every fetch is retried with exponential
+    backoff; git cannot resume a half-received pack, so a dropped connection only costs the
+    step in flight. The repository carries a marker in its config until the checkout is done,
+    and calling this again on a marked repository resumes it. Received packs are indexed under
+    the memory limits in RESUMABLE_CLONE_CONFIG.
+
+    Parameters:
+        repo_url (str): The URL of the Git repository to clone.
+        local_path (str): An empty directory, or a clone interrupted by an earlier call.
+        strategy (str): One of "full", "shallow", "partial" or "sparse".
+        sparse_paths (list): File names or patterns to check out with the "sparse" strategy.
+        progress (Progress): Progress handler; defaults to throttled console output.
+        retries (int): The maximum number of attempts per fetch.
+        backoff (float): The delay before the second attempt, in seconds.
+
+    Returns:
+        git.Repo: The cloned repository.
+    """
+    if strategy not in CLONE_STRATEGIES:
+        raise ValueError(f"Unknown clone strategy {strategy}; expected one of {', '.join(CLONE_STRATEGIES)}")
+    if progress is None:
+        progress = Progress()
+
+    os.makedirs(local_path, exist_ok=True)
+    try:
+        repo = git.Repo(local_path)
+        with repo.config_reader() as config:
+            strategy = config.get_value(RESUME_SECTION, "strategy", strategy)
+        print(f"Resuming the interrupted {strategy} clone in {local_path}...")
+    except git.InvalidGitRepositoryError:
+        repo = git.Repo.init(local_path)
+        repo.create_remote("origin", repo_url)
+        with repo.config_writer() as config:
+            config.set_value(RESUME_SECTION, "strategy", strategy)
+            for key, value in RESUMABLE_CLONE_CONFIG.items():
+                section, option = key.rsplit(".", 1)
+                config.set_value(section, option, value)
+            if strategy in ("partial", "sparse"):
+                # What clone --filter=blob:none records, so missing blobs are fetched on demand
+                config.set_value('remote "origin"', "promisor", "true")
+                config.set_value('remote "origin"', "partialclonefilter", "blob:none")
+    remote = repo.remote()
+
+    symref = retry_git(lambda: repo.git.ls_remote("--symref", "origin", "HEAD"), "Querying the remote HEAD",
+                       retries, backoff)
+    branch = symref.split()[1].rpartition("refs/heads/")[2] if symref.startswith("ref:") else "master"
+    refspec = f"+refs/heads/{branch}:refs/remotes/origin/{branch}"
+    shallow_file = os.path.join(repo.git_dir, "shallow")
+    history = strategy in ("full", "partial")
+
+    if not (history and os.path.exists(shallow_file)):
+        print(f"Fetching the tip of {branch}...")
+        retry_git(lambda: remote.fetch(refspec, depth=1, progress=progress), f"Fetching {branch}",
+                  retries, backoff)
+    if history:
+        step = RESUME_DEEPEN_STEP
+        while os.path.exists(shallow_file):
+            print(f"Fetching {step} more commits of history...")
+            retry_git(lambda: remote.fetch(refspec, deepen=step, progress=progress), "Deepening history",
+                      retries, backoff)
+            step *= 2
+        # Anything pushed while the history was being fetched
+        retry_git(lambda: remote.fetch(refspec, progress=progress), f"Fetching {branch}", retries, backoff)
+
+    if strategy == "sparse":
+        print(f"Limiting checkout to {', '.join(sparse_paths or [])}")
+        repo.git.sparse_checkout("set", "--no-cone", *(sparse_paths or []))
+    repo.git.checkout("-B", branch, f"origin/{branch}")
+    repo.git.branch("--set-upstream-to", f"origin/{branch}")
+    with repo.config_writer() as config:
+        config.remove_section(RESUME_SECTION)
+    return repo
+
+def pull_latest_from_repository(repo_url, local_path, strategy="full", sparse_paths=None, progress=None,
+                                resumable=False, retries=FETCH_RETRIES, backoff=FETCH_BACKOFF):
     """
     Pull the latest changes from a Git repository with verbose output.
 
     Parameters:
         repo_url (str): The URL of the Git repository to pull from.
         local_path (str): The local directory where the repository is cloned.
+        strategy (str): The clone strategy used if the repository has to be cloned;
+            one of the keys of CLONE_STRATEGIES.
+        sparse_paths (list): File names or patterns to check out with the "sparse" strategy.
+        progress (Progress): Progress handler; defaults to throttled console output.
+        resumable (bool): Clone with resumable_clone, resume a clone it left unfinished, and
+            retry fetches and pulls with exponential backoff.
+        retries (int): The maximum number of attempts per fetch when resumable.
+        backoff (float): The delay before the second attempt, in seconds.
 
     Returns:
         str: A message indicating the pull status.
     """
+    if progress is None:
+        progress = Progress()
+    attempts = retries if resumable else 1
+
+    def clone():
+        if resumable:
+            return resumable_clone(repo_url, local_path, strategy, sparse_paths, progress, retries, backoff)
+        return clone_repository(repo_url, local_path, strategy, sparse_paths, progress)
+
     print(f"Checking if directory {local_path} exists...")
     
     # Check if the directory exists; create it if it doesn't
@@ -40,18 +502,20 @@ def pull_latest_from_repository(repo_url, local_path):
         # Check if the repository already exists locally
         print(f"Checking if {local_path} is a Git repository...")
         repo = git.Repo(local_path)
+        if resumable and clone_is_resumable(repo):
+            repo = clone()
     except git.InvalidGitRepositoryError:
         # Check if the directory is empty
         if not os.listdir(local_path):
             # If empty, clone the repository
-            print(f"Directory {local_path} is empty. Cloning repository...")
-            repo = git.Repo.clone_from(repo_url, local_path, progress=Progress())
+            print(f"Directory {local_path} is empty. Cloning repository ({strategy})...")
+            repo = clone()
         else:
             print(f"Directory {local_path} is not empty. Cleaning it out...")
             shutil.rmtree(local_path)
             os.makedirs(local_path)
-            print(f"Cloning repository into clean directory {local_path}...")
-            repo = git.Repo.clone_from(repo_url, local_path, progress=Progress())
+            print(f"Cloning repository ({strategy}) into clean directory {local_path}...")
+            repo = clone()
 
     # Get the remote repository
     print("Fetching remote repository...")
@@ -59,7 +523,18 @@ def pull_latest_from_repository(repo_url, local_path):
 
     # Pull the latest changes
     print("Pulling latest changes...")
-    pull_info = remote.pull()
+    if os.path.exists(os.path.join(repo.git_dir, "shallow")):
+        # Shallow clones have no shared history to merge with; fetch only the new tip
+        # and move the checkout to it so the clone stays shallow
+        old_head = repo.head.commit.hexsha
+        retry_git(lambda: remote.fetch(repo.active_branch.name, depth=1, progress=progress), "Fetching",
+                  attempts, backoff)
+        repo.head.reset("FETCH_HEAD", index=True, working_tree=True)
+        if repo.head.commit.hexsha != old_head:
+            return "Successfully pulled latest changes."
+        return "Already up-to-date."
+
+    pull_info = retry_git(lambda: remote.pull(progress=progress), "Pulling", attempts, backoff)
 
     # Check if the pull was successful
     if pull_info[0].flags > 0:
@@ -67,160 +542,2793 @@ def pull_latest_from_repository(repo_url, local_path):
     else:
         return "Already up-to-date."
 
-def pull_repo():   
+def manifest_rules(files):
+    """
+    Normalise one variant's manifest into rules.
+
+    A manifest is a list whose entries are file names or dicts with "pattern" (a file name or a
+    glob such as "dtwain64*.lib"), "required" (default True) and "rename" (the name to deliver
+    the file under; meant for patterns that match one file). A dict mapping destination names
+    to source names, as produced by classify_files, is accepted too.
+
+    Parameters:
+        files (list or dict): The variant's manifest.
+
+    Returns:
+        list: Dicts with "pattern", "required" and "rename", in manifest order.
+    """
+    if isinstance(files, dict):
+        return [{"pattern": source, "required": True, "rename": None if dest == source else dest}
+                for dest, source in files.items()]
+    rules = []
+    for entry in files:
+        if isinstance(entry, str):
+            entry = {"pattern": entry}
+        rules.append({"pattern": entry["pattern"], "required": entry.get("required", True),
+                      "rename": entry.get("rename")})
+    return rules
+
+def is_glob(pattern):
+    # Patterns without wildcards are plain file names
+    return any(character in pattern for character in "*?[")
+
+def manifest_items(files):
+    # (destination name, source name) pairs of a plain or resolved manifest
+    if isinstance(files, dict):
+        return list(files.items())
+    return [(name, name) for name in files]
+
+def compile_manifests(manifests):
+    """
+    Compile the rules of every variant into one matcher.
+
+    Plain file names go into a dictionary. Glob patterns become optional capturing lookaheads
+    in a single regular expression, so one match call reports every pattern a file name
+    satisfies, however many variants share it.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its manifest (see manifest_rules).
+
+    Returns:
+        dict: The matcher for classify_files.
+    """
+    rules = []
+    literal = {}
+    patterns = []
+    wildcard = []
+    for variant, files in manifests.items():
+        for rule in manifest_rules(files):
+            number = len(rules)
+            rules.append((variant, rule))
+            pattern = rule["pattern"]
+            if not is_glob(pattern):
+                literal.setdefault(pattern, []).append(number)
+                continue
+            if pattern not in patterns:
+                patterns.append(pattern)
+                wildcard.append([])
+            wildcard[patterns.index(pattern)].append(number)
+
+    regex = None
+    if patterns:
+        regex = re.compile("".join(f"(?=({fnmatch.translate(pattern)}))?" for pattern in patterns))
+    return {"variants": list(manifests), "rules": rules, "literal": literal, "regex": regex, "wildcard": wildcard}
+
+def classify_files(matcher, names):
+    """
+    Sort file names into every variant whose rules match them, in one pass over the names.
+
+    Parameters:
+        matcher (dict): The matcher from compile_manifests.
+        names (iterable): The file names available, e.g. the checkout index and archive members.
+
+    Returns:
+        tuple: (resolved, missing). resolved maps each variant to a dict of destination name ->
+            source name, in rule order; a plain file name that matched nothing is kept, so the
+            copy step reports it as not found. missing maps each variant to the patterns of
+            required rules that matched nothing.
+    """
+    matches = [[] for _ in matcher["rules"]]
+    for name in dict.fromkeys(names):
+        hits = list(matcher["literal"].get(name, ()))
+        if matcher["regex"] is not None:
+            for group, value in enumerate(matcher["regex"].match(name).groups()):
+                if value is not None:
+                    hits.extend(matcher["wildcard"][group])
+        for number in hits:
+            matches[number].append(name)
+
+    resolved = {variant: {} for variant in matcher["variants"]}
+    missing = {}
+    for number, (variant, rule) in enumerate(matcher["rules"]):
+        found = sorted(matches[number])
+        if not found:
+            if rule["required"]:
+                missing.setdefault(variant, []).append(rule["pattern"])
+            if not is_glob(rule["pattern"]):
+                found = [rule["pattern"]]
+        for name in found:
+            resolved[variant].setdefault(rule["rename"] or name, name)
+    return resolved, missing
+
+def classify_checkout(manifests, search_path, archive_name=None, index=None):
+    """
+    Resolve the manifests against a checkout: every file in the tree and, when archive_name
+    is found, every member of the release archive.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its manifest (see manifest_rules).
+        search_path (str): The checkout.
+        archive_name (str): Optional release archive whose members are classified too.
+        index (dict): Optional prebuilt index of search_path from build_file_index.
+
+    Returns:
+        tuple: (resolved, missing) from classify_files.
+    """
+    if index is None:
+        index = build_file_index(search_path)
+    names = list(index)
+    zip_file_path = locate_file(archive_name, search_path, index) if archive_name else None
+    if zip_file_path is not None:
+        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+            names.extend(posixpath.basename(info.filename) for info in zip_ref.infolist() if not info.is_dir())
+    resolved, missing = classify_files(compile_manifests(manifests), names)
+    for variant, patterns in missing.items():
+        print(f"Required file(s) missing for {variant}: {', '.join(patterns)}")
+    return resolved, missing
+
+def sparse_checkout_paths(manifests, archive_name="release_libraries.zip"):
+    """
+    List the patterns a sparse checkout needs: the release archive plus every manifest file
+    name or glob. Non-cone sparse checkouts match them at any depth.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its manifest (see manifest_rules).
+        archive_name (str): The name of the release archive.
+
+    Returns:
+        list: Unique patterns, in first-seen order.
+    """
+    paths = [archive_name]
+    for files in manifests.values():
+        for rule in manifest_rules(files):
+            if rule["pattern"] not in paths:
+                paths.append(rule["pattern"])
+    return paths
+
+def pull_repo(strategy="shallow"):
     # Example usage
-    repo_url = "https://github.com/dynarithmic/twain_library.git"
-    local_path = "./twain_library"  # Replace with your desired local path
+    repo_url = DEFAULT_REPO_URL
+    local_path = DEFAULT_LOCAL_PATH  # Replace with your desired local path
 
-    result = pull_latest_from_repository(repo_url, local_path)
+    result = pull_latest_from_repository(repo_url, local_path, strategy,
+                                         sparse_checkout_paths(dtwain_manifests))
     print(result)
 
 def search_and_extract_file(search_file, search_path):
     pass
 
-def search_and_copy_file(search_file, search_path, copy_to):
+def build_file_index(search_path, skip_dirs=(".git",)):
     """
-    Search for a file in a directory and its subdirectories, then copy it to a new location.
+    Walk a directory tree once and index every file by name.
+
+    Directories are visited in the same top-down order as os.walk, so the first
+    path recorded for a name is the one a per-file os.walk search would have found.
+
+    Parameters:
+        search_path (str): The directory path to start the walk.
+        skip_dirs (tuple): Directory names that are never descended into.
+
+    Returns:
+        dict: Maps each file name to the list of paths where it was found.
+    """
+    index = {}
+    pending = [search_path]
+    while pending:
+        current = pending.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Like os.walk, symlinked directories are listed but not followed
+                        if entry.name not in skip_dirs and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    else:
+                        index.setdefault(entry.name, []).append(entry.path)
+        except OSError:
+            continue
+        # Push in reverse so the first subdirectory is visited next
+        pending.extend(reversed(subdirs))
+    return index
+
+def locate_file(search_file, search_path, index=None):
+    """
+    Find the first occurrence of a file in a directory tree.
 
     Parameters:
         search_file (str): The name of the file to search for.
         search_path (str): The directory path to start the search.
-        copy_to (str): The directory path to copy the file to.
+        index (dict): Optional index from build_file_index; avoids walking the tree.
 
     Returns:
-        str: A message indicating the search and copy status.
+        str: The path of the file, or None if it was not found.
     """
+    if index is not None:
+        paths = index.get(search_file)
+        return paths[0] if paths else None
+
     for root, dirs, files in os.walk(search_path):
         if search_file in files:
-            file_path = os.path.join(root, search_file)
-            print(f"Found {search_file} at {file_path}")
+            return os.path.join(root, search_file)
+    return None
 
-            # Check if the destination directory exists; create it if it doesn't
-            if not os.path.exists(copy_to):
-                print(f"Directory {copy_to} does not exist. Creating it...")
-                os.makedirs(copy_to)
+def file_digest(file_path, chunk_size=EXTRACT_CHUNK_SIZE):
+    """
+    Hash a file in chunks.
 
-            # Copy the file
-            shutil.copy(file_path, copy_to)
-            return f"Successfully copied {search_file} to {copy_to}"
+    Parameters:
+        file_path (str): The file to hash.
+        chunk_size (int): The size of the read buffer in bytes.
 
-    return f"{search_file} not found in {search_path}"
+    Returns:
+        dict: The file's "sha256" (hex), "crc32" and "size".
+    """
+    sha256 = hashlib.sha256()
+    crc32 = 0
+    size = 0
+    with open(file_path, 'rb') as source:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            crc32 = zlib.crc32(chunk, crc32)
+            size += len(chunk)
+    return {"sha256": sha256.hexdigest(), "crc32": crc32, "size": size}
 
-def search_and_extract_file(search_file, search_path):
-    # Iterate through the directory and its subdirectories
-    for root, _, files in os.walk(search_path):
-        for file_name in files:
-            if file_name == search_file:
-                # Construct the full path to the zip file
-                zip_file_path = os.path.join(root, file_name)
+def artifact_is_current(artifacts, destination, **fingerprint):
+    """
+    Check whether a delivered file still matches what was recorded for it.
 
-                # Extract the zip file into a directory with the same name
-                extract_directory = os.path.splitext(zip_file_path)[0]  # Remove the .zip extension
-                extract_directory = os.path.join(root, extract_directory)
+    Parameters:
+        artifacts (dict): Maps destination paths to their recorded digests.
+        destination (str): The delivered file.
+        **fingerprint: Digest fields of the new source (e.g. sha256, or crc32 and size)
+            that must all equal the recorded ones.
 
-                # Create the extraction directory if it doesn't exist
-                os.makedirs(extract_directory, exist_ok=True)
+    Returns:
+        bool: True if the destination exists with its recorded size and the source is unchanged.
+    """
+    recorded = artifacts.get(artifact_key(destination))
+    if recorded is None:
+        return False
+    if any(recorded.get(field) != value for field, value in fingerprint.items()):
+        return False
+    try:
+        return os.path.getsize(destination) == recorded["size"]
+    except OSError:
+        return False
 
-                # Extract the zip file
-                with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_directory)
+def artifact_key(destination):
+    # State keys use forward slashes so the state file is portable
+    return os.path.normpath(destination).replace(os.sep, "/")
 
-                print(f"Extracted {search_file} from {zip_file_path} to {extract_directory}")
+def store_object_path(store_dir, sha256):
+    # Objects are fanned out by the first two hex digits, like .git/objects
+    return os.path.join(store_dir, sha256[:2], sha256)
 
-def extract_files():
-    search_and_extract_file("release_libraries.zip", "./twain_library")
+def store_file(file_path, store_dir, digest=None):
+    """
+    Add a file to the content-addressed store unless an identical one is already there.
 
-def ensure_dtwain_core_directory():
-    # Get the current directory where the script is located
-    current_directory = os.path.dirname(os.path.abspath(__file__))
-    
-    # Specify the names of the directories you want to create
-    available_binaries = [
-        "dtwain_x86",
-        "dtwain_x86_unicode",
-        "dtwain_x64",
-        "dtwain_x64_unicode",
-    ]
+    Parameters:
+        file_path (str): The file to add.
+        store_dir (str): The store directory.
+        digest (dict): The file's digest from file_digest, if already known.
 
-    for binaries in available_binaries:
-        if not os.path.exists(os.path.join(current_directory, binaries)):
-                              os.makedirs(os.path.join(current_directory, binaries))
-                              print(f"`Created " + binaries)
+    Returns:
+        dict: The file's digest.
+    """
+    if digest is None:
+        digest = file_digest(file_path)
+    object_path = store_object_path(store_dir, digest["sha256"])
+    if not os.path.exists(object_path):
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=store_dir)
+        os.close(fd)
+        shutil.copyfile(file_path, temp_path)
+        os.chmod(temp_path, STORE_FILE_MODE)
+        os.replace(temp_path, object_path)
+    return digest
+
+def store_stream(source, store_dir, chunk_size=EXTRACT_CHUNK_SIZE):
+    """
+    Write a readable stream into the content-addressed store, hashing it on the way.
+
+    Parameters:
+        source (file): A binary file object, e.g. an open zip member.
+        store_dir (str): The store directory.
+        chunk_size (int): The size of the read buffer in bytes.
 
-def remove_directory(directory_path):
+    Returns:
+        dict: The digest ("sha256", "crc32", "size") of the stored content.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    sha256 = hashlib.sha256()
+    crc32 = 0
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=store_dir)
     try:
-        # Wait for a short time to allow any ongoing operations to finish
-        time.sleep(2)  # You can adjust the sleep time as needed
+        with os.fdopen(fd, 'wb') as output:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                crc32 = zlib.crc32(chunk, crc32)
+                size += len(chunk)
+                output.write(chunk)
+        digest = {"sha256": sha256.hexdigest(), "crc32": crc32, "size": size}
+        object_path = store_object_path(store_dir, digest["sha256"])
+        if os.path.exists(object_path):
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.chmod(temp_path, STORE_FILE_MODE)
+            os.replace(temp_path, object_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return digest
 
-        # Use the os.system command to forcefully remove the directory
-        cmd = f'rd /s /q "{directory_path}"'
-        os.system(cmd)
+def reflink_file(source_path, destination_path):
+    """
+    Make a copy-on-write clone of a file. Raises OSError where the platform or filesystem
+    does not support it.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise OSError("reflinks are not supported on this platform")
+    try:
+        with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+            fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+    except OSError:
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+        raise
 
-        print(f"Successfully removed directory: {directory_path}")
-    except Exception as e:
-        print(f"Error removing directory with os.system: {str(e)}")
+def link_or_copy(source_path, destination_path):
+    """
+    Create destination_path with the content of source_path as cheaply as the filesystem allows:
+    hardlink, then reflink, then a plain copy.
 
-dtwain_x64_files = [
-    "dtwain.py",
-    "dtwain64.dll",
-    "dtwain64.lib",
-    "dtwain64.pdb",
-    "dtwain64.ini",
-    "twaininfo.txt",
-    "twainlanguage.txt",
-    "twainresourcestrings_english.txt"
-]
-dtwain_x64_unicode_files = [
-    "dtwain.py",
-    "dtwain64u.dll",
-    "dtwain64u.lib",
-    "dtwain64u.pdb",
-    "dtwain64.ini",
-    "twaininfo.txt",
-    "twainlanguage.txt",
-    "twainresourcestrings_english.txt"
-]
-dtwain_x86_files = [
-    "dtwain.py",
-    "dtwain32.dll",
-    "dtwain32.lib",
-    "dtwain32.pdb",
-    "dtwain32_embarcadero.lib",
-    "dtwain32.ini",
-    "twaininfo.txt",
-    "twainlanguage.txt",
-    "twainresourcestrings_english.txt"
-]
-dtwain_x86_unicode_files = [
-    "dtwain.py",
-    "dtwain32u.dll",
-    "dtwain32u.lib",
-    "dtwain32u.pdb",
-    "dtwain32u_embarcadero.lib",
-    "dtwain32.ini",
-    "twaininfo.txt",
-    "twainlanguage.txt",
-    "twainresourcestrings_english.txt"
-]
+    Returns:
+        str: "hardlink", "reflink" or "copy".
+    """
+    for method, link in (("hardlink", os.link), ("reflink", reflink_file), ("copy", shutil.copyfile)):
+        try:
+            link(source_path, destination_path)
+            return method
+        except OSError:
+            if method == "copy":
+                raise
+
+def link_into_place(source_path, destination):
+    """
+    Replace destination with a hardlink, reflink or copy of source_path. The new file is put
+    in place with a rename, so readers never see a half-written file.
+
+    Returns:
+        str: "unchanged", "hardlink", "reflink" or "copy".
+    """
+    if os.path.exists(destination) and os.path.samefile(source_path, destination):
+        return "unchanged"
+
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    temp_path = destination + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
 
-pull_repo()
-extract_files()
-ensure_dtwain_core_directory()
+    method = link_or_copy(source_path, temp_path)
+    os.replace(temp_path, destination)
+    return method
 
-search_dir = "./twain_library"
+def link_from_store(store_dir, sha256, destination):
+    """
+    Populate a variant file from the store by hardlink, reflink or, failing both, a copy.
 
-for file in dtwain_x64_files:
-     search_and_copy_file(file, search_dir, "dtwain_x64")
+    The new file is put in place with a rename, so readers never see a half-written file.
+    Hardlinked files share their data with the store, so they should not be edited in place.
 
+    Parameters:
+        store_dir (str): The store directory.
+        sha256 (str): The hash of the stored object.
+        destination (str): The file to create or replace.
 
-for file in dtwain_x64_unicode_files:
-     search_and_copy_file(file, search_dir, "dtwain_x64_unicode")
+    Returns:
+        str: "unchanged", "hardlink", "reflink" or "copy".
+    """
+    return link_into_place(store_object_path(store_dir, sha256), destination)
 
-for file in dtwain_x86_files:
-     search_and_copy_file(file, search_dir, "dtwain_x86")
+def search_and_copy_file(search_file, search_path, copy_to, index=None, artifacts=None, store=None,
+                         copy_as=None):
+    """
+    Search for a file in a directory and its subdirectories, then copy it to a new location.
 
+    Parameters:
+        search_file (str): The name of the file to search for.
+        search_path (str): The directory path to start the search.
+        copy_to (str): The directory path to copy the file to.
+        index (dict): Optional index from build_file_index; avoids walking the tree.
+        artifacts (dict): Optional digests of previously delivered files. The copy is skipped
+            when the source hash matches the record, and the record is updated after a copy.
+        store (str): Optional content-addressed store directory. The file is added to the
+            store once and linked into copy_to instead of being copied.
+        copy_as (str): Optional name for the copy; defaults to search_file.
+
+    Returns:
+        str: A message indicating the search and copy status.
+    """
+    file_path = locate_file(search_file, search_path, index)
+    if file_path is None:
+        return f"{search_file} not found in {search_path}"
+
+    print(f"Found {search_file} at {file_path}")
+
+    destination = os.path.join(copy_to, copy_as or search_file)
+    label = search_file if copy_as in (None, search_file) else f"{search_file} as {copy_as}"
+    digest = None
+    if artifacts is not None or store is not None:
+        digest = file_digest(file_path)
+    if artifacts is not None:
+        if artifact_is_current(artifacts, destination, sha256=digest["sha256"]):
+            return f"{label} is unchanged in {copy_to}"
+
+    # Check if the destination directory exists; create it if it doesn't
+    if not os.path.exists(copy_to):
+        print(f"Directory {copy_to} does not exist. Creating it...")
+        os.makedirs(copy_to, exist_ok=True)
+
+    if store is not None:
+        # Keep one copy in the store and link it into the variant folder
+        store_file(file_path, store, digest)
+        method = link_from_store(store, digest["sha256"], destination)
+        if method == "unchanged":
+            message = f"{label} is unchanged in {copy_to}"
+        else:
+            message = f"Successfully linked {label} to {copy_to} ({method})"
+    else:
+        # Unlink first so a file hardlinked from the store is replaced, not written through
+        if os.path.lexists(destination):
+            os.remove(destination)
+        # Copy the file
+        shutil.copy(file_path, destination)
+        message = f"Successfully copied {label} to {copy_to}"
+
+    if artifacts is not None:
+        artifacts[artifact_key(destination)] = digest
+    return message
+
+def resolve_manifests(manifests, search_path, index=None):
+    """
+    Resolve every file of every variant manifest against a single index of the tree.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its list of file names.
+        search_path (str): The directory path to search.
+        index (dict): Optional prebuilt index; built from search_path when omitted.
+
+    Returns:
+        dict: Maps each variant to a dict of file name -> found path (or None).
+    """
+    if index is None:
+        index = build_file_index(search_path)
+    return {
+        variant: {dest: locate_file(source, search_path, index) for dest, source in manifest_items(files)}
+        for variant, files in manifests.items()
+    }
+
+def copy_manifests(manifests, search_path, archive_name=None, artifacts=None, store=None, workers=1,
+                   index=None):
+    """
+    Copy the files of all variant manifests into their variant folders,
+    walking search_path only once.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its list of file names, or to a dict of
+            destination name -> source name.
+        search_path (str): The directory path to search.
+        archive_name (str): Optional zip file name (e.g. "release_libraries.zip"). When given,
+            manifest files found in the archive are streamed straight out of it instead of
+            requiring the archive to be extracted first.
+        artifacts (dict): Optional digests of previously delivered files; files whose source
+            is unchanged are not rewritten. Updated in place.
+        store (str): Optional content-addressed store directory; files identical across
+            variants are kept once and linked into each variant folder.
+        workers (int): Number of threads extracting and copying files for all variants
+            at once. 1 does everything on the calling thread.
+        index (dict): Optional prebuilt index of search_path from build_file_index.
+
+    Returns:
+        dict: Maps each variant to the list of status messages for its files, in manifest order.
+    """
+    if index is None:
+        index = build_file_index(search_path)
+    messages = {variant: {} for variant in manifests}
+
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if workers > 1:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+
+        if archive_name is not None:
+            zip_file_path = locate_file(archive_name, search_path, index)
+            if zip_file_path is None:
+                print(f"{archive_name} not found in {search_path}")
+            else:
+                streamed = stream_manifest_members(zip_file_path, manifests, artifacts=artifacts,
+                                                   store=store, executor=executor)
+                for variant, names in streamed.items():
+                    for name, written in names.items():
+                        if written:
+                            messages[variant][name] = f"Successfully extracted {name} to {variant}"
+                        else:
+                            messages[variant][name] = f"{name} is unchanged in {variant}"
+
+        # Everything not streamed from the archive comes from the checkout
+        pending = {}
+        for variant, files in manifests.items():
+            for dest, source in manifest_items(files):
+                if dest in messages[variant]:
+                    continue
+                args = (source, search_path, variant, index, artifacts, store, dest)
+                if executor is None:
+                    messages[variant][dest] = search_and_copy_file(*args)
+                else:
+                    pending[(variant, dest)] = executor.submit(search_and_copy_file, *args)
+
+        for (variant, dest), future in pending.items():
+            messages[variant][dest] = future.result()
+
+    return {
+        variant: [messages[variant][dest] for dest, _ in manifest_items(files)]
+        for variant, files in manifests.items()
+    }
+
+def stream_manifest_members(zip_file_path, manifests, chunk_size=EXTRACT_CHUNK_SIZE, artifacts=None,
+                            store=None, executor=None):
+    """
+    Stream the manifest files out of a zip archive directly into the variant folders.
+
+    Only members whose file name appears in a manifest are read. Each member is
+    decompressed once, in chunk_size pieces, and written to every variant that needs it,
+    so the rest of the archive never touches the disk.
+
+    Parameters:
+        zip_file_path (str): The path of the zip archive.
+        manifests (dict): Maps a variant folder name to its list of file names, or to a dict of
+            destination name -> source name.
+        chunk_size (int): The size of the read buffer in bytes.
+        artifacts (dict): Optional digests of previously delivered files. A variant is skipped
+            when the member's CRC-32 and size match its record. Updated in place.
+        store (str): Optional content-addressed store directory. Members are decompressed
+            into the store once and linked into the variant folders.
+        executor (Executor): Optional executor; members are then decompressed in parallel
+            from the one open archive.
+
+    Returns:
+        dict: Maps each variant to a dict of file name -> True if written, False if unchanged,
+            for every file found in the archive.
+    """
+    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+        jobs, streamed = plan_archive_members(zip_ref, manifests, artifacts)
+        pending = []
+        for info, targets in jobs:
+            args = (zip_ref, info, targets, chunk_size, store)
+            if executor is None:
+                pending.append((info, targets, extract_member(*args)))
+            else:
+                pending.append((info, targets, executor.submit(extract_member, *args)))
+
+        # Collect the results in archive order
+        for info, targets, digest in pending:
+            if executor is not None:
+                digest = digest.result()
+            record_extracted(zip_file_path, info, targets, digest, streamed, artifacts)
+    return streamed
+
+def plan_archive_members(zip_ref, manifests, artifacts=None):
+    """
+    Work out which archive members have to be extracted, and to which variant folders.
+
+    Parameters:
+        zip_ref (ZipFile): The open archive. Its infolist() comes from the central directory,
+            read once when the archive was opened.
+        manifests (dict): Maps a variant folder name to its list of file names, or to a dict of
+            destination name -> source name.
+        artifacts (dict): Optional digests of previously delivered files. A variant is left out
+            when the member's CRC-32 and size match its record.
+
+    Returns:
+        tuple: (jobs, streamed). jobs is a list of (ZipInfo, targets), where targets are
+            (variant folder, file name) pairs; streamed maps each variant to a dict with False
+            for every file that is unchanged.
+    """
+    # Which variant folders want each file name, and under which name
+    wanted = {}
+    for variant, files in manifests.items():
+        for dest, source in manifest_items(files):
+            wanted.setdefault(source, []).append((variant, dest))
+
+    streamed = {variant: {} for variant in manifests}
+    jobs = []
+    for info in zip_ref.infolist():
+        if info.is_dir():
+            continue
+        name = posixpath.basename(info.filename)
+        targets = wanted.pop(name, None)
+        if targets is None:
+            continue
+
+        if artifacts is not None:
+            # The central directory already holds each member's CRC-32 and size
+            for variant, dest in list(targets):
+                destination = os.path.join(variant, dest)
+                if artifact_is_current(artifacts, destination, crc32=info.CRC, size=info.file_size):
+                    streamed[variant][dest] = False
+                    targets.remove((variant, dest))
+            if not targets:
+                continue
+        jobs.append((info, targets))
+    return jobs, streamed
+
+def record_extracted(zip_file_path, info, targets, digest, streamed, artifacts=None):
+    # Note an extracted member in the per-variant results and the artifact digests
+    name = posixpath.basename(info.filename)
+    print(f"Extracted {name} from {zip_file_path} to "
+          f"{', '.join(variant if dest == name else os.path.join(variant, dest) for variant, dest in targets)}")
+    for variant, dest in targets:
+        streamed[variant][dest] = True
+        if artifacts is not None:
+            artifacts[artifact_key(os.path.join(variant, dest))] = dict(digest)
+
+def extract_member(zip_ref, info, targets, chunk_size=EXTRACT_CHUNK_SIZE, store=None):
+    """
+    Decompress one archive member into each of the target variant folders.
+
+    Parameters:
+        zip_ref (ZipFile): The open archive.
+        info (ZipInfo): The member to extract.
+        targets (list): (variant folder, file name) pairs that receive the member.
+        chunk_size (int): The size of the read buffer in bytes.
+        store (str): Optional content-addressed store directory to extract into and link from.
+
+    Returns:
+        dict: The digest ("sha256", "crc32", "size") of the member.
+    """
+    if store is not None:
+        with zip_ref.open(info) as source:
+            digest = store_stream(source, store, chunk_size)
+        for variant, name in targets:
+            link_from_store(store, digest["sha256"], os.path.join(variant, name))
+        return digest
+
+    sha256 = hashlib.sha256()
+    with contextlib.ExitStack() as stack:
+        outputs = []
+        for variant, name in targets:
+            os.makedirs(variant, exist_ok=True)
+            destination = os.path.join(variant, name)
+            # Unlink first so a file hardlinked from the store is replaced, not written through
+            if os.path.lexists(destination):
+                os.remove(destination)
+            outputs.append(stack.enter_context(open(destination, 'wb')))
+
+        source = stack.enter_context(zip_ref.open(info))
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            for output in outputs:
+                output.write(chunk)
+    return {"sha256": sha256.hexdigest(), "crc32": info.CRC, "size": info.file_size}
+
+def extract_member_at(zip_file_path, filename, targets, chunk_size=EXTRACT_CHUNK_SIZE, store=None):
+    """
+    Open an archive and extract one member with extract_member. Takes only picklable
+    arguments, so it can run in a ProcessPoolExecutor.
+
+    Parameters:
+        zip_file_path (str): The path of the zip archive.
+        filename (str): The member's name in the archive (ZipInfo.filename).
+        targets (list): (variant folder, file name) pairs that receive the member.
+        chunk_size (int): The size of the read buffer in bytes.
+        store (str): Optional content-addressed store directory.
+
+    Returns:
+        dict: The digest of the member.
+    """
+    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+        return extract_member(zip_ref, zip_ref.getinfo(filename), targets, chunk_size, store)
+
+def search_and_extract_file(search_file, search_path):
+    # Iterate through the directory and its subdirectories
+    for root, _, files in os.walk(search_path):
+        for file_name in files:
+            if file_name == search_file:
+                # Construct the full path to the zip file
+                zip_file_path = os.path.join(root, file_name)
+
+                # Extract the zip file into a directory with the same name
+                extract_directory = os.path.splitext(zip_file_path)[0]  # Remove the .zip extension
+                extract_directory = os.path.join(root, extract_directory)
+
+                # Create the extraction directory if it doesn't exist
+                os.makedirs(extract_directory, exist_ok=True)
+
+                # Extract the zip file
+                with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+                    zip_ref.extractall(extract_directory)
+
+                print(f"Extracted {search_file} from {zip_file_path} to {extract_directory}")
+
+def extract_files():
+    search_and_extract_file("release_libraries.zip", "./twain_library")
+
+def ensure_dtwain_core_directory():
+    # Get the current directory where the script is located
+    current_directory = os.path.dirname(os.path.abspath(__file__))
+    
+    # Specify the names of the directories you want to create
+    available_binaries = [
+        "dtwain_x86",
+        "dtwain_x86_unicode",
+        "dtwain_x64",
+        "dtwain_x64_unicode",
+    ]
+
+    for binaries in available_binaries:
+        if not os.path.exists(os.path.join(current_directory, binaries)):
+                              os.makedirs(os.path.join(current_directory, binaries))
+                              print(f"`Created " + binaries)
+
+def constants_manifests(manifests, root="."):
+    """
+    Make sure the variants' dtwain.py shims have a shared module to read. When the manifests do
+    not deliver SHARED_CONSTANTS and root does not already hold its dtwain.py, every variant
+    folder with a DLL gets the full dtwain.py instead, and so no shim.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its manifest (see manifest_rules).
+        root (str): The folder the variant folders are published in.
+
+    Returns:
+        dict: The manifests, with "dtwain.py" added to the variants that need it.
+    """
+    if SHARED_CONSTANTS in manifests or os.path.isfile(os.path.join(root, SHARED_CONSTANTS, "dtwain.py")):
+        return manifests
+    delivered = {}
+    for variant, files in manifests.items():
+        names = [rule["rename"] or rule["pattern"] for rule in manifest_rules(files)]
+        if "dtwain.py" not in names and any(name.lower().endswith(".dll") for name in names):
+            files = dict(files, **{"dtwain.py": "dtwain.py"}) if isinstance(files, dict) else list(files) + ["dtwain.py"]
+        delivered[variant] = files
+    return delivered
+
+def variant_shims(manifests):
+    """
+    Work out the dtwain.py shim of every variant folder that does not get dtwain.py itself.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its resolved manifest.
+
+    Returns:
+        dict: Variant folder name to the text of its dtwain.py. Folders without a DLL in their
+            manifest, and the shared folder, get none.
+    """
+    shims = {}
+    for variant, files in manifests.items():
+        names = [dest for dest, _ in manifest_items(files)]
+        dlls = [name for name in names if name.lower().endswith(".dll")]
+        if variant != SHARED_CONSTANTS and "dtwain.py" not in names and dlls:
+            shims[variant] = VARIANT_SHIM.format(variant=variant, dll=dlls[0], shared=SHARED_CONSTANTS)
+    return shims
+
+def write_variant_shims(manifests, folders):
+    """
+    Write the dtwain.py shim of each variant folder, leaving shims that are already current alone.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its resolved manifest.
+        folders (dict): Maps a variant folder name to the folder to write to.
+
+    Returns:
+        list: The variants whose shim was written.
+    """
+    written = []
+    for variant, text in variant_shims(manifests).items():
+        shim_path = os.path.join(folders[variant], "dtwain.py")
+        try:
+            with open(shim_path, 'r') as shim_file:
+                if shim_file.read() == text + "\n":
+                    continue
+        except (OSError, UnicodeDecodeError):
+            pass
+        # A seeded generation links the old file; the rename replaces the link, not its target
+        write_text_atomic(shim_path, text)
+        written.append(variant)
+    return written
+
+def precompile_shared(folder=SHARED_CONSTANTS):
+    """
+    Compile the shared dtwain.py to bytecode and to the dtwain_constants table, so the first
+    import after a refresh does not have to.
+
+    Parameters:
+        folder (str): The published shared folder.
+    """
+    source_path = os.path.join(folder, "dtwain.py")
+    if not os.path.isfile(source_path):
+        return
+    try:
+        py_compile.compile(source_path, doraise=True)
+        # dtwain_constants keeps one table, for the shared folder next to it
+        table_source = dtwain_constants.constants_source()
+        if table_source is not None and os.path.samefile(source_path, table_source):
+            dtwain_constants.compile_constants(table_source)
+        print(f"Precompiled {source_path}")
+    except (py_compile.PyCompileError, SyntaxError, ValueError, UnicodeDecodeError, OSError) as e:
+        print(f"Could not precompile {source_path}: {e}")
+
+def remove_with_retry(path, remove, retries=CLEANUP_RETRIES, backoff=CLEANUP_BACKOFF):
+    """
+    Remove a file or empty directory, retrying with exponential backoff while it is locked.
+
+    Read-only entries (git marks its object files read-only, which blocks deletion on
+    Windows) are made writable before the next attempt.
+
+    Parameters:
+        path (str): The file or directory to remove.
+        remove (callable): os.remove or os.rmdir.
+        retries (int): The maximum number of attempts.
+        backoff (float): The delay before the second attempt, in seconds.
+
+    Returns:
+        tuple: (attempts made, error message or None on success).
+    """
+    delay = backoff
+    for attempt in range(1, retries + 1):
+        try:
+            remove(path)
+            return attempt, None
+        except FileNotFoundError:
+            return attempt, None
+        except OSError as e:
+            if attempt == retries:
+                return attempt, str(e)
+            if isinstance(e, PermissionError):
+                try:
+                    os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+                except OSError:
+                    pass
+            time.sleep(delay)
+            delay *= 2
+
+def remove_directory(directory_path, keep=False, workers=PACKAGE_WORKERS, retries=CLEANUP_RETRIES,
+                     backoff=CLEANUP_BACKOFF):
+    """
+    Remove a directory tree, such as the twain_library checkout, on any platform.
+
+    The tree is listed with os.scandir, files are deleted in parallel, and directories are then
+    removed deepest first. Locked files are retried with backoff instead of waiting up front.
+
+    Parameters:
+        directory_path (str): The directory to remove.
+        keep (bool): Leave the directory in place so the next incremental run can fetch
+            into it instead of cloning again.
+        workers (int): Number of threads deleting files.
+        retries (int): The maximum number of attempts per file or directory.
+        backoff (float): The delay before the second attempt, in seconds.
+
+    Returns:
+        dict: What happened: "path", "kept", "removed_files", "removed_dirs", "retried"
+            (entries that needed more than one attempt), "failed" (list of (path, error))
+            and "seconds".
+    """
+    start = time.perf_counter()
+    report = {"path": directory_path, "kept": keep, "removed_files": 0, "removed_dirs": 0,
+              "retried": 0, "failed": [], "seconds": 0.0}
+
+    if keep:
+        print(f"Keeping {directory_path} for the next incremental run")
+        return report
+    if not os.path.lexists(directory_path):
+        print(f"{directory_path} does not exist; nothing to remove")
+        return report
+    if os.path.islink(directory_path) or not os.path.isdir(directory_path):
+        # Only the link itself is removed, never what it points to
+        attempts, error = remove_with_retry(directory_path, os.remove, retries, backoff)
+        if error is None:
+            report["removed_files"] = 1
+        else:
+            report["failed"].append((directory_path, error))
+        report["seconds"] = time.perf_counter() - start
+        return report
+
+    # List the whole tree first; directories are collected parents before children
+    files = []
+    directories = []
+    pending = [directory_path]
+    while pending:
+        current = pending.pop()
+        directories.append(current)
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    else:
+                        files.append(entry.path)
+        except OSError as e:
+            report["failed"].append((current, str(e)))
+
+    def record(path, outcome, kind):
+        attempts, error = outcome
+        if attempts > 1:
+            report["retried"] += 1
+        if error is None:
+            report[kind] += 1
+        else:
+            report["failed"].append((path, error))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        outcomes = executor.map(lambda path: remove_with_retry(path, os.remove, retries, backoff), files)
+        for path, outcome in zip(files, outcomes):
+            record(path, outcome, "removed_files")
+
+    for directory in reversed(directories):
+        record(directory, remove_with_retry(directory, os.rmdir, retries, backoff), "removed_dirs")
+
+    report["seconds"] = time.perf_counter() - start
+    for path, error in report["failed"]:
+        print(f"Could not remove {path}: {error}")
+    print(f"Removed {report['removed_files']} files and {report['removed_dirs']} directories from "
+          f"{directory_path} in {report['seconds']:.2f}s ({report['retried']} retried, "
+          f"{len(report['failed'])} failed)")
+    return report
+
+def hash_files(paths, workers=PACKAGE_WORKERS):
+    """
+    Hash many files in parallel. Each file is read in EXTRACT_CHUNK_SIZE chunks, and hashlib
+    releases the GIL while hashing them, so threads hash files concurrently.
+
+    Parameters:
+        paths (list): The files to hash.
+        workers (int): Number of hashing threads.
+
+    Returns:
+        dict: Maps each path to its digest from file_digest.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        return {path: file_digest(path) for path in paths}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(paths, executor.map(file_digest, paths)))
+
+def integrity_files(folder):
+    # The files an integrity manifest covers: all but the manifest and leftover *.tmp files
+    with os.scandir(folder) as scan:
+        return {entry.name: entry.stat() for entry in scan
+                if entry.is_file() and entry.name != INTEGRITY_MANIFEST and not entry.name.endswith(".tmp")}
+
+def write_integrity_manifest(folder, workers=PACKAGE_WORKERS, digests=None):
+    """
+    Record the size, mtime and SHA-256 of every file in a variant folder in
+    folder/dtwain_manifest.json. The manifest is replaced in one rename.
+
+    Parameters:
+        folder (str): The variant folder.
+        workers (int): Number of hashing threads.
+        digests (dict): SHA-256 hashes already known, by file name; other files are hashed.
+
+    Returns:
+        dict: The manifest that was written.
+    """
+    entries = integrity_files(folder)
+
+    known = dict(digests or {})
+    unknown = [name for name in entries if name not in known]
+    hashed = hash_files([os.path.join(folder, name) for name in unknown], workers)
+    for name in unknown:
+        known[name] = hashed[os.path.join(folder, name)]["sha256"]
+    manifest = {
+        "version": INTEGRITY_VERSION,
+        "files": {
+            name: {
+                "size": info.st_size,
+                "mtime_ns": info.st_mtime_ns,
+                "sha256": known[name],
+            }
+            for name, info in sorted(entries.items())
+        },
+    }
+    write_text_atomic(os.path.join(folder, INTEGRITY_MANIFEST), json.dumps(manifest, indent=2))
+    return manifest
+
+def verify_integrity(folder, rehash="suspect", workers=PACKAGE_WORKERS):
+    """
+    Check a variant folder against its dtwain_manifest.json.
+
+    By default only metadata is read: a file whose size and mtime match the manifest is taken
+    as intact, a file whose size differs is reported as modified, and only files with the right
+    size but a different mtime are re-hashed. That keeps routine health checks to a few stat
+    calls per folder.
+
+    Parameters:
+        folder (str): The variant folder.
+        rehash (str): "suspect" (default), "all" to re-hash every file, or "none" to trust
+            size and mtime alone and report mtime-only differences as suspect.
+        workers (int): Number of hashing threads.
+
+    Returns:
+        dict: Lists of file names under "ok", "modified", "missing", "extra" and "suspect",
+            plus "rehashed" (how many files were hashed) and "error" (None if the manifest
+            could be read).
+    """
+    report = {"folder": folder, "ok": [], "modified": [], "missing": [], "extra": [], "suspect": [],
+              "rehashed": 0, "error": None}
+    try:
+        with open(os.path.join(folder, INTEGRITY_MANIFEST), 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError) as e:
+        report["error"] = f"Could not read {INTEGRITY_MANIFEST}: {e}"
+        return report
+
+    recorded = manifest.get("files", {})
+    present = integrity_files(folder)
+
+    to_hash = []
+    for name, expected in recorded.items():
+        info = present.get(name)
+        if info is None:
+            report["missing"].append(name)
+        elif info.st_size != expected["size"]:
+            report["modified"].append(name)
+        elif rehash == "all" or (rehash == "suspect" and info.st_mtime_ns != expected["mtime_ns"]):
+            to_hash.append(name)
+        elif info.st_mtime_ns != expected["mtime_ns"]:
+            report["suspect"].append(name)
+        else:
+            report["ok"].append(name)
+    report["extra"] = sorted(name for name in present if name not in recorded)
+
+    digests = hash_files([os.path.join(folder, name) for name in to_hash], workers)
+    report["rehashed"] = len(to_hash)
+    for name in to_hash:
+        if digests[os.path.join(folder, name)]["sha256"] == recorded[name]["sha256"]:
+            report["ok"].append(name)
+        else:
+            report["modified"].append(name)
+    return report
+
+def load_state(state_path=STATE_FILE):
+    """
+    Read the state left by the previous refresh.
+
+    Parameters:
+        state_path (str): The path of the state file.
+
+    Returns:
+        dict: The saved state, or an empty state if there is none or it is unreadable.
+    """
+    try:
+        with open(state_path, 'r') as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        return {"version": STATE_VERSION, "artifacts": {}}
+    if state.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "artifacts": {}}
+    return state
+
+def save_state(state, state_path=STATE_FILE):
+    """
+    Write the refresh state, replacing the old file in one step.
+
+    Parameters:
+        state (dict): The state to save.
+        state_path (str): The path of the state file.
+    """
+    temp_path = state_path + ".tmp"
+    with open(temp_path, 'w') as state_file:
+        json.dump(state, state_file, indent=2, sort_keys=True)
+    os.replace(temp_path, state_path)
+
+def remote_head(repo_url):
+    """
+    Ask the remote for the commit its HEAD points to, without cloning or fetching.
+
+    Parameters:
+        repo_url (str): The URL of the Git repository.
+
+    Returns:
+        str: The commit SHA, or None if the remote could not be reached.
+    """
+    try:
+        output = git.cmd.Git().ls_remote(repo_url, "HEAD")
+    except git.GitCommandError as e:
+        print(f"Could not query {repo_url}: {e}")
+        return None
+    return output.split()[0] if output else None
+
+def manifests_fingerprint(manifests):
+    """
+    Hash what decides which files a run delivers, apart from the upstream commit: the variant
+    manifests and the dtwain.py shims written from them.
+
+    Parameters:
+        manifests (dict): The variant manifests of the run, before resolving.
+
+    Returns:
+        str: A SHA-256 hex digest. With the commit unchanged, the same digest means the same
+            files are resolved, renamed and shimmed.
+    """
+    text = json.dumps({"manifests": manifests, "shared": SHARED_CONSTANTS, "shim": VARIANT_SHIM}, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def artifacts_present(artifacts):
+    # Cheap check that every recorded file is still delivered with its recorded size
+    for key, recorded in artifacts.items():
+        try:
+            if os.path.getsize(key) != recorded["size"]:
+                return False
+        except OSError:
+            return False
+    return True
+
+def current_generation(generations_dir=GENERATIONS_DIR):
+    """
+    Read the generation pointer.
+
+    Parameters:
+        generations_dir (str): The directory holding the generations.
+
+    Returns:
+        str: The id of the published generation, or None if nothing has been published.
+    """
+    try:
+        with open(os.path.join(generations_dir, GENERATION_POINTER), 'r') as pointer:
+            return pointer.read().strip() or None
+    except OSError:
+        return None
+
+def begin_generation(variants, generations_dir=GENERATIONS_DIR, carry=None):
+    """
+    Create the staging directory for a new generation of the variant folders.
+
+    Each staged variant is seeded with links to the published files named in carry, so files
+    that do not change are carried over without being rewritten. Files the new generation no
+    longer delivers are left behind with the old one.
+
+    Parameters:
+        variants (iterable): The variant folder names, e.g. the keys of dtwain_manifests.
+        generations_dir (str): The directory holding the generations.
+        carry (dict): Maps a variant to the names of the files it still delivers. Variants
+            not in it, or all of them when carry is None, start empty.
+
+    Returns:
+        tuple: (generation id, staging directory).
+    """
+    os.makedirs(generations_dir, exist_ok=True)
+    base = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+    generation = base
+    suffix = 0
+    while any(os.path.lexists(os.path.join(generations_dir, generation + extension))
+              for extension in ("", ".staging")):
+        suffix += 1
+        generation = f"{base}-{suffix}"
+
+    staging = os.path.join(generations_dir, generation + ".staging")
+    for variant in variants:
+        staged_variant = os.path.join(staging, variant)
+        os.makedirs(staged_variant)
+        delivered = set((carry or {}).get(variant, ()))
+        if delivered and os.path.isdir(variant):
+            with os.scandir(variant) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name in delivered:
+                        link_or_copy(entry.path, os.path.join(staged_variant, entry.name))
+    print(f"Staging generation {generation} in {staging}")
+    return generation, staging
+
+def replace_symlink(link_path, target_dir):
+    """
+    Atomically point a directory symlink at target_dir, creating it if needed.
+
+    The new link is made under a temporary name and renamed over the old one, so the link
+    always resolves to either the old or the new target. The link is stored relative.
+
+    Parameters:
+        link_path (str): The symlink to create or replace. Must not be a real directory.
+        target_dir (str): The directory it should point to.
+
+    Returns:
+        bool: False if symlinks cannot be created here (e.g. Windows without the privilege).
+    """
+    if os.name == "nt":
+        return False
+    link_target = os.path.relpath(target_dir, os.path.dirname(os.path.abspath(link_path)))
+    temp_link = link_path + ".publish"
+    if os.path.lexists(temp_link):
+        os.remove(temp_link)
+    try:
+        os.symlink(link_target, temp_link, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        return False
+    os.replace(temp_link, link_path)
+    return True
+
+def write_text_atomic(file_path, text):
+    # Pointer and manifest files are replaced in one rename so readers never see them half-written
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'w') as output:
+        output.write(text + "\n")
+    os.replace(temp_path, file_path)
+
+def swap_variant(variant, target_dir, retired_dir):
+    """
+    Point a published variant folder at a new generation.
+
+    Where symlinks are available the variant folder is a symlink that is replaced with a
+    single rename, so a reader sees either the old or the new generation, never a mix.
+    On Windows the folders are swapped with two renames instead.
+
+    The first swap moves a plain variant folder into retired_dir, which collect_generations
+    deletes later. In a clone of this repository, where the variant folders are tracked,
+    git then reports every tracked variant file as deleted; generations are for installs
+    outside a checkout, which is why they are opt-in.
+
+    Parameters:
+        variant (str): The published variant folder, e.g. "dtwain_x64".
+        target_dir (str): The variant folder inside the new generation.
+        retired_dir (str): Where a plain (non-symlink) variant folder is moved out of the way.
+
+    Returns:
+        str: "symlink" or "rename".
+    """
+    if os.name != "nt":
+        if os.path.isdir(variant) and not os.path.islink(variant):
+            # A plain folder from before staged publishing; move it aside the first time
+            os.makedirs(os.path.dirname(os.path.join(retired_dir, variant)), exist_ok=True)
+            os.rename(variant, os.path.join(retired_dir, variant))
+
+        if replace_symlink(variant, target_dir):
+            return "symlink"
+
+    if os.path.lexists(variant):
+        os.makedirs(os.path.dirname(os.path.join(retired_dir, variant)), exist_ok=True)
+        os.rename(variant, os.path.join(retired_dir, variant))
+    os.rename(target_dir, variant)
+    return "rename"
+
+def publish_generation(variants, generation, generations_dir=GENERATIONS_DIR):
+    """
+    Publish a staged generation: seal it, swap every variant folder to it and move the
+    generation pointer.
+
+    Parameters:
+        variants (iterable): The variant folder names.
+        generation (str): The id returned by begin_generation.
+        generations_dir (str): The directory holding the generations.
+    """
+    staging = os.path.join(generations_dir, generation + ".staging")
+    target = os.path.join(generations_dir, generation)
+    # A generation only gets its final name once every file is in place
+    os.rename(staging, target)
+
+    retired = os.path.join(generations_dir, generation + ".retired")
+    for variant in variants:
+        method = swap_variant(variant, os.path.join(target, variant), retired)
+        print(f"Published {variant} from generation {generation} ({method})")
+
+    write_text_atomic(os.path.join(generations_dir, GENERATION_POINTER), generation)
+
+def collect_generations(generations_dir=GENERATIONS_DIR, retain=RETAIN_GENERATIONS):
+    """
+    Delete old generations, keeping the newest `retain` ones and always the current one.
+    Leftover staging directories from interrupted runs and retired folders are deleted too.
+
+    Deletion errors (e.g. a file still open on Windows) are ignored; the directory is
+    tried again on the next run.
+
+    Parameters:
+        generations_dir (str): The directory holding the generations.
+        retain (int): How many published generations to keep.
+
+    Returns:
+        list: The names of the directories removed.
+    """
+    current = current_generation(generations_dir)
+    try:
+        names = sorted(entry.name for entry in os.scandir(generations_dir) if entry.is_dir())
+    except OSError:
+        return []
+
+    published = [name for name in names if "." not in name]
+    keep = set(published[-retain:]) if retain > 0 else set()
+    keep.add(current)
+
+    removed = []
+    for name in names:
+        if name in keep:
+            continue
+        shutil.rmtree(os.path.join(generations_dir, name), ignore_errors=True)
+        removed.append(name)
+    if removed:
+        print(f"Removed old generations: {', '.join(removed)}")
+    return removed
+
+def rebase_artifacts(artifacts, old_root, new_root):
+    # Move artifact keys from one directory root to another, e.g. into and out of staging
+    return {
+        artifact_key(os.path.join(new_root, os.path.relpath(key, old_root or "."))): digest
+        for key, digest in artifacts.items()
+    }
+
+def list_remote_tags(repo_url):
+    """
+    List the tags of a remote repository without cloning it.
+
+    Parameters:
+        repo_url (str): The URL of the Git repository.
+
+    Returns:
+        list: Tag names, in the order the remote lists them.
+    """
+    output = git.cmd.Git().ls_remote("--tags", "--refs", repo_url)
+    return [line.split("refs/tags/", 1)[1] for line in output.splitlines() if "refs/tags/" in line]
+
+def checkout_tag(repo_url, local_path, tag, strategy="shallow", sparse_paths=None, progress=None):
+    """
+    Check out a tagged release, fetching only what the tag needs.
+
+    The first tag is cloned; later tags are fetched into the same repository, so git only
+    transfers the objects that differ from releases already fetched.
+
+    Parameters:
+        repo_url (str): The URL of the Git repository.
+        local_path (str): The checkout used for tagged releases.
+        tag (str): The tag to check out.
+        strategy (str): The clone strategy; one of the keys of CLONE_STRATEGIES.
+        sparse_paths (list): File names or patterns to check out with the "sparse" strategy.
+        progress (Progress): Progress handler; defaults to throttled console output.
+
+    Returns:
+        str: The commit the tag points to.
+    """
+    if progress is None:
+        progress = Progress()
+    try:
+        repo = git.Repo(local_path)
+    except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+        if os.path.lexists(local_path):
+            remove_directory(local_path)
+        print(f"Cloning {tag} from {repo_url} ({strategy})...")
+        repo = clone_repository(repo_url, local_path, strategy, sparse_paths, progress, branch=tag)
+        return repo.head.commit.hexsha
+
+    print(f"Fetching {tag} from {repo_url}...")
+    depth = {"depth": 1} if strategy in ("shallow", "sparse") else {}
+    repo.remote().fetch(f"+refs/tags/{tag}:refs/tags/{tag}", progress=progress, **depth)
+    repo.git.checkout("--force", tag)
+    return repo.head.commit.hexsha
+
+def version_folder(tag, versions_dir=VERSIONS_DIR):
+    # Tags such as "release/5.4" become a single directory name
+    return os.path.join(versions_dir, tag.replace("/", "_"))
+
+def installed_versions(versions_dir=VERSIONS_DIR):
+    """
+    List the releases installed side by side.
+
+    Returns:
+        dict: Maps each installed tag to its version info (tag, commit, installed time).
+    """
+    versions = {}
+    try:
+        entries = list(os.scandir(versions_dir))
+    except OSError:
+        return versions
+    for entry in entries:
+        if entry.name == VERSION_LINK or not entry.is_dir(follow_symlinks=False):
+            continue
+        try:
+            with open(os.path.join(entry.path, VERSION_INFO), 'r') as info_file:
+                info = json.load(info_file)
+        except (OSError, ValueError):
+            continue
+        versions[info["tag"]] = info
+    return versions
+
+def install_version(tag, manifests, repo_url=DEFAULT_REPO_URL, local_path=VERSION_CHECKOUT,
+                    versions_dir=VERSIONS_DIR, store=ARTIFACT_STORE, strategy="shallow",
+                    archive_name="release_libraries.zip", workers=PACKAGE_WORKERS, progress=None,
+                    force=False):
+    """
+    Install a tagged release as its own set of variant folders under versions_dir/<tag>.
+
+    Files are linked from the shared content-addressed store, so a new version only adds the
+    files that differ from versions already installed. The version is built under a staging
+    name and renamed into place when complete.
+
+    Parameters:
+        tag (str): The upstream tag to install.
+        manifests (dict): Maps a variant folder name to its manifest (see manifest_rules).
+        repo_url (str): The URL of the Git repository.
+        local_path (str): The checkout used for tagged releases.
+        versions_dir (str): The directory holding the installed versions.
+        store (str): The content-addressed store shared by all versions.
+        strategy (str): The clone strategy; one of the keys of CLONE_STRATEGIES.
+        archive_name (str): The release archive to stream manifest files from.
+        workers (int): Number of threads used to extract and copy files.
+        progress (Progress): Git progress handler; defaults to throttled console output.
+        force (bool): Reinstall even if the version is already installed.
+
+    Returns:
+        str: The folder the version was installed to.
+    """
+    target = version_folder(tag, versions_dir)
+    if os.path.isdir(target) and not force:
+        print(f"{tag} is already installed in {target}")
+        return target
+
+    # A version is built from scratch, so its shims can only use a shared folder it delivers
+    staging = target + ".staging"
+    if os.path.lexists(staging):
+        remove_directory(staging)
+    manifests = constants_manifests(manifests, staging)
+    commit = checkout_tag(repo_url, local_path, tag, strategy,
+                          sparse_checkout_paths(manifests, archive_name), progress)
+
+    index = build_file_index(local_path)
+    resolved = classify_checkout(manifests, local_path, archive_name, index)[0]
+    copy_manifests({os.path.join(staging, variant): files for variant, files in resolved.items()},
+                   local_path, archive_name, None, store, workers, index)
+    write_variant_shims(resolved, {variant: os.path.join(staging, variant) for variant in resolved})
+    with open(os.path.join(staging, VERSION_INFO), 'w') as info_file:
+        json.dump({"tag": tag, "commit": commit, "installed": time.time()}, info_file, indent=2)
+
+    if os.path.lexists(target):
+        retired = target + ".retired"
+        os.rename(target, retired)
+        remove_directory(retired)
+    os.rename(staging, target)
+    print(f"Installed {tag} ({commit}) in {target}")
+    return target
+
+def current_version(versions_dir=VERSIONS_DIR):
+    """
+    Returns:
+        str: The tag the "current" pointer selects, or None.
+    """
+    try:
+        with open(os.path.join(versions_dir, VERSION_POINTER), 'r') as pointer:
+            return pointer.read().strip() or None
+    except OSError:
+        return None
+
+def use_version(tag, versions_dir=VERSIONS_DIR):
+    """
+    Switch the "current" pointer to an installed version.
+
+    versions_dir/current is a symlink that is replaced in one rename, so switching is
+    instant and readers never see a mix of versions. The tag is also written to a pointer
+    file for platforms without symlinks.
+
+    Parameters:
+        tag (str): An installed tag.
+        versions_dir (str): The directory holding the installed versions.
+    """
+    target = version_folder(tag, versions_dir)
+    if not os.path.isfile(os.path.join(target, VERSION_INFO)):
+        raise ValueError(f"{tag} is not installed in {versions_dir}")
+    if not replace_symlink(os.path.join(versions_dir, VERSION_LINK), target):
+        print(f"Symlinks are not available; use {target} directly or read {VERSION_POINTER}")
+    write_text_atomic(os.path.join(versions_dir, VERSION_POINTER), tag)
+    print(f"Current version is now {tag}")
+
+def remove_version(tag, versions_dir=VERSIONS_DIR):
+    """
+    Remove an installed version. The current version cannot be removed.
+    Objects stay in the store, where other versions may still use them.
+    """
+    if tag == current_version(versions_dir):
+        raise ValueError(f"{tag} is the current version; switch to another version first")
+    target = version_folder(tag, versions_dir)
+    if os.path.isdir(target):
+        remove_directory(target)
+
+def export_bundle(bundle_path, variants, compression=BUNDLE_COMPRESSION, state_path=STATE_FILE):
+    """
+    Write the published variant folders into a single compressed bundle for hosts that cannot
+    reach the repository.
+
+    The bundle is a tar archive whose first member is an index (dtwain_bundle.json) listing every
+    variant file with its size and SHA-256. The files themselves follow as objects/<sha256>, one
+    member per distinct content, so the files shared by the four variants are stored once.
+    Each folder is checked against its integrity manifest first, and the manifest's hashes are
+    reused, so nothing is hashed twice.
+
+    Parameters:
+        bundle_path (str): The bundle to write, e.g. "dtwain.tar.gz".
+        variants (iterable): The variant folder names, e.g. the keys of dtwain_manifests.
+        compression (str): "gz", "bz2" or "xz".
+        state_path (str): The refresh state file; its commit is recorded in the index.
+
+    Returns:
+        dict: The bundle index, or None if a variant folder failed verification.
+    """
+    index = {"version": BUNDLE_VERSION, "commit": load_state(state_path).get("commit"), "variants": {}}
+    objects = {}
+    for variant in variants:
+        report = verify_integrity(variant)
+        if report["error"] or report["modified"] or report["missing"]:
+            print(f"Not exporting: {variant} does not match its {INTEGRITY_MANIFEST}. Run the publish stage again.")
+            return None
+        with open(os.path.join(variant, INTEGRITY_MANIFEST), 'r') as manifest_file:
+            recorded = json.load(manifest_file)["files"]
+        index["variants"][variant] = {
+            name: {"size": entry["size"], "sha256": entry["sha256"]} for name, entry in recorded.items()
+        }
+        for name, entry in recorded.items():
+            objects.setdefault(entry["sha256"], os.path.join(variant, name))
+
+    index_data = json.dumps(index, indent=2, sort_keys=True).encode("utf-8")
+    temp_path = bundle_path + ".tmp"
+    try:
+        with tarfile.open(temp_path, "w:" + compression) as bundle:
+            info = tarfile.TarInfo(BUNDLE_INDEX)
+            info.size = len(index_data)
+            info.mtime = int(time.time())
+            bundle.addfile(info, io.BytesIO(index_data))
+            for sha256, source_path in sorted(objects.items()):
+                info = tarfile.TarInfo(f"objects/{sha256}")
+                info.size = os.path.getsize(source_path)
+                info.mtime = int(os.path.getmtime(source_path))
+                info.mode = STORE_FILE_MODE
+                with open(source_path, 'rb') as source:
+                    bundle.addfile(info, source)
+        os.replace(temp_path, bundle_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    total = sum(len(files) for files in index["variants"].values())
+    print(f"Exported {total} files ({len(objects)} distinct) to {bundle_path} "
+          f"({os.path.getsize(bundle_path) / 1024:.0f} KiB)")
+    return index
+
+def write_stream(source, destination, chunk_size=EXTRACT_CHUNK_SIZE):
+    """
+    Copy a readable stream into a file, hashing it on the way. The file is written under a
+    temporary name and renamed into place.
+
+    Parameters:
+        source (file): A binary file object.
+        destination (str): The file to create or replace.
+        chunk_size (int): The size of the read buffer in bytes.
+
+    Returns:
+        dict: The digest ("sha256", "crc32", "size") of the content.
+    """
+    sha256 = hashlib.sha256()
+    crc32 = 0
+    size = 0
+    temp_path = destination + ".tmp"
+    try:
+        with open(temp_path, 'wb') as output:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                crc32 = zlib.crc32(chunk, crc32)
+                size += len(chunk)
+                output.write(chunk)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return {"sha256": sha256.hexdigest(), "crc32": crc32, "size": size}
+
+def import_bundle(bundle_path, generations_dir=None, store=None, retain=RETAIN_GENERATIONS,
+                  chunk_size=EXTRACT_CHUNK_SIZE):
+    """
+    Unpack a bundle written by export_bundle into the variant folders.
+
+    The bundle is read as a stream, so it can come from a pipe ("-" reads standard input) and
+    is never unpacked to a scratch directory first. Each object is decompressed once, checked
+    against its SHA-256 and linked or copied into every variant that lists it. With
+    generations_dir the files go into a staged generation that is only published once the whole
+    bundle has been read; otherwise the variant folders are updated in place. Integrity
+    manifests are written for the imported folders, so --verify works on the receiving host.
+
+    Parameters:
+        bundle_path (str): The bundle to read, or "-" for standard input.
+        generations_dir (str): The directory holding the generations, or None to import in place.
+        store (str): Optional content-addressed store directory to import into and link from.
+        retain (int): How many published generations to keep.
+        chunk_size (int): The size of the read buffer in bytes.
+
+    Returns:
+        bool: True if the bundle was imported, False if it was invalid, incomplete or corrupt.
+    """
+    try:
+        if bundle_path == "-":
+            bundle = tarfile.open(fileobj=sys.stdin.buffer, mode="r|*")
+        else:
+            bundle = tarfile.open(bundle_path, mode="r|*")
+        members = iter(bundle)
+        first = next(members, None)
+        index = json.load(bundle.extractfile(first)) if first is not None and first.name == BUNDLE_INDEX else None
+    except (tarfile.TarError, EOFError, OSError, ValueError) as e:
+        print(f"Could not read {bundle_path}: {e}")
+        return False
+
+    with bundle:
+        if index is None:
+            print(f"{bundle_path} is not a dtwain bundle: it does not start with {BUNDLE_INDEX}")
+            return False
+        if index.get("version") != BUNDLE_VERSION:
+            print(f"{bundle_path} has bundle version {index.get('version')}, expected {BUNDLE_VERSION}")
+            return False
+        for name in [*index["variants"], *(name for files in index["variants"].values() for name in files)]:
+            # Names come from the bundle, so never let one reach outside its folder
+            if name in ("", ".", "..") or os.path.basename(name) != name or "/" in name:
+                print(f"{bundle_path} is not a valid dtwain bundle: bad file name {name!r}")
+                return False
+
+        variants = list(index["variants"])
+        generation = None
+        root = ""
+        if generations_dir is not None:
+            generation, root = begin_generation(variants, generations_dir)
+
+        targets = {}
+        for variant, files in index["variants"].items():
+            os.makedirs(os.path.join(root, variant), exist_ok=True)
+            for name, entry in files.items():
+                targets.setdefault(entry["sha256"], []).append(os.path.join(root, variant, name))
+
+        received = set()
+        try:
+            for member in members:
+                sha256 = member.name.rpartition("/")[2]
+                if not member.isfile() or sha256 not in targets:
+                    continue
+                source = bundle.extractfile(member)
+                if store is not None:
+                    digest = store_stream(source, store, chunk_size)
+                    source_path = store_object_path(store, digest["sha256"])
+                    destinations = targets[sha256]
+                else:
+                    digest = write_stream(source, targets[sha256][0], chunk_size)
+                    source_path = targets[sha256][0]
+                    destinations = targets[sha256][1:]
+                if digest["sha256"] != sha256:
+                    print(f"{bundle_path} is corrupt: {member.name} has SHA-256 {digest['sha256']}")
+                    break
+                for destination in destinations:
+                    link_into_place(source_path, destination)
+                received.add(sha256)
+        except (tarfile.TarError, EOFError, OSError) as e:
+            # A truncated or damaged bundle; whatever was read is discarded below
+            print(f"Could not read {bundle_path}: {e}")
+
+    missing = set(targets) - received
+    if missing:
+        print(f"Import of {bundle_path} failed: {len(missing)} of {len(targets)} objects missing or corrupt")
+        if generation is not None:
+            shutil.rmtree(root, ignore_errors=True)
+        else:
+            print("The variant folders may be partly updated; import a complete bundle again.")
+        return False
+
+    for variant, files in index["variants"].items():
+        folder = os.path.join(root, variant)
+        with os.scandir(folder) as scan:
+            extra = [entry.path for entry in scan
+                     if entry.is_file() and entry.name not in files and entry.name != INTEGRITY_MANIFEST]
+        for file_path in extra:
+            os.remove(file_path)
+        write_integrity_manifest(folder, digests={name: entry["sha256"] for name, entry in files.items()})
+
+    if generation is not None:
+        publish_generation(variants, generation, generations_dir)
+        collect_generations(generations_dir, retain)
+
+    total = sum(len(files) for files in index["variants"].values())
+    print(f"Imported {total} files ({len(targets)} distinct) from {bundle_path}"
+          + (f" at commit {index['commit']}" if index.get("commit") else ""))
+    return True
+
+def block_signature(file_path, block_size=DELTA_BLOCK_SIZE):
+    """
+    Compute the rsync-style block signature of a file: a weak rolling checksum and a strong
+    hash for every whole block.
+
+    Parameters:
+        file_path (str): The file the receiver already has, or None for an empty signature.
+        block_size (int): The block size in bytes.
+
+    Returns:
+        dict: Maps each weak checksum to a dict of strong hash -> block number.
+    """
+    signature = {}
+    if file_path is None:
+        return signature
+    with open(file_path, 'rb') as source:
+        number = 0
+        while True:
+            block = source.read(block_size)
+            if len(block) < block_size:
+                # A short last block is sent as a literal instead
+                break
+            strong = hashlib.blake2b(block, digest_size=16).digest()
+            signature.setdefault(zlib.adler32(block), {}).setdefault(strong, number)
+            number += 1
+    return signature
+
+def make_delta(old_path, new_path, block_size=DELTA_BLOCK_SIZE):
+    """
+    Encode new_path as a compressed delta against old_path.
+
+    The new file is read DELTA_WINDOW bytes at a time and checked a block at a time. Where a
+    block's Adler-32 and strong hash match a block of the old file, a copy of that block is
+    emitted; runs of consecutive blocks are merged into one copy. Where a block does not
+    match, a rolling Adler-32 slides over the next block_size - 1 offsets, which finds the old
+    blocks again after an insertion or deletion of any length. While nothing matches the
+    slide is tried on fewer and fewer blocks, down to one in DELTA_ROLL_BACKOFF, and the
+    blocks in between are sent as literals; so files with little in common cost about 1/16
+    of a byte-by-byte scan, and a match found after such a gap may be up to that many blocks late.
+
+    Parameters:
+        old_path (str): The file the receiver has, or None to send new_path as one literal.
+        new_path (str): The file the receiver should end up with.
+        block_size (int): The block size in bytes.
+
+    Returns:
+        bytes: The delta, for apply_delta.
+    """
+    signature = block_signature(old_path, block_size)
+    compressor = zlib.compressobj(6)
+    chunks = []
+    sha256 = hashlib.sha256()
+    size = 0
+    copy = [None, 0]
+
+    def flush_copy():
+        if copy[1]:
+            chunks.append(compressor.compress(b"C" + struct.pack(">II", copy[0], copy[1])))
+        copy[0], copy[1] = None, 0
+
+    def emit_literal(literal):
+        if literal:
+            flush_copy()
+            chunks.append(compressor.compress(b"L" + struct.pack(">I", len(literal)) + literal))
+
+    def match(block):
+        candidates = signature.get(zlib.adler32(block))
+        if candidates is None:
+            return None
+        return candidates.get(hashlib.blake2b(block, digest_size=16).digest())
+
+    data = b""
+    position = 0
+    literal_start = 0
+    eof = False
+    # Unmatched blocks to skip before sliding again, and how many the next failed slide skips
+    skip = 0
+    backoff = 1
+    with open(new_path, 'rb') as source:
+        while True:
+            if len(data) - position < 2 * block_size and not eof:
+                # Keep only the pending literal and what is still to be scanned
+                if position - literal_start >= DELTA_WINDOW:
+                    emit_literal(data[literal_start:position])
+                    literal_start = position
+                data = data[literal_start:]
+                position -= literal_start
+                literal_start = 0
+                chunk = source.read(DELTA_WINDOW)
+                sha256.update(chunk)
+                size += len(chunk)
+                data += chunk
+                eof = not chunk
+                continue
+            if not signature:
+                # Nothing to copy from, so all of it is literal
+                position = len(data)
+                if eof:
+                    break
+                continue
+            if len(data) - position < block_size:
+                break
+
+            number = match(data[position:position + block_size])
+            if number is not None:
+                emit_literal(data[literal_start:position])
+                if copy[0] is not None and copy[0] + copy[1] == number:
+                    copy[1] += 1
+                else:
+                    flush_copy()
+                    copy[0], copy[1] = number, 1
+                position += block_size
+                literal_start = position
+                skip, backoff = 0, 1
+                continue
+
+            found = None
+            if skip == 0:
+                # Slide over the offsets up to the next block: drop data[start], take in data[start + block_size]
+                weak = zlib.adler32(data[position:position + block_size])
+                low = weak & 0xffff
+                high = weak >> 16
+                last = min(position + block_size, len(data) - block_size + 1)
+                for start in range(position, last - 1):
+                    outgoing = data[start]
+                    low = (low - outgoing + data[start + block_size]) % ADLER_MODULUS
+                    high = (high - block_size * outgoing + low - 1) % ADLER_MODULUS
+                    candidates = signature.get((high << 16) | low)
+                    if candidates is not None and hashlib.blake2b(
+                            data[start + 1:start + 1 + block_size], digest_size=16).digest() in candidates:
+                        found = start + 1
+                        break
+                if found is None:
+                    skip, backoff = backoff - 1, min(backoff * 2, DELTA_ROLL_BACKOFF)
+            else:
+                skip -= 1
+            # A match found by the slide is emitted by the next pass
+            position = found if found is not None else position + block_size
+
+    # Whatever was not copied, including a short last block, is sent as a literal
+    emit_literal(data[literal_start:])
+    flush_copy()
+    chunks.append(compressor.flush())
+
+    header = DELTA_MAGIC + struct.pack(">BIQ", DELTA_VERSION, block_size, size) + sha256.digest()
+    return header + b"".join(chunks)
+
+def apply_delta(old_path, delta, output_path, chunk_size=EXTRACT_CHUNK_SIZE):
+    """
+    Rebuild a file from the old file and a delta made by make_delta. The result is written
+    under a temporary name, checked against the SHA-256 in the delta and renamed into place.
+
+    Parameters:
+        old_path (str): The file the delta was made against, or None.
+        delta (bytes): The delta.
+        output_path (str): The file to create or replace; it may be a hardlink of old_path.
+        chunk_size (int): The size of the read buffer in bytes.
+
+    Returns:
+        dict: The digest ("sha256", "crc32", "size") of the rebuilt file.
+
+    Raises:
+        ValueError: If the delta is malformed or the result does not match its hash.
+    """
+    header_size = len(DELTA_MAGIC) + struct.calcsize(">BIQ") + 32
+    if not delta.startswith(DELTA_MAGIC) or len(delta) < header_size:
+        raise ValueError("not a dtwain delta")
+    version, block_size, size = struct.unpack_from(">BIQ", delta, len(DELTA_MAGIC))
+    if version != DELTA_VERSION:
+        raise ValueError(f"delta version {version}, expected {DELTA_VERSION}")
+    expected_sha256 = delta[header_size - 32:header_size].hex()
+    ops = zlib.decompress(delta[header_size:])
+
+    sha256 = hashlib.sha256()
+    crc32 = 0
+    written = 0
+    temp_path = output_path + ".tmp"
+    with contextlib.ExitStack() as stack:
+        old = stack.enter_context(open(old_path, 'rb')) if old_path is not None else None
+        output = stack.enter_context(open(temp_path, 'wb'))
+        position = 0
+        try:
+            while position < len(ops):
+                kind = ops[position:position + 1]
+                if kind == b"C":
+                    start, count = struct.unpack_from(">II", ops, position + 1)
+                    position += 9
+                    if old is None:
+                        raise ValueError("delta copies from a file that was not given")
+                    old.seek(start * block_size)
+                    remaining = count * block_size
+                    while remaining:
+                        chunk = old.read(min(chunk_size, remaining))
+                        if not chunk:
+                            raise ValueError("delta copies past the end of the old file")
+                        remaining -= len(chunk)
+                        sha256.update(chunk)
+                        crc32 = zlib.crc32(chunk, crc32)
+                        written += len(chunk)
+                        output.write(chunk)
+                elif kind == b"L":
+                    (length,) = struct.unpack_from(">I", ops, position + 1)
+                    chunk = ops[position + 5:position + 5 + length]
+                    position += 5 + length
+                    sha256.update(chunk)
+                    crc32 = zlib.crc32(chunk, crc32)
+                    written += len(chunk)
+                    output.write(chunk)
+                else:
+                    raise ValueError(f"unknown delta operation {kind!r}")
+        except (ValueError, struct.error) as e:
+            output.close()
+            os.remove(temp_path)
+            raise ValueError(f"bad delta: {e}")
+
+    if written != size or sha256.hexdigest() != expected_sha256:
+        os.remove(temp_path)
+        raise ValueError("patched file does not match the delta's SHA-256")
+    os.replace(temp_path, output_path)
+    return {"sha256": expected_sha256, "crc32": crc32, "size": size}
+
+def folder_hashes(folder):
+    # SHA-256 of every file in a variant folder, from its integrity manifest where that is current
+    report = verify_integrity(folder)
+    if not (report["error"] or report["modified"] or report["missing"] or report["extra"]):
+        with open(os.path.join(folder, INTEGRITY_MANIFEST), 'r') as manifest_file:
+            return {name: entry["sha256"] for name, entry in json.load(manifest_file)["files"].items()}
+    paths = [os.path.join(folder, name) for name in integrity_files(folder)]
+    return {os.path.basename(path): digest["sha256"] for path, digest in hash_files(paths).items()}
+
+def make_generation_patch(patch_path, from_generation, to_generation=None, variants=None,
+                          generations_dir=GENERATIONS_DIR, block_size=DELTA_BLOCK_SIZE):
+    """
+    Write a patch that turns the variant folders of one packaged generation into another.
+
+    The patch is a tar file: an index (dtwain_patch.json) listing the files of both generations,
+    followed by one delta per distinct (old content, new content) pair, so a DLL shared by two
+    variants is diffed and shipped once. Unchanged files are only listed.
+
+    Parameters:
+        patch_path (str): The patch to write.
+        from_generation (str): The generation the receivers have.
+        to_generation (str): The generation they should get; defaults to the current one.
+        variants (iterable): The variant folder names; defaults to those in to_generation.
+        generations_dir (str): The directory holding the generations.
+        block_size (int): The delta block size in bytes.
+
+    Returns:
+        dict: The patch index, or None if a generation does not exist.
+    """
+    if to_generation is None:
+        to_generation = current_generation(generations_dir)
+    old_root = os.path.join(generations_dir, from_generation)
+    new_root = os.path.join(generations_dir, to_generation or "")
+    for root in (old_root, new_root):
+        if not to_generation or not os.path.isdir(root):
+            print(f"Generation {root} does not exist")
+            return None
+    if variants is None:
+        variants = sorted(entry.name for entry in os.scandir(new_root) if entry.is_dir())
+
+    index = {"version": DELTA_VERSION, "from": from_generation, "to": to_generation, "variants": {}}
+    deltas = {}
+    for variant in variants:
+        old_hashes = folder_hashes(os.path.join(old_root, variant)) if os.path.isdir(os.path.join(old_root, variant)) else {}
+        new_hashes = folder_hashes(os.path.join(new_root, variant))
+        files = {}
+        for name, sha256 in sorted(new_hashes.items()):
+            base = old_hashes.get(name)
+            entry = {"sha256": sha256, "base": base, "delta": None}
+            if base != sha256:
+                entry["delta"] = f"deltas/{base or 'none'}-{sha256}"
+                deltas.setdefault(entry["delta"], (os.path.join(old_root, variant, name) if base else None,
+                                                   os.path.join(new_root, variant, name)))
+            files[name] = entry
+        index["variants"][variant] = {"base": old_hashes, "files": files}
+
+    index_data = json.dumps(index, indent=2, sort_keys=True).encode("utf-8")
+    temp_path = patch_path + ".tmp"
+    shipped = 0
+    try:
+        with tarfile.open(temp_path, "w") as patch:
+            info = tarfile.TarInfo(DELTA_INDEX)
+            info.size = len(index_data)
+            info.mtime = int(time.time())
+            patch.addfile(info, io.BytesIO(index_data))
+            for member_name, (old_path, new_path) in sorted(deltas.items()):
+                delta = make_delta(old_path, new_path, block_size)
+                info = tarfile.TarInfo(member_name)
+                info.size = len(delta)
+                info.mtime = int(time.time())
+                patch.addfile(info, io.BytesIO(delta))
+                shipped += os.path.getsize(new_path)
+        os.replace(temp_path, patch_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    print(f"Patch {from_generation} -> {to_generation}: {len(deltas)} deltas, "
+          f"{os.path.getsize(patch_path) / 1024:.0f} KiB instead of {shipped / 1024:.0f} KiB of changed files")
+    return index
+
+def apply_generation_patch(patch_path, variants=None, generations_dir=GENERATIONS_DIR, retain=RETAIN_GENERATIONS):
+    """
+    Apply a patch from make_generation_patch to the published variant folders.
+
+    Every published file the patch builds on is checked against the patch's base hashes first.
+    The patched files are assembled in a staged generation, each one checked against its
+    SHA-256, and the generation is published only when all of them are in place.
+
+    Parameters:
+        patch_path (str): The patch to apply.
+        variants (iterable): The variant folder names; defaults to those in the patch.
+        generations_dir (str): The directory holding the generations.
+        retain (int): How many published generations to keep.
+
+    Returns:
+        bool: True if the patch was applied.
+    """
+    try:
+        patch = tarfile.open(patch_path, mode="r|*")
+        members = iter(patch)
+        first = next(members, None)
+        index = json.load(patch.extractfile(first)) if first is not None and first.name == DELTA_INDEX else None
+    except (tarfile.TarError, EOFError, OSError, ValueError) as e:
+        print(f"Could not read {patch_path}: {e}")
+        return False
+
+    with patch:
+        if index is None or index.get("version") != DELTA_VERSION:
+            print(f"{patch_path} is not a dtwain patch")
+            return False
+        if variants is None:
+            variants = list(index["variants"])
+        for name in [*variants, *(name for variant in variants for name in index["variants"][variant]["files"])]:
+            if name in ("", ".", "..") or os.path.basename(name) != name or "/" in name:
+                print(f"{patch_path} is not a valid dtwain patch: bad file name {name!r}")
+                return False
+
+        for variant in variants:
+            current = folder_hashes(variant) if os.path.isdir(variant) else {}
+            for name, sha256 in index["variants"][variant]["base"].items():
+                if current.get(name) != sha256:
+                    print(f"Cannot apply {patch_path}: {variant}/{name} is not the file the patch was made "
+                          f"against (generation {index['from']})")
+                    return False
+
+        generation, staging = begin_generation(variants, generations_dir,
+                                               {variant: index["variants"][variant]["files"] for variant in variants})
+        targets = {}
+        for variant in variants:
+            for name, entry in index["variants"][variant]["files"].items():
+                if entry["delta"] is not None:
+                    targets.setdefault(entry["delta"], []).append((variant, name))
+
+        applied = set()
+        try:
+            for member in members:
+                if member.name not in targets:
+                    continue
+                delta = patch.extractfile(member).read()
+                variant, name = targets[member.name][0]
+                first_path = os.path.join(staging, variant, name)
+                old_path = os.path.join(variant, name) if os.path.exists(os.path.join(variant, name)) else None
+                apply_delta(old_path, delta, first_path)
+                for variant, name in targets[member.name][1:]:
+                    link_into_place(first_path, os.path.join(staging, variant, name))
+                applied.add(member.name)
+        except (tarfile.TarError, EOFError, OSError, ValueError) as e:
+            print(f"Could not apply {patch_path}: {e}")
+
+    missing = set(targets) - applied
+    if missing:
+        print(f"Patch {patch_path} failed: {len(missing)} of {len(targets)} deltas missing or bad")
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
+
+    for variant in variants:
+        files = index["variants"][variant]["files"]
+        folder = os.path.join(staging, variant)
+        with os.scandir(folder) as scan:
+            extra = [entry.path for entry in scan
+                     if entry.is_file() and entry.name not in files and entry.name != INTEGRITY_MANIFEST]
+        for file_path in extra:
+            os.remove(file_path)
+        write_integrity_manifest(folder, digests={name: entry["sha256"] for name, entry in files.items()})
+
+    publish_generation(variants, generation, generations_dir)
+    collect_generations(generations_dir, retain)
+    print(f"Applied {len(targets)} deltas from {patch_path} (generation {index['from']} -> {index['to']})")
+    return True
+
+# The stages of a refresh, in the order they run
+STAGES = ("fetch", "extract", "package", "publish", "clean")
+
+def new_run(manifests, repo_url=DEFAULT_REPO_URL, local_path=DEFAULT_LOCAL_PATH, strategy="shallow",
+            state_path=STATE_FILE, archive_name="release_libraries.zip", store=ARTIFACT_STORE,
+            workers=PACKAGE_WORKERS, generations_dir=None, retain=RETAIN_GENERATIONS,
+            progress=None, dry_run=False, resumable=False, retries=FETCH_RETRIES):
+    """
+    Set up a refresh run that the stage functions (fetch, extract, package, publish, clean) share.
+
+    Parameters:
+        manifests (dict): Maps a variant folder name to its manifest: file names or rules with
+            glob patterns, required flags and renames (see manifest_rules).
+        repo_url (str): The URL of the Git repository.
+        local_path (str): The local directory where the repository is cloned.
+        strategy (str): The clone strategy; one of the keys of CLONE_STRATEGIES.
+        state_path (str): The path of the state file.
+        archive_name (str): The release archive to stream manifest files from.
+        store (str): The content-addressed store the variant folders are linked from,
+            or None to copy every file into every folder.
+        workers (int): Number of threads used to extract and copy files.
+        generations_dir (str): The directory holding the staged generations, or None (the
+            default) to write straight into the variant folders. Publishing a generation turns
+            the variant folders into symlinks (see swap_variant), which a git checkout of this
+            repository shows as its tracked variant files being deleted.
+        retain (int): How many published generations to keep.
+        progress (Progress): Git progress handler; defaults to throttled console output.
+        dry_run (bool): Report what each stage would do without changing anything.
+        resumable (bool): Clone resumably and retry fetches (see pull_latest_from_repository).
+        retries (int): The maximum number of attempts per fetch when resumable.
+
+    Returns:
+        dict: The run. Stages record their results in it: "up_to_date", "commit", "generation",
+            "resolved" (variant -> delivered name -> source name), "missing" (variant -> required
+            patterns that matched nothing), "messages" (variant -> file name -> status message)
+            and "timings" (stage -> seconds).
+    """
+    manifests = constants_manifests(manifests)
+    return {
+        "manifests": manifests,
+        "repo_url": repo_url,
+        "local_path": local_path,
+        "strategy": strategy,
+        "state_path": state_path,
+        "archive_name": archive_name,
+        "store": store,
+        "workers": workers,
+        "generations_dir": generations_dir,
+        "retain": retain,
+        "progress": progress,
+        "dry_run": dry_run,
+        "resumable": resumable,
+        "retries": retries,
+        "state": load_state(state_path),
+        "up_to_date": False,
+        "upstream": None,
+        "commit": None,
+        "index": None,
+        "resolved": None,
+        "missing": {},
+        "artifacts": None,
+        "generation": None,
+        "staging": None,
+        "messages": {variant: {} for variant in manifests},
+        "timings": {},
+    }
+
+def checkout_index(run):
+    # The checkout is walked once per run and shared by the extract and package stages
+    if run["index"] is None:
+        run["index"] = build_file_index(run["local_path"])
+    return run["index"]
+
+def resolved_manifests(run):
+    # The manifests are matched against the checkout and archive once per run
+    if run["resolved"] is None:
+        run["resolved"], run["missing"] = classify_checkout(run["manifests"], run["local_path"],
+                                                            run["archive_name"], checkout_index(run))
+    return run["resolved"]
+
+def target_folders(run):
+    """
+    Map each variant to the folder the extract and package stages write to: its folder in the
+    staging generation (created on first use), or the live folder when publishing in place.
+    """
+    if run["generations_dir"] is None:
+        if run["artifacts"] is None:
+            ensure_dtwain_core_directory()
+            run["artifacts"] = run["state"]["artifacts"]
+        return {variant: variant for variant in run["manifests"]}
+
+    if run["staging"] is None:
+        delivered = {variant: [dest for dest, _ in manifest_items(files)]
+                     for variant, files in resolved_manifests(run).items()}
+        run["generation"], run["staging"] = begin_generation(run["manifests"], run["generations_dir"], delivered)
+        run["artifacts"] = rebase_artifacts(run["state"]["artifacts"], "", run["staging"])
+    return {variant: os.path.join(run["staging"], variant) for variant in run["manifests"]}
+
+def fetch(run):
+    """
+    Stage 1: bring the checkout up to date, or find that upstream has not moved.
+
+    Sets run["up_to_date"] when the upstream HEAD is the commit recorded in the state file,
+    the manifests are the ones it was delivered with and every recorded file is still in
+    place; the later stages then have nothing to do.
+    """
+    if check_upstream(run):
+        return
+
+    if run["dry_run"]:
+        print(f"Would pull {run['repo_url']} into {run['local_path']} ({run['strategy']}): "
+              f"upstream is at {run['upstream']}, last delivered {run['state'].get('commit')}")
+        return
+    pull_checkout(run)
+
+def check_upstream(run):
+    """
+    Compare the upstream HEAD and the manifests with those recorded in the state file.
+
+    Returns:
+        bool: True (and run["up_to_date"] set) if upstream has not moved, the manifests and
+            shims are unchanged and every recorded file is still in place.
+    """
+    state = run["state"]
+    head = remote_head(run["repo_url"])
+    run["upstream"] = head
+    if head is None or head != state.get("commit"):
+        return run["up_to_date"]
+    if state.get("manifests") != manifests_fingerprint(run["manifests"]):
+        print(f"Upstream is still at {head}, but the manifests or shims have changed; repackaging.")
+    elif artifacts_present(state["artifacts"]):
+        print(f"Already up-to-date at {head}; nothing to do.")
+        run["up_to_date"] = True
+    return run["up_to_date"]
+
+def pull_checkout(run):
+    # Clone or pull the checkout and note the commit it is at
+    result = pull_latest_from_repository(run["repo_url"], run["local_path"], run["strategy"],
+                                         sparse_checkout_paths(run["manifests"], run["archive_name"]),
+                                         run["progress"], run["resumable"], run["retries"])
+    print(result)
+    run["commit"] = git.Repo(run["local_path"]).head.commit.hexsha
+    run["index"] = None
+
+def extract(run):
+    """
+    Stage 2: stream the manifest files that are in the release archive into the variant folders.
+    """
+    index = checkout_index(run)
+    zip_file_path = locate_file(run["archive_name"], run["local_path"], index)
+    if zip_file_path is None:
+        print(f"{run['archive_name']} not found in {run['local_path']}")
+        return
+
+    if run["dry_run"]:
+        artifacts = run["state"]["artifacts"]
+        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+            members = {posixpath.basename(info.filename): info for info in zip_ref.infolist() if not info.is_dir()}
+        for variant, files in resolved_manifests(run).items():
+            for dest, source in manifest_items(files):
+                info = members.get(source)
+                if info is None:
+                    continue
+                if artifact_is_current(artifacts, os.path.join(variant, dest), crc32=info.CRC, size=info.file_size):
+                    run["messages"][variant][dest] = f"{dest} is unchanged in {variant}"
+                else:
+                    run["messages"][variant][dest] = f"Would extract {source} to {os.path.join(variant, dest)}"
+        return
+
+    folders = target_folders(run)
+    targets = {folders[variant]: files for variant, files in resolved_manifests(run).items()}
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if run["workers"] > 1:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=run["workers"]))
+        streamed = stream_manifest_members(zip_file_path, targets, artifacts=run["artifacts"],
+                                           store=run["store"], executor=executor)
+
+    for variant, folder in folders.items():
+        for name, written in streamed[folder].items():
+            if written:
+                run["messages"][variant][name] = f"Successfully extracted {name} to {folder}"
+            else:
+                run["messages"][variant][name] = f"{name} is unchanged in {folder}"
+
+def package(run):
+    """
+    Stage 3: copy every manifest file not already extracted from the archive out of the checkout.
+    """
+    index = checkout_index(run)
+    remaining = {
+        variant: {dest: source for dest, source in manifest_items(files) if dest not in run["messages"][variant]}
+        for variant, files in resolved_manifests(run).items()
+    }
+
+    if run["dry_run"]:
+        artifacts = run["state"]["artifacts"]
+        for variant, files in remaining.items():
+            for dest, source in files.items():
+                file_path = locate_file(source, run["local_path"], index)
+                if file_path is None:
+                    run["messages"][variant][dest] = f"{source} not found in {run['local_path']}"
+                elif artifact_is_current(artifacts, os.path.join(variant, dest),
+                                         sha256=file_digest(file_path)["sha256"]):
+                    run["messages"][variant][dest] = f"{dest} is unchanged in {variant}"
+                else:
+                    run["messages"][variant][dest] = f"Would copy {source} to {os.path.join(variant, dest)}"
+        for variant in variant_shims(resolved_manifests(run)):
+            run["messages"][variant]["dtwain.py"] = f"Would write the dtwain.py shim of {variant}"
+        return
+
+    folders = target_folders(run)
+    results = copy_manifests({folders[variant]: files for variant, files in remaining.items()},
+                             run["local_path"], None, run["artifacts"], run["store"], run["workers"], index)
+    for variant, files in remaining.items():
+        for dest, message in zip(files, results[folders[variant]]):
+            run["messages"][variant][dest] = message
+    for variant in write_variant_shims(resolved_manifests(run), folders):
+        run["messages"][variant]["dtwain.py"] = f"Wrote the dtwain.py shim of {folders[variant]}"
+
+def publish(run):
+    """
+    Stage 4: make the new files live and record the delivered commit and file hashes.
+    """
+    state = run["state"]
+    commit = run["commit"]
+    if commit is None and os.path.isdir(run["local_path"]):
+        commit = git.Repo(run["local_path"]).head.commit.hexsha
+
+    if run["dry_run"]:
+        if run["generations_dir"] is not None:
+            print(f"Would publish a new generation in {run['generations_dir']} "
+                  f"(current is {current_generation(run['generations_dir'])})")
+        print(f"Would record commit {commit} in {run['state_path']}")
+        return
+
+    # Record what is being delivered before it goes live
+    if run["generations_dir"] is None or run["staging"] is not None:
+        for folder in target_folders(run).values():
+            write_integrity_manifest(folder, run["workers"])
+
+    if run["generations_dir"] is not None:
+        if run["staging"] is None:
+            print("Nothing was staged; run the extract or package stage first.")
+            return
+        publish_generation(run["manifests"], run["generation"], run["generations_dir"])
+        # Only the files the generation still holds stay on record
+        delivered = {key: digest for key, digest in run["artifacts"].items()
+                     if os.path.isfile(os.path.join(run["generations_dir"], run["generation"],
+                                                    os.path.relpath(key, run["staging"])))}
+        state["artifacts"] = rebase_artifacts(delivered, run["staging"], "")
+        state["generation"] = run["generation"]
+        run["staging"] = None
+        collect_generations(run["generations_dir"], run["retain"])
+
+    if SHARED_CONSTANTS in run["manifests"]:
+        precompile_shared(SHARED_CONSTANTS)
+
+    state["repo_url"] = run["repo_url"]
+    state["commit"] = commit
+    state["manifests"] = manifests_fingerprint(run["manifests"])
+    save_state(state, run["state_path"])
+
+def clean(run):
+    """
+    Stage 5: remove the checkout. Leave this stage out to keep it for the next incremental run.
+    """
+    if run["dry_run"]:
+        print(f"Would remove {run['local_path']}")
+        return
+    remove_directory(run["local_path"], workers=run["workers"])
+
+STAGE_FUNCTIONS = {
+    "fetch": fetch,
+    "extract": extract,
+    "package": package,
+    "publish": publish,
+    "clean": clean,
+}
+
+def run_stages(run, stages=STAGES):
+    """
+    Run the selected stages in pipeline order and time each one.
+
+    Once fetch finds upstream unchanged, the remaining stages are skipped.
+
+    Parameters:
+        run (dict): The run from new_run.
+        stages (iterable): Names from STAGES; they always run in STAGES order.
+
+    Returns:
+        dict: The run, with per-stage seconds in run["timings"].
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stage(s) {', '.join(sorted(unknown))}; expected {', '.join(STAGES)}")
+
+    for stage in STAGES:
+        if stage not in stages:
+            continue
+        if run["up_to_date"]:
+            print(f"Skipping {stage}: already up-to-date")
+            continue
+        start = time.perf_counter()
+        STAGE_FUNCTIONS[stage](run)
+        run["timings"][stage] = time.perf_counter() - start
+    return run
+
+async def run_pipeline_async(run, executor=None):
+    """
+    Run fetch, extract, package and publish as one overlapped asyncio pipeline.
+
+    Once the checkout is in place, every archive member and every checkout file is its own
+    task: decompression runs on `executor` and copies on worker threads, and each result is
+    recorded as soon as it is ready instead of waiting for a whole stage to finish.
+
+    The fetch itself is not overlapped with anything. git writes the release archive and the
+    checkout only once the whole pack has arrived, and the files a staging generation carries
+    over are only known from the new checkout, so staging starts when the fetch ends. A cold
+    refresh, which is mostly transfer, therefore takes about as long as run_stages.
+
+    Dry runs fall back to run_stages, since nothing is written.
+
+    Parameters:
+        run (dict): The run from new_run.
+        executor (Executor): Where archive members are decompressed; defaults to a thread pool
+            of run["workers"] threads. A ProcessPoolExecutor also works.
+
+    Returns:
+        dict: The run, with "fetch", "extract+package" and "publish" in run["timings"].
+    """
+    if run["dry_run"]:
+        return run_stages(run, ("fetch", "extract", "package", "publish"))
+
+    start = time.perf_counter()
+    if await asyncio.to_thread(check_upstream, run):
+        run["timings"]["fetch"] = time.perf_counter() - start
+        return run
+
+    await asyncio.to_thread(pull_checkout, run)
+    run["timings"]["fetch"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    # A staging generation is seeded with the files the manifests still deliver, which are only
+    # known once the checkout is in place
+    folders = await asyncio.to_thread(target_folders, run)
+    variant_of = {folder: variant for variant, folder in folders.items()}
+    index = await asyncio.to_thread(checkout_index, run)
+    targets = {folders[variant]: files for variant, files in (await asyncio.to_thread(resolved_manifests, run)).items()}
+    zip_file_path = locate_file(run["archive_name"], run["local_path"], index)
+
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, run["workers"])))
+
+        tasks = {}
+        in_archive = set()
+        streamed = {folder: {} for folder in targets}
+        if zip_file_path is None:
+            print(f"{run['archive_name']} not found in {run['local_path']}")
+        else:
+            def plan():
+                with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+                    names = {posixpath.basename(info.filename) for info in zip_ref.infolist()}
+                    return names, plan_archive_members(zip_ref, targets, run["artifacts"])
+            in_archive, (jobs, streamed) = await asyncio.to_thread(plan)
+            for info, member_targets in jobs:
+                future = loop.run_in_executor(executor, extract_member_at, zip_file_path, info.filename,
+                                              member_targets, EXTRACT_CHUNK_SIZE, run["store"])
+                tasks[future] = ("extract", info, member_targets)
+
+        # Checkout files do not depend on the archive, so they are copied alongside it
+        for folder, files in targets.items():
+            for dest, source in manifest_items(files):
+                if source in in_archive:
+                    continue
+                future = asyncio.ensure_future(asyncio.to_thread(
+                    search_and_copy_file, source, run["local_path"], folder, index, run["artifacts"], run["store"],
+                    dest))
+                tasks[future] = ("copy", dest, folder)
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                kind, subject, where = tasks[future]
+                if kind == "extract":
+                    record_extracted(zip_file_path, subject, where, future.result(), streamed, run["artifacts"])
+                else:
+                    run["messages"][variant_of[where]][subject] = future.result()
+
+    for folder, names in streamed.items():
+        for name, written in names.items():
+            if written:
+                run["messages"][variant_of[folder]][name] = f"Successfully extracted {name} to {folder}"
+            else:
+                run["messages"][variant_of[folder]][name] = f"{name} is unchanged in {folder}"
+    for variant in await asyncio.to_thread(write_variant_shims, resolved_manifests(run), folders):
+        run["messages"][variant]["dtwain.py"] = f"Wrote the dtwain.py shim of {folders[variant]}"
+    run["timings"]["extract+package"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.to_thread(publish, run)
+    run["timings"]["publish"] = time.perf_counter() - start
+    return run
+
+def refresh(manifests, repo_url=DEFAULT_REPO_URL, local_path=DEFAULT_LOCAL_PATH,
+            strategy="shallow", state_path=STATE_FILE, archive_name="release_libraries.zip",
+            store=ARTIFACT_STORE, workers=PACKAGE_WORKERS, generations_dir=None,
+            retain=RETAIN_GENERATIONS, progress=None):
+    """
+    Bring the variant folders up to date with the upstream repository, doing only the work needed.
+
+    Runs the fetch, extract, package and publish stages; the checkout is kept. See new_run
+    for the parameters.
+
+    Returns:
+        bool: True if the repository was pulled and packaged, False if everything was up to date.
+    """
+    run = new_run(manifests, repo_url, local_path, strategy, state_path, archive_name, store,
+                  workers, generations_dir, retain, progress)
+    run_stages(run, ("fetch", "extract", "package", "publish"))
+    return not run["up_to_date"]
+
+dtwain_shared_files = [
+    "dtwain.py"
+]
+dtwain_x64_files = [
+    "dtwain64.dll",
+    "dtwain64.lib",
+    "dtwain64.pdb",
+    "dtwain64.ini",
+    "twaininfo.txt",
+    "twainlanguage.txt",
+    "twainresourcestrings_english.txt"
+]
+dtwain_x64_unicode_files = [
+    "dtwain64u.dll",
+    "dtwain64u.lib",
+    "dtwain64u.pdb",
+    "dtwain64.ini",
+    "twaininfo.txt",
+    "twainlanguage.txt",
+    "twainresourcestrings_english.txt"
+]
+dtwain_x86_files = [
+    "dtwain32.dll",
+    "dtwain32.lib",
+    "dtwain32.pdb",
+    "dtwain32_embarcadero.lib",
+    "dtwain32.ini",
+    "twaininfo.txt",
+    "twainlanguage.txt",
+    "twainresourcestrings_english.txt"
+]
+dtwain_x86_unicode_files = [
+    "dtwain32u.dll",
+    "dtwain32u.lib",
+    "dtwain32u.pdb",
+    "dtwain32u_embarcadero.lib",
+    "dtwain32.ini",
+    "twaininfo.txt",
+    "twainlanguage.txt",
+    "twainresourcestrings_english.txt"
+]
+
+dtwain_manifests = {
+    SHARED_CONSTANTS: dtwain_shared_files,
+    "dtwain_x64": dtwain_x64_files,
+    "dtwain_x64_unicode": dtwain_x64_unicode_files,
+    "dtwain_x86": dtwain_x86_files,
+    "dtwain_x86_unicode": dtwain_x86_unicode_files,
+}
+
+def load_manifests(manifest_path):
+    """
+    Read variant manifests from a JSON file, in place of the built-in lists. The file maps each
+    variant folder to a list of file names and rules, e.g.
+
+        {"dtwain_x64": ["dtwain64.dll", {"pattern": "dtwain64*.pdb", "required": false},
+                        {"pattern": "twaininfo.txt", "rename": "twaininfo64.txt"}]}
+
+    Parameters:
+        manifest_path (str): The JSON file.
+
+    Returns:
+        dict: The manifests, or None if the file could not be read or is malformed.
+    """
+    try:
+        with open(manifest_path, 'r') as manifest_file:
+            manifests = json.load(manifest_file)
+        for variant, files in manifests.items():
+            if os.path.basename(variant) != variant or not isinstance(files, list):
+                raise ValueError(f"{variant!r} must be a folder name mapped to a list")
+            for rule in manifest_rules(files):
+                if not isinstance(rule["pattern"], str) or "/" in (rule["rename"] or ""):
+                    raise ValueError(f"bad rule {rule!r} for {variant}")
+    except (OSError, ValueError, AttributeError, KeyError, TypeError) as e:
+        print(f"Could not load manifests from {manifest_path}: {e}")
+        return None
+    return manifests
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Parameters:
+        argv (list): The arguments; defaults to sys.argv[1:].
+
+    Returns:
+        int: The process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        description="Pull the latest DTWAIN release and package it into dtwain_x64, dtwain_x86 "
+                    "and the unicode variant folders.")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"comma separated stages to run, from {','.join(STAGES)} (default: all)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="extract and package as overlapped asyncio tasks once the fetch is done")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what each stage would do without changing anything")
+    parser.add_argument("--keep-checkout", action="store_true",
+                        help="skip the clean stage so the next run can fetch instead of clone")
+    parser.add_argument("--manifests", metavar="JSON",
+                        help="read the variant manifests from a JSON file instead of the built-in lists")
+    parser.add_argument("--repo-url", default=DEFAULT_REPO_URL)
+    parser.add_argument("--checkout", default=DEFAULT_LOCAL_PATH, help="where the repository is cloned")
+    parser.add_argument("--strategy", default="shallow", choices=list(CLONE_STRATEGIES))
+    parser.add_argument("--resumable", action="store_true",
+                        help="clone in resumable steps and retry failed fetches with exponential backoff")
+    parser.add_argument("--retries", type=int, default=FETCH_RETRIES, help="attempts per fetch with --resumable")
+    parser.add_argument("--workers", type=int, default=PACKAGE_WORKERS)
+    parser.add_argument("--state-file", default=STATE_FILE)
+    parser.add_argument("--store", default=ARTIFACT_STORE, help="content-addressed store directory")
+    parser.add_argument("--no-store", action="store_true", help="copy files instead of linking them from the store")
+    parser.add_argument("--generations", metavar="DIR", nargs="?", const=GENERATIONS_DIR,
+                        help=f"publish through staged generations in DIR (default {GENERATIONS_DIR}) and "
+                             "symlink the variant folders to them, instead of updating the folders in place")
+    parser.add_argument("--retain", type=int, default=RETAIN_GENERATIONS, help="generations to keep")
+    parser.add_argument("--progress", default="console", choices=list(PROGRESS_SINKS))
+    parser.add_argument("--progress-rate", type=float, default=PROGRESS_RATE,
+                        help="maximum progress reports per second")
+    parser.add_argument("--verify", action="store_true",
+                        help=f"check the variant folders against their {INTEGRITY_MANIFEST} and exit")
+    parser.add_argument("--rehash", default="suspect", choices=["suspect", "all", "none"],
+                        help="which files --verify re-hashes (default: only those whose mtime changed)")
+    parser.add_argument("--export-bundle", metavar="PATH",
+                        help="write the published variant folders to an offline bundle and exit")
+    parser.add_argument("--import-bundle", metavar="PATH",
+                        help="unpack an offline bundle into the variant folders and exit ('-' reads stdin)")
+    parser.add_argument("--bundle-compression", default=BUNDLE_COMPRESSION, choices=["gz", "bz2", "xz"])
+    parser.add_argument("--make-patch", metavar="PATH",
+                        help="write a delta patch from --from-generation to --to-generation and exit")
+    parser.add_argument("--from-generation", metavar="ID", help="the generation the receivers have")
+    parser.add_argument("--to-generation", metavar="ID", help="the generation to patch to (default: current)")
+    parser.add_argument("--block-size", type=int, default=DELTA_BLOCK_SIZE, help="delta block size in bytes")
+    parser.add_argument("--apply-patch", metavar="PATH", help="apply a delta patch to the variant folders and exit")
+    parser.add_argument("--list-versions", action="store_true",
+                        help="list upstream tags and the versions installed side by side")
+    parser.add_argument("--install-version", metavar="TAG", action="append", default=[],
+                        help=f"install a tagged release under {VERSIONS_DIR}/ (repeatable)")
+    parser.add_argument("--use-version", metavar="TAG", help="switch the current version")
+    parser.add_argument("--remove-version", metavar="TAG", action="append", default=[],
+                        help="remove an installed version (repeatable)")
+    parser.add_argument("--versions", default=VERSIONS_DIR, help="directory holding installed versions")
+    args = parser.parse_args(argv)
+
+    progress = Progress(PROGRESS_SINKS[args.progress](), args.progress_rate)
+    store = None if args.no_store else args.store
+    manifests = dtwain_manifests
+    if args.manifests:
+        manifests = load_manifests(args.manifests)
+        if manifests is None:
+            return 1
+
+    if args.verify:
+        failed = False
+        for variant in manifests:
+            report = verify_integrity(variant, args.rehash, args.workers)
+            if report["error"]:
+                print(f"{variant}: {report['error']}")
+                failed = True
+                continue
+            problems = [f"{kind} {', '.join(report[kind])}" for kind in ("modified", "missing", "suspect", "extra")
+                        if report[kind]]
+            failed = failed or bool(report["modified"] or report["missing"])
+            print(f"{variant}: {len(report['ok'])} ok, {report['rehashed']} re-hashed"
+                  + (f"; {'; '.join(problems)}" if problems else ""))
+        return 1 if failed else 0
+
+    if args.export_bundle:
+        index = export_bundle(args.export_bundle, manifests, args.bundle_compression, args.state_file)
+        return 0 if index is not None else 1
+
+    if args.import_bundle:
+        imported = import_bundle(args.import_bundle, args.generations, store,
+                                 args.retain)
+        return 0 if imported else 1
+
+    if args.make_patch:
+        if not args.from_generation:
+            parser.error("--make-patch needs --from-generation")
+        index = make_generation_patch(args.make_patch, args.from_generation, args.to_generation,
+                                      generations_dir=args.generations or GENERATIONS_DIR,
+                                      block_size=args.block_size)
+        return 0 if index is not None else 1
+
+    if args.apply_patch:
+        applied = apply_generation_patch(args.apply_patch, generations_dir=args.generations or GENERATIONS_DIR,
+                                         retain=args.retain)
+        return 0 if applied else 1
+
+    if args.list_versions or args.install_version or args.use_version or args.remove_version:
+        try:
+            for tag in args.install_version:
+                install_version(tag, manifests, args.repo_url, versions_dir=args.versions, store=store,
+                                strategy=args.strategy, workers=args.workers, progress=progress)
+            if args.use_version:
+                use_version(args.use_version, args.versions)
+            for tag in args.remove_version:
+                remove_version(tag, args.versions)
+        except ValueError as e:
+            # A version that is not installed, or removing the current one
+            print(e, file=sys.stderr)
+            return 1
+        if args.list_versions:
+            current = current_version(args.versions)
+            installed = installed_versions(args.versions)
+            print(f"Installed in {args.versions}:")
+            for tag, info in sorted(installed.items()):
+                print(f"  {'*' if tag == current else ' '} {tag} ({info['commit'][:12]})")
+            print(f"Upstream tags: {', '.join(list_remote_tags(args.repo_url))}")
+        return 0
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    if args.keep_checkout and "clean" in stages:
+        stages.remove("clean")
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s) {', '.join(unknown)}; expected {', '.join(STAGES)}")
+
+    run = new_run(
+        manifests,
+        repo_url=args.repo_url,
+        local_path=args.checkout,
+        strategy=args.strategy,
+        state_path=args.state_file,
+        store=store,
+        workers=args.workers,
+        generations_dir=args.generations,
+        retain=args.retain,
+        progress=progress,
+        dry_run=args.dry_run,
+        resumable=args.resumable,
+        retries=args.retries,
+    )
+    if args.use_async:
+        pipeline = ("fetch", "extract", "package", "publish")
+        if any(stage not in stages for stage in pipeline):
+            parser.error("--async runs fetch, extract, package and publish together")
+        asyncio.run(run_pipeline_async(run))
+        run_stages(run, [stage for stage in stages if stage not in pipeline])
+    else:
+        run_stages(run, stages)
 
-for file in dtwain_x86_unicode_files:
-     search_and_copy_file(file, search_dir, "dtwain_x86_unicode")
+    for variant, messages in run["messages"].items():
+        for message in messages.values():
+            print(message)
+    print("Stage timings:")
+    for stage, seconds in run["timings"].items():
+        print(f"  {stage:16} {seconds * 1000:9.1f} ms")
+    if run["missing"]:
+        print("Missing required files:")
+        for variant, patterns in run["missing"].items():
+            print(f"  {variant}: {', '.join(patterns)}")
+        return 1
+    return 0
 
-remove_directory("twain_library")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1454 @@
+#
+#  dtwain.py
+# 
+#  This file is part of the Dynarithmic TWAIN Library (DTWAIN).                          
+#  Copyright (c) 2002-2023 Dynarithmic Software.                                         
+#                                                                                        
+#  Licensed under the Apache License, Version 2.0 (the "License");                       
+#  you may not use this file except in compliance with the License.                      
+#  You may obtain a copy of the License at                                               
+#                                                                                        
+#      http://www.apache.org/licenses/LICENSE-2.0                                        
+#                                                                                        
+#  Unless required by applicable law or agreed to in writing, software                   
+#  distributed under the License is distributed on an "AS IS" BASIS,                     
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.              
+#  See the License for the specific language governing permissions and                   
+#  limitations under the License.                                                        
+#                                                                                        
+#  FOR ANY PART OF THE COVERED WORK IN WHICH THE COPYRIGHT IS OWNED BY                   
+#  DYNARITHMIC SOFTWARE. DYNARITHMIC SOFTWARE DISCLAIMS THE WARRANTY OF NON INFRINGEMENT 
+#  OF THIRD PARTY RIGHTS.                                                                
+# 
+
+DTWAIN_FF_TIFF = 0
+DTWAIN_FF_PICT = 1
+DTWAIN_FF_BMP = 2
+DTWAIN_FF_XBM = 3
+DTWAIN_FF_JFIF = 4
+DTWAIN_FF_FPX = 5
+DTWAIN_FF_TIFFMULTI = 6
+DTWAIN_FF_PNG = 7
+DTWAIN_FF_SPIFF = 8
+DTWAIN_FF_EXIF = 9
+DTWAIN_FF_PDF = 10
+DTWAIN_FF_JP2 = 11
+DTWAIN_FF_JPX = 13
+DTWAIN_FF_DEJAVU = 14
+DTWAIN_FF_PDFA = 15
+DTWAIN_FF_PDFA2 = 16
+DTWAIN_CP_NONE = 0
+DTWAIN_CP_PACKBITS = 1
+DTWAIN_CP_GROUP31D = 2
+DTWAIN_CP_GROUP31DEOL = 3
+DTWAIN_CP_GROUP32D = 4
+DTWAIN_CP_GROUP4 = 5
+DTWAIN_CP_JPEG = 6
+DTWAIN_CP_LZW = 7
+DTWAIN_CP_JBIG = 8
+DTWAIN_CP_PNG = 9
+DTWAIN_CP_RLE4 = 10
+DTWAIN_CP_RLE8 = 11
+DTWAIN_CP_BITFIELDS = 12
+DTWAIN_CP_ZIP = 13
+DTWAIN_CP_JPEG2000 = 14
+DTWAIN_FS_NONE = 0
+DTWAIN_FS_A4LETTER = 1
+DTWAIN_FS_B5LETTER = 2
+DTWAIN_FS_USLETTER = 3
+DTWAIN_FS_USLEGAL = 4
+DTWAIN_FS_A5 = 5
+DTWAIN_FS_B4 = 6
+DTWAIN_FS_B6 = 7
+DTWAIN_FS_USLEDGER = 9
+DTWAIN_FS_USEXECUTIVE = 10
+DTWAIN_FS_A3 = 11
+DTWAIN_FS_B3 = 12
+DTWAIN_FS_A6 = 13
+DTWAIN_FS_C4 = 14
+DTWAIN_FS_C5 = 15
+DTWAIN_FS_C6 = 16
+DTWAIN_FS_4A0 = 17
+DTWAIN_FS_2A0 = 18
+DTWAIN_FS_A0 = 19
+DTWAIN_FS_A1 = 20
+DTWAIN_FS_A2 = 21
+DTWAIN_FS_A4 = DTWAIN_FS_A4LETTER
+DTWAIN_FS_A7 = 22
+DTWAIN_FS_A8 = 23
+DTWAIN_FS_A9 = 24
+DTWAIN_FS_A10 = 25
+DTWAIN_FS_ISOB0 = 26
+DTWAIN_FS_ISOB1 = 27
+DTWAIN_FS_ISOB2 = 28
+DTWAIN_FS_ISOB3 = DTWAIN_FS_B3
+DTWAIN_FS_ISOB4 = DTWAIN_FS_B4
+DTWAIN_FS_ISOB5 = 29
+DTWAIN_FS_ISOB6 = DTWAIN_FS_B6
+DTWAIN_FS_ISOB7 = 30
+DTWAIN_FS_ISOB8 = 31
+DTWAIN_FS_ISOB9 = 32
+DTWAIN_FS_ISOB10 = 33
+DTWAIN_FS_JISB0 = 34
+DTWAIN_FS_JISB1 = 35
+DTWAIN_FS_JISB2 = 36
+DTWAIN_FS_JISB3 = 37
+DTWAIN_FS_JISB4 = 38
+DTWAIN_FS_JISB5 = DTWAIN_FS_B5LETTER
+DTWAIN_FS_JISB6 = 39
+DTWAIN_FS_JISB7 = 40
+DTWAIN_FS_JISB8 = 41
+DTWAIN_FS_JISB9 = 42
+DTWAIN_FS_JISB10 = 43
+DTWAIN_FS_C0 = 44
+DTWAIN_FS_C1 = 45
+DTWAIN_FS_C2 = 46
+DTWAIN_FS_C3 = 47
+DTWAIN_FS_C7 = 48
+DTWAIN_FS_C8 = 49
+DTWAIN_FS_C9 = 50
+DTWAIN_FS_C10 = 51
+DTWAIN_FS_USSTATEMENT = 52
+DTWAIN_FS_BUSINESSCARD = 53
+DTWAIN_ANYSUPPORT = (-1)
+DTWAIN_BMP = 100
+DTWAIN_JPEG = 200
+DTWAIN_PDF = 250
+DTWAIN_PDFMULTI = 251
+DTWAIN_PCX = 300
+DTWAIN_DCX = 301
+DTWAIN_TGA = 400
+DTWAIN_TIFFLZW = 500
+DTWAIN_TIFFNONE = 600
+DTWAIN_TIFFG3 = 700
+DTWAIN_TIFFG4 = 800
+DTWAIN_TIFFPACKBITS = 801
+DTWAIN_TIFFDEFLATE = 802
+DTWAIN_TIFFJPEG = 803
+DTWAIN_TIFFJBIG = 804
+DTWAIN_TIFFPIXARLOG = 805
+DTWAIN_TIFFNONEMULTI = 900
+DTWAIN_TIFFG3MULTI = 901
+DTWAIN_TIFFG4MULTI = 902
+DTWAIN_TIFFPACKBITSMULTI = 903
+DTWAIN_TIFFDEFLATEMULTI = 904
+DTWAIN_TIFFJPEGMULTI = 905
+DTWAIN_TIFFLZWMULTI = 906
+DTWAIN_TIFFJBIGMULTI = 907
+DTWAIN_TIFFPIXARLOGMULTI = 908
+DTWAIN_WMF = 850
+DTWAIN_EMF = 851
+DTWAIN_GIF = 950
+DTWAIN_PNG = 1000
+DTWAIN_PSD = 2000
+DTWAIN_JPEG2000 = 3000
+DTWAIN_POSTSCRIPT1 = 4000
+DTWAIN_POSTSCRIPT2 = 4001
+DTWAIN_POSTSCRIPT3 = 4002
+DTWAIN_POSTSCRIPT1MULTI = 4003
+DTWAIN_POSTSCRIPT2MULTI = 4004
+DTWAIN_POSTSCRIPT3MULTI = 4005
+DTWAIN_TEXT = 6000
+DTWAIN_TEXTMULTI = 6001
+DTWAIN_TIFFMULTI = 7000
+DTWAIN_ICO = 8000
+DTWAIN_ICO_VISTA = 8001
+DTWAIN_ICO_RESIZED = 8002
+DTWAIN_WBMP = 8500
+DTWAIN_WBMP_RESIZED = 11000
+DTWAIN_INCHES = 0
+DTWAIN_CENTIMETERS = 1
+DTWAIN_PICAS = 2
+DTWAIN_POINTS = 3
+DTWAIN_TWIPS = 4
+DTWAIN_PIXELS = 5
+DTWAIN_MILLIMETERS = 6
+DTWAIN_USENAME = 16
+DTWAIN_USEPROMPT = 32
+DTWAIN_USELONGNAME = 64
+DTWAIN_USESOURCEMODE = 128
+DTWAIN_USELIST = 256
+DTWAIN_CREATEDIRECTORY = 512
+DTWAIN_ARRAYANY = 1
+DTWAIN_ArrayTypePTR = 1
+DTWAIN_ARRAYLONG = 2
+DTWAIN_ARRAYFLOAT = 3
+DTWAIN_ARRAYHANDLE = 4
+DTWAIN_ARRAYSOURCE = 5
+DTWAIN_ARRAYSTRING = 6
+DTWAIN_ARRAYFRAME = 7
+DTWAIN_ARRAYBOOL = DTWAIN_ARRAYLONG
+DTWAIN_ARRAYLONGSTRING = 8
+DTWAIN_ARRAYUNICODESTRING = 9
+DTWAIN_ARRAYLONG64 = 10
+DTWAIN_ARRAYANSISTRING = 11
+DTWAIN_ARRAYWIDESTRING = 12
+DTWAIN_ARRAYTWFIX32 = 200
+DTWAIN_ArrayTypeINVALID = 0
+DTWAIN_ARRAYINT16 = 100
+DTWAIN_ARRAYUINT16 = 110
+DTWAIN_ARRAYUINT32 = 120
+DTWAIN_ARRAYINT32 = 130
+DTWAIN_ARRAYINT64 = 140
+DTWAIN_RANGELONG = DTWAIN_ARRAYLONG
+DTWAIN_RANGEFLOAT = DTWAIN_ARRAYFLOAT
+DTWAIN_RANGEMIN = 0
+DTWAIN_RANGEMAX = 1
+DTWAIN_RANGESTEP = 2
+DTWAIN_RANGEDEFAULT = 3
+DTWAIN_RANGECURRENT = 4
+DTWAIN_FRAMELEFT = 0
+DTWAIN_FRAMETOP = 1
+DTWAIN_FRAMERIGHT = 2
+DTWAIN_FRAMEBOTTOM = 3
+DTWAIN_FIX32WHOLE = 0
+DTWAIN_FIX32FRAC = 1
+DTWAIN_JC_NONE = 0
+DTWAIN_JC_JSIC = 1
+DTWAIN_JC_JSIS = 2
+DTWAIN_JC_JSXC = 3
+DTWAIN_JC_JSXS = 4
+DTWAIN_CAPDATATYPE_UNKNOWN = (-10)
+DTWAIN_JCBP_JSIC = 5
+DTWAIN_JCBP_JSIS = 6
+DTWAIN_JCBP_JSXC = 7
+DTWAIN_JCBP_JSXS = 8
+DTWAIN_FEEDPAGEON = 1
+DTWAIN_CLEARPAGEON = 2
+DTWAIN_REWINDPAGEON = 4
+DTWAIN_AppOwnsDib = 1
+DTWAIN_SourceOwnsDib = 2
+DTWAIN_CONTARRAY = 8
+DTWAIN_CONTENUMERATION = 16
+DTWAIN_CONTONEVALUE = 32
+DTWAIN_CONTRANGE = 64
+DTWAIN_CONTDEFAULT = 0
+DTWAIN_CAPGET = 1
+DTWAIN_CAPGETCURRENT = 2
+DTWAIN_CAPGETDEFAULT = 3
+DTWAIN_CAPSET = 6
+DTWAIN_CAPRESET = 7
+DTWAIN_CAPRESETALL = 8
+DTWAIN_CAPSETCONSTRAINT = 9
+DTWAIN_CAPSETAVAILABLE = 8
+DTWAIN_CAPSETCURRENT = 16
+DTWAIN_AREASET = DTWAIN_CAPSET
+DTWAIN_AREARESET = DTWAIN_CAPRESET
+DTWAIN_AREACURRENT = DTWAIN_CAPGETCURRENT
+DTWAIN_AREADEFAULT = DTWAIN_CAPGETDEFAULT
+DTWAIN_VER15 = 0
+DTWAIN_VER16 = 1
+DTWAIN_VER17 = 2
+DTWAIN_VER18 = 3
+DTWAIN_VER20 = 4
+DTWAIN_VER21 = 5
+DTWAIN_VER22 = 6
+DTWAIN_ACQUIREALL = (-1)
+DTWAIN_MAXACQUIRE = (-1)
+DTWAIN_DX_NONE = 0
+DTWAIN_DX_1PASSDUPLEX = 1
+DTWAIN_DX_2PASSDUPLEX = 2
+DTWAIN_PT_BW = 0
+DTWAIN_PT_GRAY = 1
+DTWAIN_PT_RGB = 2
+DTWAIN_PT_PALETTE = 3
+DTWAIN_PT_CMY = 4
+DTWAIN_PT_CMYK = 5
+DTWAIN_PT_YUV = 6
+DTWAIN_PT_YUVK = 7
+DTWAIN_PT_CIEXYZ = 8
+DTWAIN_PT_DEFAULT = 1000
+DTWAIN_CURRENT = (-2)
+DTWAIN_DEFAULT = (-1)
+DTWAIN_FLOATDEFAULT = 1.0E-08
+DTWAIN_CallbackERROR = 1
+DTWAIN_CallbackMESSAGE = 2
+DTWAIN_USENATIVE = 1
+DTWAIN_USEBUFFERED = 2
+DTWAIN_USECOMPRESSION = 4
+DTWAIN_FAILURE1 = (-1)
+DTWAIN_FAILURE2 = (-2)
+DTWAIN_DELETEALL = (-1)
+DTWAIN_TN_ACQUIREDONE = 1000
+DTWAIN_TN_ACQUIREFAILED = 1001
+DTWAIN_TN_ACQUIRECANCELLED = 1002
+DTWAIN_TN_ACQUIRESTARTED = 1003
+DTWAIN_TN_PAGECONTINUE = 1004
+DTWAIN_TN_PAGEFAILED = 1005
+DTWAIN_TN_PAGECANCELLED = 1006
+DTWAIN_TN_TRANSFERREADY = 1009
+DTWAIN_TN_TRANSFERDONE = 1010
+DTWAIN_TN_ACQUIREPAGEDONE = 1010
+DTWAIN_TN_UICLOSING = 1011
+DTWAIN_TN_UICLOSED = 1012
+DTWAIN_TN_UIOPENED = 1013
+DTWAIN_TN_UIOPENING = 1055
+DTWAIN_TN_UIOPENFAILURE = 1060
+DTWAIN_TN_CLIPTRANSFERDONE = 1014
+DTWAIN_TN_INVALIDIMAGEFORMAT = 1015
+DTWAIN_TN_ACQUIRETERMINATED = 1021
+DTWAIN_TN_TRANSFERSTRIPREADY = 1022
+DTWAIN_TN_TRANSFERSTRIPDONE = 1023
+DTWAIN_TN_TRANSFERSTRIPFAILED = 1029
+DTWAIN_TN_IMAGEINFOERROR = 1024
+DTWAIN_TN_TRANSFERCANCELLED = 1030
+DTWAIN_TN_FILESAVECANCELLED = 1031
+DTWAIN_TN_FILESAVEOK = 1032
+DTWAIN_TN_FILESAVEERROR = 1033
+DTWAIN_TN_FILEPAGESAVEOK = 1034
+DTWAIN_TN_FILEPAGESAVEERROR = 1035
+DTWAIN_TN_PROCESSEDDIB = 1036
+DTWAIN_TN_FEEDERLOADED = 1037
+DTWAIN_TN_GENERALERROR = 1038
+DTWAIN_TN_MANDUPFLIPPAGES = 1040
+DTWAIN_TN_MANDUPSIDE1DONE = 1041
+DTWAIN_TN_MANDUPSIDE2DONE = 1042
+DTWAIN_TN_MANDUPPAGECOUNTERROR = 1043
+DTWAIN_TN_MANDUPACQUIREDONE = 1044
+DTWAIN_TN_MANDUPSIDE1START = 1045
+DTWAIN_TN_MANDUPSIDE2START = 1046
+DTWAIN_TN_MANDUPMERGEERROR = 1047
+DTWAIN_TN_MANDUPMEMORYERROR = 1048
+DTWAIN_TN_MANDUPFILEERROR = 1049
+DTWAIN_TN_MANDUPFILESAVEERROR = 1050
+DTWAIN_TN_ENDOFJOBDETECTED = 1051
+DTWAIN_TN_EOJDETECTED = 1051
+DTWAIN_TN_EOJDETECTED_XFERDONE = 1052
+DTWAIN_TN_QUERYPAGEDISCARD = 1053
+DTWAIN_TN_PAGEDISCARDED = 1054
+DTWAIN_TN_PROCESSDIBACCEPTED = 1055
+DTWAIN_TN_PROCESSDIBFINALACCEPTED = 1056
+DTWAIN_TN_DEVICEEVENT = 1100
+DTWAIN_TN_TWAINPAGECANCELLED = 1105
+DTWAIN_TN_TWAINPAGEFAILED = 1106
+DTWAIN_TN_APPUPDATEDDIB = 1107
+DTWAIN_TN_FILEPAGESAVING = 1110
+DTWAIN_TN_EOJBEGINFILESAVE = 1112
+DTWAIN_TN_EOJENDFILESAVE = 1113
+DTWAIN_TN_CROPFAILED = 1120
+DTWAIN_TN_PROCESSEDDIBFINAL = 1121
+DTWAIN_TN_BLANKPAGEDETECTED1 = 1130
+DTWAIN_TN_BLANKPAGEDETECTED2 = 1131
+DTWAIN_TN_BLANKPAGEDETECTED3 = 1132
+DTWAIN_TN_BLANKPAGEDISCARDED1 = 1133
+DTWAIN_TN_BLANKPAGEDISCARDED2 = 1134
+DTWAIN_TN_OCRTEXTRETRIEVED = 1140
+DTWAIN_TN_QUERYOCRTEXT = 1141
+DTWAIN_TN_PDFOCRREADY = 1142
+DTWAIN_TN_PDFOCRDONE = 1143
+DTWAIN_TN_PDFOCRERROR = 1144
+DTWAIN_TN_SETCALLBACKINIT = 1150
+DTWAIN_TN_SETCALLBACK64INIT = 1151
+DTWAIN_TN_FILENAMECHANGING = 1160
+DTWAIN_TN_FILENAMECHANGED = 1161
+DTWAIN_TN_PROCESSEDAUDIOFINAL = 1180
+DTWAIN_TN_PROCESSAUDIOFINALACCEPTED = 1181
+DTWAIN_TN_PROCESSEDAUDIOFILE = 1182
+DTWAIN_TN_TWAINTRIPLETBEGIN = 1183
+DTWAIN_TN_TWAINTRIPLETEND = 1184
+DTWAIN_PDFOCR_CLEANTEXT1 = 1
+DTWAIN_PDFOCR_CLEANTEXT2 = 2
+DTWAIN_MODAL = 0
+DTWAIN_MODELESS = 1
+DTWAIN_UIModeCLOSE = 0
+DTWAIN_UIModeOPEN = 1
+DTWAIN_REOPEN_SOURCE = 2
+DTWAIN_ROUNDNEAREST = 0
+DTWAIN_ROUNDUP = 1
+DTWAIN_ROUNDDOWN = 2
+DTWAIN_FLOATDELTA = 1.0E-08
+DTWAIN_OR_ROT0 = 0
+DTWAIN_OR_ROT90 = 1
+DTWAIN_OR_ROT180 = 2
+DTWAIN_OR_ROT270 = 3
+DTWAIN_OR_PORTRAIT = DTWAIN_OR_ROT0
+DTWAIN_OR_LANDSCAPE = DTWAIN_OR_ROT270
+DTWAIN_OR_ANYROTATION = (-1)
+DTWAIN_CO_GET = 0x0001
+DTWAIN_CO_SET = 0x0002
+DTWAIN_CO_GETDEFAULT = 0x0004
+DTWAIN_CO_GETCURRENT = 0x0008
+DTWAIN_CO_RESET = 0x0010
+DTWAIN_CO_SETCONSTRAINT = 0x0020
+DTWAIN_CO_CONSTRAINABLE = 0x0040
+DTWAIN_CO_GETHELP = 0x0100
+DTWAIN_CO_GETLABEL = 0x0200
+DTWAIN_CO_GETLABELENUM = 0x0400
+DTWAIN_CNTYAFGHANISTAN = 1001
+DTWAIN_CNTYALGERIA = 213
+DTWAIN_CNTYAMERICANSAMOA = 684
+DTWAIN_CNTYANDORRA = 33
+DTWAIN_CNTYANGOLA = 1002
+DTWAIN_CNTYANGUILLA = 8090
+DTWAIN_CNTYANTIGUA = 8091
+DTWAIN_CNTYARGENTINA = 54
+DTWAIN_CNTYARUBA = 297
+DTWAIN_CNTYASCENSIONI = 247
+DTWAIN_CNTYAUSTRALIA = 61
+DTWAIN_CNTYAUSTRIA = 43
+DTWAIN_CNTYBAHAMAS = 8092
+DTWAIN_CNTYBAHRAIN = 973
+DTWAIN_CNTYBANGLADESH = 880
+DTWAIN_CNTYBARBADOS = 8093
+DTWAIN_CNTYBELGIUM = 32
+DTWAIN_CNTYBELIZE = 501
+DTWAIN_CNTYBENIN = 229
+DTWAIN_CNTYBERMUDA = 8094
+DTWAIN_CNTYBHUTAN = 1003
+DTWAIN_CNTYBOLIVIA = 591
+DTWAIN_CNTYBOTSWANA = 267
+DTWAIN_CNTYBRITAIN = 6
+DTWAIN_CNTYBRITVIRGINIS = 8095
+DTWAIN_CNTYBRAZIL = 55
+DTWAIN_CNTYBRUNEI = 673
+DTWAIN_CNTYBULGARIA = 359
+DTWAIN_CNTYBURKINAFASO = 1004
+DTWAIN_CNTYBURMA = 1005
+DTWAIN_CNTYBURUNDI = 1006
+DTWAIN_CNTYCAMAROON = 237
+DTWAIN_CNTYCANADA = 2
+DTWAIN_CNTYCAPEVERDEIS = 238
+DTWAIN_CNTYCAYMANIS = 8096
+DTWAIN_CNTYCENTRALAFREP = 1007
+DTWAIN_CNTYCHAD = 1008
+DTWAIN_CNTYCHILE = 56
+DTWAIN_CNTYCHINA = 86
+DTWAIN_CNTYCHRISTMASIS = 1009
+DTWAIN_CNTYCOCOSIS = 1009
+DTWAIN_CNTYCOLOMBIA = 57
+DTWAIN_CNTYCOMOROS = 1010
+DTWAIN_CNTYCONGO = 1011
+DTWAIN_CNTYCOOKIS = 1012
+DTWAIN_CNTYCOSTARICA = 506
+DTWAIN_CNTYCUBA = 5
+DTWAIN_CNTYCYPRUS = 357
+DTWAIN_CNTYCZECHOSLOVAKIA = 42
+DTWAIN_CNTYDENMARK = 45
+DTWAIN_CNTYDJIBOUTI = 1013
+DTWAIN_CNTYDOMINICA = 8097
+DTWAIN_CNTYDOMINCANREP = 8098
+DTWAIN_CNTYEASTERIS = 1014
+DTWAIN_CNTYECUADOR = 593
+DTWAIN_CNTYEGYPT = 20
+DTWAIN_CNTYELSALVADOR = 503
+DTWAIN_CNTYEQGUINEA = 1015
+DTWAIN_CNTYETHIOPIA = 251
+DTWAIN_CNTYFALKLANDIS = 1016
+DTWAIN_CNTYFAEROEIS = 298
+DTWAIN_CNTYFIJIISLANDS = 679
+DTWAIN_CNTYFINLAND = 358
+DTWAIN_CNTYFRANCE = 33
+DTWAIN_CNTYFRANTILLES = 596
+DTWAIN_CNTYFRGUIANA = 594
+DTWAIN_CNTYFRPOLYNEISA = 689
+DTWAIN_CNTYFUTANAIS = 1043
+DTWAIN_CNTYGABON = 241
+DTWAIN_CNTYGAMBIA = 220
+DTWAIN_CNTYGERMANY = 49
+DTWAIN_CNTYGHANA = 233
+DTWAIN_CNTYGIBRALTER = 350
+DTWAIN_CNTYGREECE = 30
+DTWAIN_CNTYGREENLAND = 299
+DTWAIN_CNTYGRENADA = 8099
+DTWAIN_CNTYGRENEDINES = 8015
+DTWAIN_CNTYGUADELOUPE = 590
+DTWAIN_CNTYGUAM = 671
+DTWAIN_CNTYGUANTANAMOBAY = 5399
+DTWAIN_CNTYGUATEMALA = 502
+DTWAIN_CNTYGUINEA = 224
+DTWAIN_CNTYGUINEABISSAU = 1017
+DTWAIN_CNTYGUYANA = 592
+DTWAIN_CNTYHAITI = 509
+DTWAIN_CNTYHONDURAS = 504
+DTWAIN_CNTYHONGKONG = 852
+DTWAIN_CNTYHUNGARY = 36
+DTWAIN_CNTYICELAND = 354
+DTWAIN_CNTYINDIA = 91
+DTWAIN_CNTYINDONESIA = 62
+DTWAIN_CNTYIRAN = 98
+DTWAIN_CNTYIRAQ = 964
+DTWAIN_CNTYIRELAND = 353
+DTWAIN_CNTYISRAEL = 972
+DTWAIN_CNTYITALY = 39
+DTWAIN_CNTYIVORYCOAST = 225
+DTWAIN_CNTYJAMAICA = 8010
+DTWAIN_CNTYJAPAN = 81
+DTWAIN_CNTYJORDAN = 962
+DTWAIN_CNTYKENYA = 254
+DTWAIN_CNTYKIRIBATI = 1018
+DTWAIN_CNTYKOREA = 82
+DTWAIN_CNTYKUWAIT = 965
+DTWAIN_CNTYLAOS = 1019
+DTWAIN_CNTYLEBANON = 1020
+DTWAIN_CNTYLIBERIA = 231
+DTWAIN_CNTYLIBYA = 218
+DTWAIN_CNTYLIECHTENSTEIN = 41
+DTWAIN_CNTYLUXENBOURG = 352
+DTWAIN_CNTYMACAO = 853
+DTWAIN_CNTYMADAGASCAR = 1021
+DTWAIN_CNTYMALAWI = 265
+DTWAIN_CNTYMALAYSIA = 60
+DTWAIN_CNTYMALDIVES = 960
+DTWAIN_CNTYMALI = 1022
+DTWAIN_CNTYMALTA = 356
+DTWAIN_CNTYMARSHALLIS = 692
+DTWAIN_CNTYMAURITANIA = 1023
+DTWAIN_CNTYMAURITIUS = 230
+DTWAIN_CNTYMEXICO = 3
+DTWAIN_CNTYMICRONESIA = 691
+DTWAIN_CNTYMIQUELON = 508
+DTWAIN_CNTYMONACO = 33
+DTWAIN_CNTYMONGOLIA = 1024
+DTWAIN_CNTYMONTSERRAT = 8011
+DTWAIN_CNTYMOROCCO = 212
+DTWAIN_CNTYMOZAMBIQUE = 1025
+DTWAIN_CNTYNAMIBIA = 264
+DTWAIN_CNTYNAURU = 1026
+DTWAIN_CNTYNEPAL = 977
+DTWAIN_CNTYNETHERLANDS = 31
+DTWAIN_CNTYNETHANTILLES = 599
+DTWAIN_CNTYNEVIS = 8012
+DTWAIN_CNTYNEWCALEDONIA = 687
+DTWAIN_CNTYNEWZEALAND = 64
+DTWAIN_CNTYNICARAGUA = 505
+DTWAIN_CNTYNIGER = 227
+DTWAIN_CNTYNIGERIA = 234
+DTWAIN_CNTYNIUE = 1027
+DTWAIN_CNTYNORFOLKI = 1028
+DTWAIN_CNTYNORWAY = 47
+DTWAIN_CNTYOMAN = 968
+DTWAIN_CNTYPAKISTAN = 92
+DTWAIN_CNTYPALAU = 1029
+DTWAIN_CNTYPANAMA = 507
+DTWAIN_CNTYPARAGUAY = 595
+DTWAIN_CNTYPERU = 51
+DTWAIN_CNTYPHILLIPPINES = 63
+DTWAIN_CNTYPITCAIRNIS = 1030
+DTWAIN_CNTYPNEWGUINEA = 675
+DTWAIN_CNTYPOLAND = 48
+DTWAIN_CNTYPORTUGAL = 351
+DTWAIN_CNTYQATAR = 974
+DTWAIN_CNTYREUNIONI = 1031
+DTWAIN_CNTYROMANIA = 40
+DTWAIN_CNTYRWANDA = 250
+DTWAIN_CNTYSAIPAN = 670
+DTWAIN_CNTYSANMARINO = 39
+DTWAIN_CNTYSAOTOME = 1033
+DTWAIN_CNTYSAUDIARABIA = 966
+DTWAIN_CNTYSENEGAL = 221
+DTWAIN_CNTYSEYCHELLESIS = 1034
+DTWAIN_CNTYSIERRALEONE = 1035
+DTWAIN_CNTYSINGAPORE = 65
+DTWAIN_CNTYSOLOMONIS = 1036
+DTWAIN_CNTYSOMALI = 1037
+DTWAIN_CNTYSOUTHAFRICA = 27
+DTWAIN_CNTYSPAIN = 34
+DTWAIN_CNTYSRILANKA = 94
+DTWAIN_CNTYSTHELENA = 1032
+DTWAIN_CNTYSTKITTS = 8013
+DTWAIN_CNTYSTLUCIA = 8014
+DTWAIN_CNTYSTPIERRE = 508
+DTWAIN_CNTYSTVINCENT = 8015
+DTWAIN_CNTYSUDAN = 1038
+DTWAIN_CNTYSURINAME = 597
+DTWAIN_CNTYSWAZILAND = 268
+DTWAIN_CNTYSWEDEN = 46
+DTWAIN_CNTYSWITZERLAND = 41
+DTWAIN_CNTYSYRIA = 1039
+DTWAIN_CNTYTAIWAN = 886
+DTWAIN_CNTYTANZANIA = 255
+DTWAIN_CNTYTHAILAND = 66
+DTWAIN_CNTYTOBAGO = 8016
+DTWAIN_CNTYTOGO = 228
+DTWAIN_CNTYTONGAIS = 676
+DTWAIN_CNTYTRINIDAD = 8016
+DTWAIN_CNTYTUNISIA = 216
+DTWAIN_CNTYTURKEY = 90
+DTWAIN_CNTYTURKSCAICOS = 8017
+DTWAIN_CNTYTUVALU = 1040
+DTWAIN_CNTYUGANDA = 256
+DTWAIN_CNTYUSSR = 7
+DTWAIN_CNTYUAEMIRATES = 971
+DTWAIN_CNTYUNITEDKINGDOM = 44
+DTWAIN_CNTYUSA = 1
+DTWAIN_CNTYURUGUAY = 598
+DTWAIN_CNTYVANUATU = 1041
+DTWAIN_CNTYVATICANCITY = 39
+DTWAIN_CNTYVENEZUELA = 58
+DTWAIN_CNTYWAKE = 1042
+DTWAIN_CNTYWALLISIS = 1043
+DTWAIN_CNTYWESTERNSAHARA = 1044
+DTWAIN_CNTYWESTERNSAMOA = 1045
+DTWAIN_CNTYYEMEN = 1046
+DTWAIN_CNTYYUGOSLAVIA = 38
+DTWAIN_CNTYZAIRE = 243
+DTWAIN_CNTYZAMBIA = 260
+DTWAIN_CNTYZIMBABWE = 263
+DTWAIN_LANGDANISH = 0
+DTWAIN_LANGDUTCH = 1
+DTWAIN_LANGINTERNATIONALENGLISH = 2
+DTWAIN_LANGFRENCHCANADIAN = 3
+DTWAIN_LANGFINNISH = 4
+DTWAIN_LANGFRENCH = 5
+DTWAIN_LANGGERMAN = 6
+DTWAIN_LANGICELANDIC = 7
+DTWAIN_LANGITALIAN = 8
+DTWAIN_LANGNORWEGIAN = 9
+DTWAIN_LANGPORTUGUESE = 10
+DTWAIN_LANGSPANISH = 11
+DTWAIN_LANGSWEDISH = 12
+DTWAIN_LANGUSAENGLISH = 13
+DTWAIN_NO_ERROR = (0)
+DTWAIN_ERR_FIRST = (-1000)
+DTWAIN_ERR_BAD_HANDLE = (-1001)
+DTWAIN_ERR_BAD_SOURCE = (-1002)
+DTWAIN_ERR_BAD_ARRAY = (-1003)
+DTWAIN_ERR_WRONG_ARRAY_TYPE = (-1004)
+DTWAIN_ERR_INDEX_BOUNDS = (-1005)
+DTWAIN_ERR_OUT_OF_MEMORY = (-1006)
+DTWAIN_ERR_NULL_WINDOW = (-1007)
+DTWAIN_ERR_BAD_PIXTYPE = (-1008)
+DTWAIN_ERR_BAD_CONTAINER = (-1009)
+DTWAIN_ERR_NO_SESSION = (-1010)
+DTWAIN_ERR_BAD_ACQUIRE_NUM = (-1011)
+DTWAIN_ERR_BAD_CAP = (-1012)
+DTWAIN_ERR_CAP_NO_SUPPORT = (-1013)
+DTWAIN_ERR_TWAIN = (-1014)
+DTWAIN_ERR_HOOK_FAILED = (-1015)
+DTWAIN_ERR_BAD_FILENAME = (-1016)
+DTWAIN_ERR_EMPTY_ARRAY = (-1017)
+DTWAIN_ERR_FILE_FORMAT = (-1018)
+DTWAIN_ERR_BAD_DIB_PAGE = (-1019)
+DTWAIN_ERR_SOURCE_ACQUIRING = (-1020)
+DTWAIN_ERR_INVALID_PARAM = (-1021)
+DTWAIN_ERR_INVALID_RANGE = (-1022)
+DTWAIN_ERR_UI_ERROR = (-1023)
+DTWAIN_ERR_BAD_UNIT = (-1024)
+DTWAIN_ERR_LANGDLL_NOT_FOUND = (-1025)
+DTWAIN_ERR_SOURCE_NOT_OPEN = (-1026)
+DTWAIN_ERR_DEVICEEVENT_NOT_SUPPORTED = (-1027)
+DTWAIN_ERR_UIONLY_NOT_SUPPORTED = (-1028)
+DTWAIN_ERR_UI_ALREADY_OPENED = (-1029)
+DTWAIN_ERR_CAPSET_NOSUPPORT = (-1030)
+DTWAIN_ERR_NO_FILE_XFER = (-1031)
+DTWAIN_ERR_INVALID_BITDEPTH = (-1032)
+DTWAIN_ERR_NO_CAPS_DEFINED = (-1033)
+DTWAIN_ERR_TILES_NOT_SUPPORTED = (-1034)
+DTWAIN_ERR_INVALID_DTWAIN_FRAME = (-1035)
+DTWAIN_ERR_LIMITED_VERSION = (-1036)
+DTWAIN_ERR_NO_FEEDER = (-1037)
+DTWAIN_ERR_NO_FEEDER_QUERY = (-1038)
+DTWAIN_ERR_EXCEPTION_ERROR = (-1039)
+DTWAIN_ERR_INVALID_STATE = (-1040)
+DTWAIN_ERR_UNSUPPORTED_EXTINFO = (-1041)
+DTWAIN_ERR_DLLRESOURCE_NOTFOUND = (-1042)
+DTWAIN_ERR_NOT_INITIALIZED = (-1043)
+DTWAIN_ERR_NO_SOURCES = (-1044)
+DTWAIN_ERR_TWAIN_NOT_INSTALLED = (-1045)
+DTWAIN_ERR_WRONG_THREAD = (-1046)
+DTWAIN_ERR_BAD_CAPTYPE = (-1047)
+DTWAIN_ERR_UNKNOWN_CAPDATATYPE = (-1048)
+DTWAIN_ERR_DEMO_NOFILETYPE = (-1049)
+DTWAIN_ERR_SOURCESELECTION_CANCELED = (-1050)
+DTWAIN_ERR_RESOURCES_NOT_FOUND = (-1051)
+DTWAIN_ERR_STRINGTYPE_MISMATCH = (-1052)
+DTWAIN_ERR_ARRAYTYPE_MISMATCH = (-1053)
+DTWAIN_ERR_SOURCENAME_NOTINSTALLED = (-1054)
+DTWAIN_ERR_NO_MEMFILE_XFER = (-1055)
+DTWAIN_ERR_AREA_ARRAY_TOO_SMALL = (-1056)
+DTWAIN_ERR_LAST_1 = DTWAIN_ERR_AREA_ARRAY_TOO_SMALL
+TWAIN_ERR_LOW_MEMORY = (-1100)
+TWAIN_ERR_FALSE_ALARM = (-1101)
+TWAIN_ERR_BUMMER = (-1102)
+TWAIN_ERR_NODATASOURCE = (-1103)
+TWAIN_ERR_MAXCONNECTIONS = (-1104)
+TWAIN_ERR_OPERATIONERROR = (-1105)
+TWAIN_ERR_BADCAPABILITY = (-1106)
+TWAIN_ERR_BADVALUE = (-1107)
+TWAIN_ERR_BADPROTOCOL = (-1108)
+TWAIN_ERR_SEQUENCEERROR = (-1109)
+TWAIN_ERR_BADDESTINATION = (-1110)
+TWAIN_ERR_CAPNOTSUPPORTED = (-1111)
+TWAIN_ERR_CAPBADOPERATION = (-1112)
+TWAIN_ERR_CAPSEQUENCEERROR = (-1113)
+TWAIN_ERR_FILEPROTECTEDERROR = (-1114)
+TWAIN_ERR_FILEEXISTERROR = (-1115)
+TWAIN_ERR_FILENOTFOUND = (-1116)
+TWAIN_ERR_DIRNOTEMPTY = (-1117)
+TWAIN_ERR_FEEDERJAMMED = (-1118)
+TWAIN_ERR_FEEDERMULTPAGES = (-1119)
+TWAIN_ERR_FEEDERWRITEERROR = (-1120)
+TWAIN_ERR_DEVICEOFFLINE = (-1121)
+TWAIN_ERR_NULL_CONTAINER = (-1122)
+TWAIN_ERR_INTERLOCK = (-1123)
+TWAIN_ERR_DAMAGEDCORNER = (-1124)
+TWAIN_ERR_FOCUSERROR = (-1125)
+TWAIN_ERR_DOCTOOLIGHT = (-1126)
+TWAIN_ERR_DOCTOODARK = (-1127)
+TWAIN_ERR_NOMEDIA = (-1128)
+DTWAIN_ERR_FILEXFERSTART = (-2000)
+DTWAIN_ERR_MEM = (-2001)
+DTWAIN_ERR_FILEOPEN = (-2002)
+DTWAIN_ERR_FILEREAD = (-2003)
+DTWAIN_ERR_FILEWRITE = (-2004)
+DTWAIN_ERR_BADPARAM = (-2005)
+DTWAIN_ERR_INVALIDBMP = (-2006)
+DTWAIN_ERR_BMPRLE = (-2007)
+DTWAIN_ERR_RESERVED1 = (-2008)
+DTWAIN_ERR_INVALIDJPG = (-2009)
+DTWAIN_ERR_DC = (-2010)
+DTWAIN_ERR_DIB = (-2011)
+DTWAIN_ERR_RESERVED2 = (-2012)
+DTWAIN_ERR_NORESOURCE = (-2013)
+DTWAIN_ERR_CALLBACKCANCEL = (-2014)
+DTWAIN_ERR_INVALIDPNG = (-2015)
+DTWAIN_ERR_PNGCREATE = (-2016)
+DTWAIN_ERR_INTERNAL = (-2017)
+DTWAIN_ERR_FONT = (-2018)
+DTWAIN_ERR_INTTIFF = (-2019)
+DTWAIN_ERR_INVALIDTIFF = (-2020)
+DTWAIN_ERR_NOTIFFLZW = (-2021)
+DTWAIN_ERR_INVALIDPCX = (-2022)
+DTWAIN_ERR_CREATEBMP = (-2023)
+DTWAIN_ERR_NOLINES = (-2024)
+DTWAIN_ERR_GETDIB = (-2025)
+DTWAIN_ERR_NODEVOP = (-2026)
+DTWAIN_ERR_INVALIDWMF = (-2027)
+DTWAIN_ERR_DEPTHMISMATCH = (-2028)
+DTWAIN_ERR_BITBLT = (-2029)
+DTWAIN_ERR_BUFTOOSMALL = (-2030)
+DTWAIN_ERR_TOOMANYCOLORS = (-2031)
+DTWAIN_ERR_INVALIDTGA = (-2032)
+DTWAIN_ERR_NOTGATHUMBNAIL = (-2033)
+DTWAIN_ERR_RESERVED3 = (-2034)
+DTWAIN_ERR_CREATEDIB = (-2035)
+DTWAIN_ERR_NOLZW = (-2036)
+DTWAIN_ERR_SELECTOBJ = (-2037)
+DTWAIN_ERR_BADMANAGER = (-2038)
+DTWAIN_ERR_OBSOLETE = (-2039)
+DTWAIN_ERR_CREATEDIBSECTION = (-2040)
+DTWAIN_ERR_SETWINMETAFILEBITS = (-2041)
+DTWAIN_ERR_GETWINMETAFILEBITS = (-2042)
+DTWAIN_ERR_PAXPWD = (-2043)
+DTWAIN_ERR_INVALIDPAX = (-2044)
+DTWAIN_ERR_NOSUPPORT = (-2045)
+DTWAIN_ERR_INVALIDPSD = (-2046)
+DTWAIN_ERR_PSDNOTSUPPORTED = (-2047)
+DTWAIN_ERR_DECRYPT = (-2048)
+DTWAIN_ERR_ENCRYPT = (-2049)
+DTWAIN_ERR_COMPRESSION = (-2050)
+DTWAIN_ERR_DECOMPRESSION = (-2051)
+DTWAIN_ERR_INVALIDTLA = (-2052)
+DTWAIN_ERR_INVALIDWBMP = (-2053)
+DTWAIN_ERR_NOTIFFTAG = (-2054)
+DTWAIN_ERR_NOLOCALSTORAGE = (-2055)
+DTWAIN_ERR_INVALIDEXIF = (-2056)
+DTWAIN_ERR_NOEXIFSTRING = (-2057)
+DTWAIN_ERR_TIFFDLL32NOTFOUND = (-2058)
+DTWAIN_ERR_TIFFDLL16NOTFOUND = (-2059)
+DTWAIN_ERR_PNGDLL16NOTFOUND = (-2060)
+DTWAIN_ERR_JPEGDLL16NOTFOUND = (-2061)
+DTWAIN_ERR_BADBITSPERPIXEL = (-2062)
+DTWAIN_ERR_TIFFDLL32INVALIDVER = (-2063)
+DTWAIN_ERR_PDFDLL32NOTFOUND = (-2064)
+DTWAIN_ERR_PDFDLL32INVALIDVER = (-2065)
+DTWAIN_ERR_JPEGDLL32NOTFOUND = (-2066)
+DTWAIN_ERR_JPEGDLL32INVALIDVER = (-2067)
+DTWAIN_ERR_PNGDLL32NOTFOUND = (-2068)
+DTWAIN_ERR_PNGDLL32INVALIDVER = (-2069)
+DTWAIN_ERR_J2KDLL32NOTFOUND = (-2070)
+DTWAIN_ERR_J2KDLL32INVALIDVER = (-2071)
+DTWAIN_ERR_MANDUPLEX_UNAVAILABLE = (-2072)
+DTWAIN_ERR_TIMEOUT = (-2073)
+DTWAIN_ERR_INVALIDICONFORMAT = (-2074)
+DTWAIN_ERR_TWAIN32DSMNOTFOUND = (-2075)
+DTWAIN_ERR_TWAINOPENSOURCEDSMNOTFOUND = (-2076)
+DTWAIN_TWAINSAVE_OK = (0)
+DTWAIN_ERR_TS_FIRST = (-2080)
+DTWAIN_ERR_TS_NOFILENAME = (-2081)
+DTWAIN_ERR_TS_NOTWAINSYS = (-2082)
+DTWAIN_ERR_TS_DEVICEFAILURE = (-2083)
+DTWAIN_ERR_TS_FILESAVEERROR = (-2084)
+DTWAIN_ERR_TS_COMMANDILLEGAL = (-2085)
+DTWAIN_ERR_TS_CANCELLED = (-2086)
+DTWAIN_ERR_TS_ACQUISITIONERROR = (-2087)
+DTWAIN_ERR_TS_INVALIDCOLORSPACE = (-2088)
+DTWAIN_ERR_TS_PDFNOTSUPPORTED = (-2089)
+DTWAIN_ERR_TS_NOTAVAILABLE = (-2090)
+DTWAIN_ERR_OCR_FIRST = (-2100)
+DTWAIN_ERR_OCR_INVALIDPAGENUM = (-2101)
+DTWAIN_ERR_OCR_INVALIDENGINE = (-2102)
+DTWAIN_ERR_OCR_NOTACTIVE = (-2103)
+DTWAIN_ERR_OCR_INVALIDFILETYPE = (-2104)
+DTWAIN_ERR_OCR_INVALIDPIXELTYPE = (-2105)
+DTWAIN_ERR_OCR_INVALIDBITDEPTH = (-2106)
+DTWAIN_ERR_OCR_RECOGNITIONERROR = (-2107)
+DTWAIN_ERR_OCR_LAST = (-2108)
+DTWAIN_ERR_LAST = DTWAIN_ERR_OCR_LAST
+DTWAIN_DE_CHKAUTOCAPTURE = 1
+DTWAIN_DE_CHKBATTERY = 2
+DTWAIN_DE_CHKDEVICEONLINE = 4
+DTWAIN_DE_CHKFLASH = 8
+DTWAIN_DE_CHKPOWERSUPPLY = 16
+DTWAIN_DE_CHKRESOLUTION = 32
+DTWAIN_DE_DEVICEADDED = 64
+DTWAIN_DE_DEVICEOFFLINE = 128
+DTWAIN_DE_DEVICEREADY = 256
+DTWAIN_DE_DEVICEREMOVED = 512
+DTWAIN_DE_IMAGECAPTURED = 1024
+DTWAIN_DE_IMAGEDELETED = 2048
+DTWAIN_DE_PAPERDOUBLEFEED = 4096
+DTWAIN_DE_PAPERJAM = 8192
+DTWAIN_DE_LAMPFAILURE = 16384
+DTWAIN_DE_POWERSAVE = 32768
+DTWAIN_DE_POWERSAVENOTIFY = 65536
+DTWAIN_DE_CUSTOMEVENTS = 0x8000
+DTWAIN_GETDE_EVENT = 0
+DTWAIN_GETDE_DEVNAME = 1
+DTWAIN_GETDE_BATTERYMINUTES = 2
+DTWAIN_GETDE_BATTERYPCT = 3
+DTWAIN_GETDE_XRESOLUTION = 4
+DTWAIN_GETDE_YRESOLUTION = 5
+DTWAIN_GETDE_FLASHUSED = 6
+DTWAIN_GETDE_AUTOCAPTURE = 7
+DTWAIN_GETDE_TIMEBEFORECAPTURE = 8
+DTWAIN_GETDE_TIMEBETWEENCAPTURES = 9
+DTWAIN_GETDE_POWERSUPPLY = 10
+DTWAIN_IMPRINTERTOPBEFORE = 1
+DTWAIN_IMPRINTERTOPAFTER = 2
+DTWAIN_IMPRINTERBOTTOMBEFORE = 4
+DTWAIN_IMPRINTERBOTTOMAFTER = 8
+DTWAIN_ENDORSERTOPBEFORE = 16
+DTWAIN_ENDORSERTOPAFTER = 32
+DTWAIN_ENDORSERBOTTOMBEFORE = 64
+DTWAIN_ENDORSERBOTTOMAFTER = 128
+DTWAIN_PM_SINGLESTRING = 0
+DTWAIN_PM_MULTISTRING = 1
+DTWAIN_PM_COMPOUNDSTRING = 2
+DTWAIN_TWTY_INT8 = 0x0000
+DTWAIN_TWTY_INT16 = 0x0001
+DTWAIN_TWTY_INT32 = 0x0002
+DTWAIN_TWTY_UINT8 = 0x0003
+DTWAIN_TWTY_UINT16 = 0x0004
+DTWAIN_TWTY_UINT32 = 0x0005
+DTWAIN_TWTY_BOOL = 0x0006
+DTWAIN_TWTY_FIX32 = 0x0007
+DTWAIN_TWTY_FRAME = 0x0008
+DTWAIN_TWTY_STR32 = 0x0009
+DTWAIN_TWTY_STR64 = 0x000A
+DTWAIN_TWTY_STR128 = 0x000B
+DTWAIN_TWTY_STR255 = 0x000C
+DTWAIN_TWTY_STR1024 = 0x000D
+DTWAIN_TWTY_UNI512 = 0x000E
+DTWAIN_EI_BARCODEX = 0x1200
+DTWAIN_EI_BARCODEY = 0x1201
+DTWAIN_EI_BARCODETEXT = 0x1202
+DTWAIN_EI_BARCODETYPE = 0x1203
+DTWAIN_EI_DESHADETOP = 0x1204
+DTWAIN_EI_DESHADELEFT = 0x1205
+DTWAIN_EI_DESHADEHEIGHT = 0x1206
+DTWAIN_EI_DESHADEWIDTH = 0x1207
+DTWAIN_EI_DESHADESIZE = 0x1208
+DTWAIN_EI_SPECKLESREMOVED = 0x1209
+DTWAIN_EI_HORZLINEXCOORD = 0x120A
+DTWAIN_EI_HORZLINEYCOORD = 0x120B
+DTWAIN_EI_HORZLINELENGTH = 0x120C
+DTWAIN_EI_HORZLINETHICKNESS = 0x120D
+DTWAIN_EI_VERTLINEXCOORD = 0x120E
+DTWAIN_EI_VERTLINEYCOORD = 0x120F
+DTWAIN_EI_VERTLINELENGTH = 0x1210
+DTWAIN_EI_VERTLINETHICKNESS = 0x1211
+DTWAIN_EI_PATCHCODE = 0x1212
+DTWAIN_EI_ENDORSEDTEXT = 0x1213
+DTWAIN_EI_FORMCONFIDENCE = 0x1214
+DTWAIN_EI_FORMTEMPLATEMATCH = 0x1215
+DTWAIN_EI_FORMTEMPLATEPAGEMATCH = 0x1216
+DTWAIN_EI_FORMHORZDOCOFFSET = 0x1217
+DTWAIN_EI_FORMVERTDOCOFFSET = 0x1218
+DTWAIN_EI_BARCODECOUNT = 0x1219
+DTWAIN_EI_BARCODECONFIDENCE = 0x121A
+DTWAIN_EI_BARCODEROTATION = 0x121B
+DTWAIN_EI_BARCODETEXTLENGTH = 0x121C
+DTWAIN_EI_DESHADECOUNT = 0x121D
+DTWAIN_EI_DESHADEBLACKCOUNTOLD = 0x121E
+DTWAIN_EI_DESHADEBLACKCOUNTNEW = 0x121F
+DTWAIN_EI_DESHADEBLACKRLMIN = 0x1220
+DTWAIN_EI_DESHADEBLACKRLMAX = 0x1221
+DTWAIN_EI_DESHADEWHITECOUNTOLD = 0x1222
+DTWAIN_EI_DESHADEWHITECOUNTNEW = 0x1223
+DTWAIN_EI_DESHADEWHITERLMIN = 0x1224
+DTWAIN_EI_DESHADEWHITERLAVE = 0x1225
+DTWAIN_EI_DESHADEWHITERLMAX = 0x1226
+DTWAIN_EI_BLACKSPECKLESREMOVED = 0x1227
+DTWAIN_EI_WHITESPECKLESREMOVED = 0x1228
+DTWAIN_EI_HORZLINECOUNT = 0x1229
+DTWAIN_EI_VERTLINECOUNT = 0x122A
+DTWAIN_EI_DESKEWSTATUS = 0x122B
+DTWAIN_EI_SKEWORIGINALANGLE = 0x122C
+DTWAIN_EI_SKEWFINALANGLE = 0x122D
+DTWAIN_EI_SKEWCONFIDENCE = 0x122E
+DTWAIN_EI_SKEWWINDOWX1 = 0x122F
+DTWAIN_EI_SKEWWINDOWY1 = 0x1230
+DTWAIN_EI_SKEWWINDOWX2 = 0x1231
+DTWAIN_EI_SKEWWINDOWY2 = 0x1232
+DTWAIN_EI_SKEWWINDOWX3 = 0x1233
+DTWAIN_EI_SKEWWINDOWY3 = 0x1234
+DTWAIN_EI_SKEWWINDOWX4 = 0x1235
+DTWAIN_EI_SKEWWINDOWY4 = 0x1236
+DTWAIN_EI_BOOKNAME = 0x1238
+DTWAIN_EI_CHAPTERNUMBER = 0x1239
+DTWAIN_EI_DOCUMENTNUMBER = 0x123A
+DTWAIN_EI_PAGENUMBER = 0x123B
+DTWAIN_EI_CAMERA = 0x123C
+DTWAIN_EI_FRAMENUMBER = 0x123D
+DTWAIN_EI_FRAME = 0x123E
+DTWAIN_EI_PIXELFLAVOR = 0x123F
+DTWAIN_EI_ICCPROFILE = 0x1240
+DTWAIN_EI_LASTSEGMENT = 0x1241
+DTWAIN_EI_SEGMENTNUMBER = 0x1242
+DTWAIN_EI_MAGDATA = 0x1243
+DTWAIN_EI_MAGTYPE = 0x1244
+DTWAIN_EI_PAGESIDE = 0x1245
+DTWAIN_EI_FILESYSTEMSOURCE = 0x1246
+DTWAIN_EI_IMAGEMERGED = 0x1247
+DTWAIN_EI_MAGDATALENGTH = 0x1248
+DTWAIN_EI_PAPERCOUNT = 0x1249
+DTWAIN_EI_PRINTERTEXT = 0x124A
+
+DTWAIN_LOG_DECODE_SOURCE = 0x1      
+DTWAIN_LOG_DECODE_DEST = 0x2        
+DTWAIN_LOG_DECODE_TWMEMREF = 0x4    
+DTWAIN_LOG_DECODE_TWEVENT = 0x8     
+DTWAIN_LOG_CALLSTACK = 0x10         
+DTWAIN_LOG_ISTWAINMSG = 0x20        
+DTWAIN_LOG_INITFAILURE = 0x40       
+DTWAIN_LOG_LOWLEVELTWAIN = 0x80     
+DTWAIN_LOG_DECODE_BITMAP = 0x100    
+DTWAIN_LOG_NOTIFICATIONS = 0x200    
+DTWAIN_LOG_MISCELLANEOUS = 0x400    
+DTWAIN_LOG_DTWAINERRORS = 0x800     
+DTWAIN_LOG_USEFILE = 0x10000        
+DTWAIN_LOG_SHOWEXCEPTIONS = 0x20000 
+DTWAIN_LOG_ERRORMSGBOX = 0x40000    
+DTWAIN_LOG_USEBUFFER = 0x80000      
+DTWAIN_LOG_FILEAPPEND = 0x100000    
+DTWAIN_LOG_USECALLBACK = 0x200000   
+DTWAIN_LOG_USECRLF = 0x400000       
+DTWAIN_LOG_CONSOLE = 0x800000       
+DTWAIN_LOG_DEBUGMONITOR = 0x1000000 
+DTWAIN_LOG_USEWINDOW = 0x2000000    
+DTWAIN_LOG_ALL = (DTWAIN_LOG_DECODE_SOURCE | DTWAIN_LOG_DECODE_DEST | DTWAIN_LOG_DECODE_TWEVENT
+                | DTWAIN_LOG_DECODE_TWMEMREF | DTWAIN_LOG_CALLSTACK | DTWAIN_LOG_ISTWAINMSG | DTWAIN_LOG_INITFAILURE
+                | DTWAIN_LOG_LOWLEVELTWAIN | DTWAIN_LOG_NOTIFICATIONS | DTWAIN_LOG_MISCELLANEOUS | DTWAIN_LOG_DTWAINERRORS
+                | DTWAIN_LOG_DECODE_BITMAP)
+
+DTWAINGCD_RETURNHANDLE = 1
+DTWAINGCD_COPYDATA = 2
+DTWAIN_BYPOSITION = 0
+DTWAIN_BYID = 1
+DTWAINSCD_USEHANDLE = 1
+DTWAINSCD_USEDATA = 2
+DTWAIN_PAGEFAIL_RETRY = 1
+DTWAIN_PAGEFAIL_TERMINATE = 2
+DTWAIN_MAXRETRY_ATTEMPTS = 3
+DTWAIN_RETRY_FOREVER = (-1)
+DTWAIN_PDF_NOSCALING = 128
+DTWAIN_PDF_FITPAGE = 256
+DTWAIN_PDF_VARIABLEPAGESIZE = 512
+DTWAIN_PDF_CUSTOMSIZE = 1024
+DTWAIN_PDF_USECOMPRESSION = 2048
+DTWAIN_PDF_CUSTOMSCALE = 4096
+DTWAIN_PDF_PIXELSPERMETERSIZE = 8192
+DTWAIN_PDF_ALLOWPRINTING = 2052
+DTWAIN_PDF_ALLOWMOD = 8
+DTWAIN_PDF_ALLOWCOPY = 16
+DTWAIN_PDF_ALLOWMODANNOTATIONS = 32
+DTWAIN_PDF_ALLOWFILLIN = 256
+DTWAIN_PDF_ALLOWEXTRACTION = 512
+DTWAIN_PDF_ALLOWASSEMBLY = 1024
+DTWAIN_PDF_ALLOWDEGRADEDPRINTING = 4
+DTWAIN_PDF_PORTRAIT = 0
+DTWAIN_PDF_LANDSCAPE = 1
+DTWAIN_PS_REGULAR = 0
+DTWAIN_PS_ENCAPSULATED = 1
+DTWAIN_BP_AUTODISCARD_NONE = 0
+DTWAIN_BP_AUTODISCARD_IMMEDIATE = 1
+DTWAIN_BP_AUTODISCARD_AFTERPROCESS = 2
+DTWAIN_BP_AUTODISCARD_ANY = 0xFFFF
+DTWAIN_LP_REFLECTIVE = 0
+DTWAIN_LP_TRANSMISSIVE = 1
+DTWAIN_LS_RED = 0
+DTWAIN_LS_GREEN = 1
+DTWAIN_LS_BLUE = 2
+DTWAIN_LS_NONE = 3
+DTWAIN_LS_WHITE = 4
+DTWAIN_LS_UV = 5
+DTWAIN_LS_IR = 6
+
+DTWAIN_DLG_SORTNAMES = 1
+DTWAIN_DLG_CENTER = 2
+DTWAIN_DLG_CENTER_SCREEN = 4
+DTWAIN_DLG_USETEMPLATE = 8
+DTWAIN_DLG_CLEAR_PARAMS = 16
+DTWAIN_DLG_HORIZONTALSCROLL = 32
+DTWAIN_DLG_USEINCLUDENAMES = 64
+DTWAIN_DLG_USEEXCLUDENAMES = 128
+DTWAIN_DLG_USENAMEMAPPING = 256
+DTWAIN_DLG_TOPMOSTWINDOW = 1024
+DTWAIN_DLG_OPENONSELECT = 2048
+DTWAIN_DLG_OPENONSELECTOVERRIDE = 4096
+DTWAIN_DLG_OPENONSELECTON = (DTWAIN_DLG_OPENONSELECT | DTWAIN_DLG_OPENONSELECTOVERRIDE)
+DTWAIN_DLG_OPENONSELECTOFF = DTWAIN_DLG_OPENONSELECTOVERRIDE
+
+DTWAIN_RES_ENGLISH = 0
+DTWAIN_RES_FRENCH = 1
+DTWAIN_RES_SPANISH = 2
+DTWAIN_RES_DUTCH = 3
+DTWAIN_RES_GERMAN = 4
+DTWAIN_RES_ITALIAN = 5
+DTWAIN_AL_ALARM = 0
+DTWAIN_AL_FEEDERERROR = 1
+DTWAIN_AL_FEEDERWARNING = 2
+DTWAIN_AL_BARCODE = 3
+DTWAIN_AL_DOUBLEFEED = 4
+DTWAIN_AL_JAM = 5
+DTWAIN_AL_PATCHCODE = 6
+DTWAIN_AL_POWER = 7
+DTWAIN_AL_SKEW = 8
+DTWAIN_FT_CAMERA = 0
+DTWAIN_FT_CAMERATOP = 1
+DTWAIN_FT_CAMERABOTTOM = 2
+DTWAIN_FT_CAMERAPREVIEW = 3
+DTWAIN_FT_DOMAIN = 4
+DTWAIN_FT_HOST = 5
+DTWAIN_FT_DIRECTORY = 6
+DTWAIN_FT_IMAGE = 7
+DTWAIN_FT_UNKNOWN = 8
+DTWAIN_NF_NONE = 0
+DTWAIN_NF_AUTO = 1
+DTWAIN_NF_LONEPIXEL = 2
+DTWAIN_NF_MAJORITYRULE = 3
+DTWAIN_CB_AUTO = 0
+DTWAIN_CB_CLEAR = 1
+DTWAIN_CB_NOCLEAR = 2
+DTWAIN_FA_NONE = 0
+DTWAIN_FA_LEFT = 1
+DTWAIN_FA_CENTER = 2
+DTWAIN_FA_RIGHT = 3
+DTWAIN_PF_CHOCOLATE = 0
+DTWAIN_PF_VANILLA = 1
+DTWAIN_FO_FIRSTPAGEFIRST = 0
+DTWAIN_FO_LASTPAGEFIRST = 1
+DTWAIN_INCREMENT_STATIC = 0
+DTWAIN_INCREMENT_DYNAMIC = 1
+DTWAIN_INCREMENT_DEFAULT = -1
+DTWAIN_MANDUP_FACEUPTOPPAGE = 0
+DTWAIN_MANDUP_FACEUPBOTTOMPAGE = 1
+DTWAIN_MANDUP_FACEDOWNTOPPAGE = 2
+DTWAIN_MANDUP_FACEDOWNBOTTOMPAGE = 3
+DTWAIN_FILESAVE_DEFAULT = 0
+DTWAIN_FILESAVE_UICLOSE = 1
+DTWAIN_FILESAVE_SOURCECLOSE = 2
+DTWAIN_FILESAVE_ENDACQUIRE = 3
+DTWAIN_FILESAVE_MANUALSAVE = 4
+DTWAIN_FILESAVE_SAVEINCOMPLETE = 128
+DTWAIN_MANDUP_SCANOK = 1
+DTWAIN_MANDUP_SIDE1RESCAN = 2
+DTWAIN_MANDUP_SIDE2RESCAN = 3
+DTWAIN_MANDUP_RESCANALL = 4
+DTWAIN_MANDUP_PAGEMISSING = 5
+DTWAIN_DEMODLL_VERSION = 0x00000001
+DTWAIN_UNLICENSED_VERSION = 0x00000002
+DTWAIN_COMPANY_VERSION = 0x00000004
+DTWAIN_GENERAL_VERSION = 0x00000008
+DTWAIN_DEVELOP_VERSION = 0x00000010
+DTWAIN_JAVA_VERSION = 0x00000020
+DTWAIN_TOOLKIT_VERSION = 0x00000040
+DTWAIN_LIMITEDDLL_VERSION = 0x00000080
+DTWAIN_STATICLIB_VERSION = 0x00000100
+DTWAIN_STATICLIB_STDCALL_VERSION = 0x00000200
+DTWAIN_PDF_VERSION = 0x00010000
+DTWAIN_TWAINSAVE_VERSION = 0x00020000
+DTWAIN_OCR_VERSION = 0x00040000
+DTWAIN_BARCODE_VERSION = 0x00080000
+DTWAIN_ACTIVEX_VERSION = 0x00100000
+DTWAIN_32BIT_VERSION = 0x00200000
+DTWAIN_64BIT_VERSION = 0x00400000
+DTWAIN_UNICODE_VERSION = 0x00800000
+DTWAIN_OPENSOURCE_VERSION = 0x01000000
+DTWAINOCR_RETURNHANDLE = 1
+DTWAINOCR_COPYDATA = 2
+DTWAIN_OCRINFO_CHAR = 0
+DTWAIN_OCRINFO_CHARXPOS = 1
+DTWAIN_OCRINFO_CHARYPOS = 2
+DTWAIN_OCRINFO_CHARXWIDTH = 3
+DTWAIN_OCRINFO_CHARYWIDTH = 4
+DTWAIN_OCRINFO_CHARCONFIDENCE = 5
+DTWAIN_OCRINFO_PAGENUM = 6
+DTWAIN_OCRINFO_OCRENGINE = 7
+DTWAIN_OCRINFO_TEXTLENGTH = 8
+DTWAIN_PDFPAGETYPE_COLOR = 0
+DTWAIN_PDFPAGETYPE_BW = 1
+DTWAIN_TWAINDSM_LEGACY = 1
+DTWAIN_TWAINDSM_VERSION2 = 2
+DTWAIN_TWAINDSM_LATESTVERSION = 4
+DTWAIN_TWAINDSMSEARCH_NOTFOUND = (-1)
+DTWAIN_TWAINDSMSEARCH_WSO = 0
+DTWAIN_TWAINDSMSEARCH_WOS = 1
+DTWAIN_TWAINDSMSEARCH_SWO = 2
+DTWAIN_TWAINDSMSEARCH_SOW = 3
+DTWAIN_TWAINDSMSEARCH_OWS = 4
+DTWAIN_TWAINDSMSEARCH_OSW = 5
+DTWAIN_TWAINDSMSEARCH_W = 6
+DTWAIN_TWAINDSMSEARCH_S = 7
+DTWAIN_TWAINDSMSEARCH_O = 8
+DTWAIN_TWAINDSMSEARCH_WS = 9
+DTWAIN_TWAINDSMSEARCH_WO = 10
+DTWAIN_TWAINDSMSEARCH_SW = 11
+DTWAIN_TWAINDSMSEARCH_SO = 12
+DTWAIN_TWAINDSMSEARCH_OW = 13
+DTWAIN_TWAINDSMSEARCH_OS = 14
+DTWAIN_PDFPOLARITY_POSITIVE = 1
+DTWAIN_PDFPOLARITY_NEGATIVE = 2
+DTWAIN_TWPF_NORMAL = 0
+DTWAIN_TWPF_BOLD = 1
+DTWAIN_TWPF_ITALIC = 2
+DTWAIN_TWPF_LARGESIZE = 3
+DTWAIN_TWPF_SMALLSIZE = 4
+DTWAIN_TWCT_PAGE = 0
+DTWAIN_TWCT_PATCH1 = 1
+DTWAIN_TWCT_PATCH2 = 2
+DTWAIN_TWCT_PATCH3 = 3
+DTWAIN_TWCT_PATCH4 = 4
+DTWAIN_TWCT_PATCH5 = 5
+DTWAIN_TWCT_PATCH6 = 6
+DTWAIN_TWDF_ULTRASONIC = 0
+DTWAIN_TWDF_BYLENGTH = 1
+DTWAIN_TWDF_INFRARED = 2
+DTWAIN_CV_CAPCUSTOMBASE = 0x8000
+DTWAIN_CV_CAPXFERCOUNT = 0x0001
+DTWAIN_CV_ICAPCOMPRESSION = 0x0100
+DTWAIN_CV_ICAPPIXELTYPE = 0x0101
+DTWAIN_CV_ICAPUNITS = 0x0102
+DTWAIN_CV_ICAPXFERMECH = 0x0103
+DTWAIN_CV_CAPAUTHOR = 0x1000
+DTWAIN_CV_CAPCAPTION = 0x1001
+DTWAIN_CV_CAPFEEDERENABLED = 0x1002
+DTWAIN_CV_CAPFEEDERLOADED = 0x1003
+DTWAIN_CV_CAPTIMEDATE = 0x1004
+DTWAIN_CV_CAPSUPPORTEDCAPS = 0x1005
+DTWAIN_CV_CAPEXTENDEDCAPS = 0x1006
+DTWAIN_CV_CAPAUTOFEED = 0x1007
+DTWAIN_CV_CAPCLEARPAGE = 0x1008
+DTWAIN_CV_CAPFEEDPAGE = 0x1009
+DTWAIN_CV_CAPREWINDPAGE = 0x100a
+DTWAIN_CV_CAPINDICATORS = 0x100b
+DTWAIN_CV_CAPSUPPORTEDCAPSEXT = 0x100c
+DTWAIN_CV_CAPPAPERDETECTABLE = 0x100d
+DTWAIN_CV_CAPUICONTROLLABLE = 0x100e
+DTWAIN_CV_CAPDEVICEONLINE = 0x100f
+DTWAIN_CV_CAPAUTOSCAN = 0x1010
+DTWAIN_CV_CAPTHUMBNAILSENABLED = 0x1011
+DTWAIN_CV_CAPDUPLEX = 0x1012
+DTWAIN_CV_CAPDUPLEXENABLED = 0x1013
+DTWAIN_CV_CAPENABLEDSUIONLY = 0x1014
+DTWAIN_CV_CAPCUSTOMDSDATA = 0x1015
+DTWAIN_CV_CAPENDORSER = 0x1016
+DTWAIN_CV_CAPJOBCONTROL = 0x1017
+DTWAIN_CV_CAPALARMS = 0x1018
+DTWAIN_CV_CAPALARMVOLUME = 0x1019
+DTWAIN_CV_CAPAUTOMATICCAPTURE = 0x101a
+DTWAIN_CV_CAPTIMEBEFOREFIRSTCAPTURE = 0x101b
+DTWAIN_CV_CAPTIMEBETWEENCAPTURES = 0x101c
+DTWAIN_CV_CAPCLEARBUFFERS = 0x101d
+DTWAIN_CV_CAPMAXBATCHBUFFERS = 0x101e
+DTWAIN_CV_CAPDEVICETIMEDATE = 0x101f
+DTWAIN_CV_CAPPOWERSUPPLY = 0x1020
+DTWAIN_CV_CAPCAMERAPREVIEWUI = 0x1021
+DTWAIN_CV_CAPDEVICEEVENT = 0x1022
+DTWAIN_CV_CAPPAGEMULTIPLEACQUIRE = 0x1023
+DTWAIN_CV_CAPSERIALNUMBER = 0x1024
+DTWAIN_CV_CAPFILESYSTEM = 0x1025
+DTWAIN_CV_CAPPRINTER = 0x1026
+DTWAIN_CV_CAPPRINTERENABLED = 0x1027
+DTWAIN_CV_CAPPRINTERINDEX = 0x1028
+DTWAIN_CV_CAPPRINTERMODE = 0x1029
+DTWAIN_CV_CAPPRINTERSTRING = 0x102a
+DTWAIN_CV_CAPPRINTERSUFFIX = 0x102b
+DTWAIN_CV_CAPLANGUAGE = 0x102c
+DTWAIN_CV_CAPFEEDERALIGNMENT = 0x102d
+DTWAIN_CV_CAPFEEDERORDER = 0x102e
+DTWAIN_CV_CAPPAPERBINDING = 0x102f
+DTWAIN_CV_CAPREACQUIREALLOWED = 0x1030
+DTWAIN_CV_CAPPASSTHRU = 0x1031
+DTWAIN_CV_CAPBATTERYMINUTES = 0x1032
+DTWAIN_CV_CAPBATTERYPERCENTAGE = 0x1033
+DTWAIN_CV_CAPPOWERDOWNTIME = 0x1034
+DTWAIN_CV_CAPSEGMENTED = 0x1035
+DTWAIN_CV_CAPCAMERAENABLED = 0x1036
+DTWAIN_CV_CAPCAMERAORDER = 0x1037
+DTWAIN_CV_CAPMICRENABLED = 0x1038
+DTWAIN_CV_CAPFEEDERPREP = 0x1039
+DTWAIN_CV_CAPFEEDERPOCKET = 0x103a
+DTWAIN_CV_CAPAUTOMATICSENSEMEDIUM = 0x103b
+DTWAIN_CV_CAPCUSTOMINTERFACEGUID = 0x103c
+DTWAIN_CV_CAPSUPPORTEDCAPSSEGMENTUNIQUE = 0x103d
+DTWAIN_CV_CAPSUPPORTEDDATS = 0x103e
+DTWAIN_CV_CAPDOUBLEFEEDDETECTION = 0x103f
+DTWAIN_CV_CAPDOUBLEFEEDDETECTIONLENGTH = 0x1040
+DTWAIN_CV_CAPDOUBLEFEEDDETECTIONSENSITIVITY = 0x1041
+DTWAIN_CV_CAPDOUBLEFEEDDETECTIONRESPONSE = 0x1042
+DTWAIN_CV_CAPPAPERHANDLING = 0x1043
+DTWAIN_CV_CAPINDICATORSMODE = 0x1044
+DTWAIN_CV_CAPPRINTERVERTICALOFFSET = 0x1045
+DTWAIN_CV_CAPPOWERSAVETIME = 0x1046
+DTWAIN_CV_CAPPRINTERCHARROTATION = 0x1047
+DTWAIN_CV_CAPPRINTERFONTSTYLE = 0x1048
+DTWAIN_CV_CAPPRINTERINDEXLEADCHAR = 0x1049
+DTWAIN_CV_CAPPRINTERINDEXMAXVALUE = 0x104A
+DTWAIN_CV_CAPPRINTERINDEXNUMDIGITS = 0x104B
+DTWAIN_CV_CAPPRINTERINDEXSTEP = 0x104C
+DTWAIN_CV_CAPPRINTERINDEXTRIGGER = 0x104D
+DTWAIN_CV_CAPPRINTERSTRINGPREVIEW = 0x104E
+DTWAIN_CV_ICAPAUTOBRIGHT = 0x1100
+DTWAIN_CV_ICAPBRIGHTNESS = 0x1101
+DTWAIN_CV_ICAPCONTRAST = 0x1103
+DTWAIN_CV_ICAPCUSTHALFTONE = 0x1104
+DTWAIN_CV_ICAPEXPOSURETIME = 0x1105
+DTWAIN_CV_ICAPFILTER = 0x1106
+DTWAIN_CV_ICAPFLASHUSED = 0x1107
+DTWAIN_CV_ICAPGAMMA = 0x1108
+DTWAIN_CV_ICAPHALFTONES = 0x1109
+DTWAIN_CV_ICAPHIGHLIGHT = 0x110a
+DTWAIN_CV_ICAPIMAGEFILEFORMAT = 0x110c
+DTWAIN_CV_ICAPLAMPSTATE = 0x110d
+DTWAIN_CV_ICAPLIGHTSOURCE = 0x110e
+DTWAIN_CV_ICAPORIENTATION = 0x1110
+DTWAIN_CV_ICAPPHYSICALWIDTH = 0x1111
+DTWAIN_CV_ICAPPHYSICALHEIGHT = 0x1112
+DTWAIN_CV_ICAPSHADOW = 0x1113
+DTWAIN_CV_ICAPFRAMES = 0x1114
+DTWAIN_CV_ICAPXNATIVERESOLUTION = 0x1116
+DTWAIN_CV_ICAPYNATIVERESOLUTION = 0x1117
+DTWAIN_CV_ICAPXRESOLUTION = 0x1118
+DTWAIN_CV_ICAPYRESOLUTION = 0x1119
+DTWAIN_CV_ICAPMAXFRAMES = 0x111a
+DTWAIN_CV_ICAPTILES = 0x111b
+DTWAIN_CV_ICAPBITORDER = 0x111c
+DTWAIN_CV_ICAPCCITTKFACTOR = 0x111d
+DTWAIN_CV_ICAPLIGHTPATH = 0x111e
+DTWAIN_CV_ICAPPIXELFLAVOR = 0x111f
+DTWAIN_CV_ICAPPLANARCHUNKY = 0x1120
+DTWAIN_CV_ICAPROTATION = 0x1121
+DTWAIN_CV_ICAPSUPPORTEDSIZES = 0x1122
+DTWAIN_CV_ICAPTHRESHOLD = 0x1123
+DTWAIN_CV_ICAPXSCALING = 0x1124
+DTWAIN_CV_ICAPYSCALING = 0x1125
+DTWAIN_CV_ICAPBITORDERCODES = 0x1126
+DTWAIN_CV_ICAPPIXELFLAVORCODES = 0x1127
+DTWAIN_CV_ICAPJPEGPIXELTYPE = 0x1128
+DTWAIN_CV_ICAPTIMEFILL = 0x112a
+DTWAIN_CV_ICAPBITDEPTH = 0x112b
+DTWAIN_CV_ICAPBITDEPTHREDUCTION = 0x112c
+DTWAIN_CV_ICAPUNDEFINEDIMAGESIZE = 0x112d
+DTWAIN_CV_ICAPIMAGEDATASET = 0x112e
+DTWAIN_CV_ICAPEXTIMAGEINFO = 0x112f
+DTWAIN_CV_ICAPMINIMUMHEIGHT = 0x1130
+DTWAIN_CV_ICAPMINIMUMWIDTH = 0x1131
+DTWAIN_CV_ICAPAUTOBORDERDETECTION = 0x1132
+DTWAIN_CV_ICAPAUTODESKEW = 0x1133
+DTWAIN_CV_ICAPAUTODISCARDBLANKPAGES = 0x1134
+DTWAIN_CV_ICAPAUTOROTATE = 0x1135
+DTWAIN_CV_ICAPFLIPROTATION = 0x1136
+DTWAIN_CV_ICAPBARCODEDETECTIONENABLED = 0x1137
+DTWAIN_CV_ICAPSUPPORTEDBARCODETYPES = 0x1138
+DTWAIN_CV_ICAPBARCODEMAXSEARCHPRIORITIES = 0x1139
+DTWAIN_CV_ICAPBARCODESEARCHPRIORITIES = 0x113a
+DTWAIN_CV_ICAPBARCODESEARCHMODE = 0x113b
+DTWAIN_CV_ICAPBARCODEMAXRETRIES = 0x113c
+DTWAIN_CV_ICAPBARCODETIMEOUT = 0x113d
+DTWAIN_CV_ICAPZOOMFACTOR = 0x113e
+DTWAIN_CV_ICAPPATCHCODEDETECTIONENABLED = 0x113f
+DTWAIN_CV_ICAPSUPPORTEDPATCHCODETYPES = 0x1140
+DTWAIN_CV_ICAPPATCHCODEMAXSEARCHPRIORITIES = 0x1141
+DTWAIN_CV_ICAPPATCHCODESEARCHPRIORITIES = 0x1142
+DTWAIN_CV_ICAPPATCHCODESEARCHMODE = 0x1143
+DTWAIN_CV_ICAPPATCHCODEMAXRETRIES = 0x1144
+DTWAIN_CV_ICAPPATCHCODETIMEOUT = 0x1145
+DTWAIN_CV_ICAPFLASHUSED2 = 0x1146
+DTWAIN_CV_ICAPIMAGEFILTER = 0x1147
+DTWAIN_CV_ICAPNOISEFILTER = 0x1148
+DTWAIN_CV_ICAPOVERSCAN = 0x1149
+DTWAIN_CV_ICAPAUTOMATICBORDERDETECTION = 0x1150
+DTWAIN_CV_ICAPAUTOMATICDESKEW = 0x1151
+DTWAIN_CV_ICAPAUTOMATICROTATE = 0x1152
+DTWAIN_CV_ICAPJPEGQUALITY = 0x1153
+DTWAIN_CV_ICAPFEEDERTYPE = 0x1154
+DTWAIN_CV_ICAPICCPROFILE = 0x1155
+DTWAIN_CV_ICAPAUTOSIZE = 0x1156
+DTWAIN_CV_ICAPAUTOMATICCROPUSESFRAME = 0x1157
+DTWAIN_CV_ICAPAUTOMATICLENGTHDETECTION = 0x1158
+DTWAIN_CV_ICAPAUTOMATICCOLORENABLED = 0x1159
+DTWAIN_CV_ICAPAUTOMATICCOLORNONCOLORPIXELTYPE = 0x115a
+DTWAIN_CV_ICAPCOLORMANAGEMENTENABLED = 0x115b
+DTWAIN_CV_ICAPIMAGEMERGE = 0x115c
+DTWAIN_CV_ICAPIMAGEMERGEHEIGHTTHRESHOLD = 0x115d
+DTWAIN_CV_ICAPSUPPORTEDEXTIMAGEINFO = 0x115e
+DTWAIN_CV_ICAPFILMTYPE = 0x115f
+DTWAIN_CV_ICAPMIRROR = 0x1160
+DTWAIN_CV_ICAPJPEGSUBSAMPLING = 0x1161
+DTWAIN_CV_ACAPAUDIOFILEFORMAT = 0x1201
+DTWAIN_CV_ACAPXFERMECH = 0x1202
+DTWAIN_CFMCV_CAPCFMSTART = 2048
+DTWAIN_CFMCV_CAPDUPLEXSCANNER = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+10)
+DTWAIN_CFMCV_CAPDUPLEXENABLE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+11)
+DTWAIN_CFMCV_CAPSCANNERNAME = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+12)
+DTWAIN_CFMCV_CAPSINGLEPASS = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+13)
+DTWAIN_CFMCV_CAPERRHANDLING = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+20)
+DTWAIN_CFMCV_CAPFEEDERSTATUS = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+21)
+DTWAIN_CFMCV_CAPFEEDMEDIUMWAIT = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+22)
+DTWAIN_CFMCV_CAPFEEDWAITTIME = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+23)
+DTWAIN_CFMCV_ICAPWHITEBALANCE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+24)
+DTWAIN_CFMCV_ICAPAUTOBINARY = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+25)
+DTWAIN_CFMCV_ICAPIMAGESEPARATION = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+26)
+DTWAIN_CFMCV_ICAPHARDWARECOMPRESSION = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+27)
+DTWAIN_CFMCV_ICAPIMAGEEMPHASIS = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+28)
+DTWAIN_CFMCV_ICAPOUTLINING = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+29)
+DTWAIN_CFMCV_ICAPDYNTHRESHOLD = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+30)
+DTWAIN_CFMCV_ICAPVARIANCE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+31)
+DTWAIN_CFMCV_CAPENDORSERAVAILABLE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+32)
+DTWAIN_CFMCV_CAPENDORSERENABLE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+33)
+DTWAIN_CFMCV_CAPENDORSERCHARSET = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+34)
+DTWAIN_CFMCV_CAPENDORSERSTRINGLENGTH = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+35)
+DTWAIN_CFMCV_CAPENDORSERSTRING = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+36)
+DTWAIN_CFMCV_ICAPDYNTHRESHOLDCURVE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+48)
+DTWAIN_CFMCV_ICAPSMOOTHINGMODE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+49)
+DTWAIN_CFMCV_ICAPFILTERMODE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+50)
+DTWAIN_CFMCV_ICAPGRADATION = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+51)
+DTWAIN_CFMCV_ICAPMIRROR = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+52)
+DTWAIN_CFMCV_ICAPEASYSCANMODE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+53)
+DTWAIN_CFMCV_ICAPSOFTWAREINTERPOLATION = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+54)
+DTWAIN_CFMCV_ICAPIMAGESEPARATIONEX = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+55)
+DTWAIN_CFMCV_CAPDUPLEXPAGE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+56)
+DTWAIN_CFMCV_ICAPINVERTIMAGE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+57)
+DTWAIN_CFMCV_ICAPSPECKLEREMOVE = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+58)
+DTWAIN_CFMCV_ICAPUSMFILTER = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+59)
+DTWAIN_CFMCV_ICAPNOISEFILTERCFM = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+60)
+DTWAIN_CFMCV_ICAPDESCREENING = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+61)
+DTWAIN_CFMCV_ICAPQUALITYFILTER = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+62)
+DTWAIN_CFMCV_ICAPBINARYFILTER = (DTWAIN_CV_CAPCUSTOMBASE+DTWAIN_CFMCV_CAPCFMSTART+63)
+DTWAIN_OCRCV_IMAGEFILEFORMAT = 0x1000
+DTWAIN_OCRCV_DESKEW = 0x1001
+DTWAIN_OCRCV_DESHADE = 0x1002
+DTWAIN_OCRCV_ORIENTATION = 0x1003
+DTWAIN_OCRCV_NOISEREMOVE = 0x1004
+DTWAIN_OCRCV_LINEREMOVE = 0x1005
+DTWAIN_OCRCV_INVERTPAGE = 0x1006
+DTWAIN_OCRCV_INVERTZONES = 0x1007
+DTWAIN_OCRCV_LINEREJECT = 0x1008
+DTWAIN_OCRCV_CHARACTERREJECT = 0x1009
+DTWAIN_OCRCV_ERRORREPORTMODE = 0x1010
+DTWAIN_OCRCV_ERRORREPORTFILE = 0x1011
+DTWAIN_OCRCV_PIXELTYPE = 0x1012
+DTWAIN_OCRCV_BITDEPTH = 0x1013
+DTWAIN_OCRCV_RETURNCHARINFO = 0x1014
+DTWAIN_OCRCV_NATIVEFILEFORMAT = 0x1015
+DTWAIN_OCRCV_MPNATIVEFILEFORMAT = 0x1016
+DTWAIN_OCRCV_SUPPORTEDCAPS = 0x1017
+DTWAIN_OCRCV_DISABLECHARACTERS = 0x1018
+DTWAIN_OCRCV_REMOVECONTROLCHARS = 0x1019
+DTWAIN_OCRORIENT_OFF = 0
+DTWAIN_OCRORIENT_AUTO = 1
+DTWAIN_OCRORIENT_90 = 2
+DTWAIN_OCRORIENT_180 = 3
+DTWAIN_OCRORIENT_270 = 4
+DTWAIN_OCRIMAGEFORMAT_AUTO = 10000
+DTWAIN_OCRERROR_MODENONE = 0
+DTWAIN_OCRERROR_SHOWMSGBOX = 1
+DTWAIN_OCRERROR_WRITEFILE = 2
+DTWAIN_PDFTEXT_ALLPAGES = 0x00000001
+DTWAIN_PDFTEXT_EVENPAGES = 0x00000002
+DTWAIN_PDFTEXT_ODDPAGES = 0x00000004
+DTWAIN_PDFTEXT_FIRSTPAGE = 0x00000008
+DTWAIN_PDFTEXT_LASTPAGE = 0x00000010
+DTWAIN_PDFTEXT_CURRENTPAGE = 0x00000020
+DTWAIN_PDFTEXT_DISABLED = 0x00000040
+DTWAIN_PDFTEXT_TOPLEFT = 0x00000100
+DTWAIN_PDFTEXT_TOPRIGHT = 0x00000200
+DTWAIN_PDFTEXT_HORIZCENTER = 0x00000400
+DTWAIN_PDFTEXT_VERTCENTER = 0x00000800
+DTWAIN_PDFTEXT_BOTTOMLEFT = 0x00001000
+DTWAIN_PDFTEXT_BOTTOMRIGHT = 0x00002000
+DTWAIN_PDFTEXT_BOTTOMCENTER = 0x00004000
+DTWAIN_PDFTEXT_TOPCENTER = 0x00008000
+DTWAIN_PDFTEXT_XCENTER = 0x00010000
+DTWAIN_PDFTEXT_YCENTER = 0x00020000
+DTWAIN_PDFTEXT_NOSCALING = 0x00100000
+DTWAIN_PDFTEXT_NOCHARSPACING = 0x00200000
+DTWAIN_PDFTEXT_NOWORDSPACING = 0x00400000
+DTWAIN_PDFTEXT_NOSTROKEWIDTH = 0x00800000
+DTWAIN_PDFTEXT_NORENDERMODE = 0x01000000
+DTWAIN_PDFTEXT_NORGBCOLOR = 0x02000000
+DTWAIN_PDFTEXT_NOFONTSIZE = 0x04000000
+DTWAIN_PDFTEXT_NOABSPOSITION = 0x08000000
+DTWAIN_PDFTEXT_IGNOREALL = 0xFFF00000
+DTWAIN_FONT_COURIER = 0
+DTWAIN_FONT_COURIERBOLD = 1
+DTWAIN_FONT_COURIERBOLDOBLIQUE = 2
+DTWAIN_FONT_COURIEROBLIQUE = 3
+DTWAIN_FONT_HELVETICA = 4
+DTWAIN_FONT_HELVETICABOLD = 5
+DTWAIN_FONT_HELVETICABOLDOBLIQUE = 6
+DTWAIN_FONT_HELVETICAOBLIQUE = 7
+DTWAIN_FONT_TIMESBOLD = 8
+DTWAIN_FONT_TIMESBOLDITALIC = 9
+DTWAIN_FONT_TIMESROMAN = 10
+DTWAIN_FONT_TIMESITALIC = 11
+DTWAIN_FONT_SYMBOL = 12
+DTWAIN_FONT_ZAPFDINGBATS = 13
+DTWAIN_PDFRENDER_FILL = 0
+DTWAIN_PDFRENDER_STROKE = 1
+DTWAIN_PDFRENDER_FILLSTROKE = 2
+DTWAIN_PDFRENDER_INVISIBLE = 3
+DTWAIN_PDFTEXTELEMENT_SCALINGXY = 0
+DTWAIN_PDFTEXTELEMENT_FONTHEIGHT = 1
+DTWAIN_PDFTEXTELEMENT_WORDSPACING = 2
+DTWAIN_PDFTEXTELEMENT_POSITION = 3
+DTWAIN_PDFTEXTELEMENT_COLOR = 4
+DTWAIN_PDFTEXTELEMENT_STROKEWIDTH = 5
+DTWAIN_PDFTEXTELEMENT_DISPLAYFLAGS = 6
+DTWAIN_PDFTEXTELEMENT_FONTNAME = 7
+DTWAIN_PDFTEXTELEMENT_TEXT = 8
+DTWAIN_PDFTEXTELEMENT_RENDERMODE = 9
+DTWAIN_PDFTEXTELEMENT_CHARSPACING = 10
+DTWAIN_PDFTEXTELEMENT_ROTATIONANGLE = 11
+DTWAIN_PDFTEXTELEMENT_LEADING = 12
+DTWAIN_PDFTEXTELEMENT_SCALING = 13
+DTWAIN_PDFTEXTELEMENT_TEXTLENGTH = 14
+DTWAIN_PDFTEXTELEMENT_SKEWANGLES = 15
+DTWAIN_PDFTEXTELEMENT_TRANSFORMORDER = 16
+DTWAIN_PDFTEXTTRANSFORM_TSRK = 0
+DTWAIN_PDFTEXTTRANSFORM_TSKR = 1
+DTWAIN_PDFTEXTTRANSFORM_TKSR = 2
+DTWAIN_PDFTEXTTRANSFORM_TKRS = 3
+DTWAIN_PDFTEXTTRANSFORM_TRSK = 4
+DTWAIN_PDFTEXTTRANSFORM_TRKS = 5
+DTWAIN_PDFTEXTTRANSFORM_STRK = 6
+DTWAIN_PDFTEXTTRANSFORM_STKR = 7
+DTWAIN_PDFTEXTTRANSFORM_SKTR = 8
+DTWAIN_PDFTEXTTRANSFORM_SKRT = 9
+DTWAIN_PDFTEXTTRANSFORM_SRTK = 10
+DTWAIN_PDFTEXTTRANSFORM_SRKT = 11
+DTWAIN_PDFTEXTTRANSFORM_RSTK = 12
+DTWAIN_PDFTEXTTRANSFORM_RSKT = 13
+DTWAIN_PDFTEXTTRANSFORM_RTSK = 14
+DTWAIN_PDFTEXTTRANSFORM_RTKT = 15
+DTWAIN_PDFTEXTTRANSFORM_RKST = 16
+DTWAIN_PDFTEXTTRANSFORM_RKTS = 17
+DTWAIN_PDFTEXTTRANSFORM_KSTR = 18
+DTWAIN_PDFTEXTTRANSFORM_KSRT = 19
+DTWAIN_PDFTEXTTRANSFORM_KRST = 20
+DTWAIN_PDFTEXTTRANSFORM_KRTS = 21
+DTWAIN_PDFTEXTTRANSFORM_KTSR = 22
+DTWAIN_PDFTEXTTRANSFORM_KTRS = 23
+DTWAIN_PDFTEXTTRANFORM_LAST = DTWAIN_PDFTEXTTRANSFORM_KTRS
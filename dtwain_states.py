@@ -0,0 +1,332 @@
+# name: dtwain_states
+# author: joshua dwight
+# github/jadwight
+
+# this module checks TWAIN calls against the TWAIN state machine. the DG/DAT/MSG triplets and their
+# names come from twaininfo.txt (through dtwain_twaininfo); which states each triplet may be sent in,
+# and the state it leads to, come from the TWAIN specification in TRIPLET_STATES. both are compiled
+# into flat tables so checking a call, or following a logged sequence of calls, is a few indexings.
+
+# usage: python dtwain_states.py twain.log     # report out-of-sequence calls in a log
+#        machine = dtwain_states.load_state_machine()
+#        machine.allowed(1, 3, 1025, 3)        # DG_CONTROL/DAT_IDENTITY/MSG_OPENDS in state 3: True
+
+# imports
+import re
+import sys
+
+import dtwain_twaininfo
+
+# The seven TWAIN states, as bits 1 to 7 of a mask: 1 pre-session, 2 source manager loaded,
+# 3 source manager open, 4 source open, 5 source enabled, 6 transfer ready, 7 transferring
+STATE_BITS = {state: 1 << state for state in range(1, 8)}
+ANY_STATE = sum(STATE_BITS.values())
+
+# When each triplet may be sent, from the TWAIN specification: (first state, last state, moves).
+# moves maps a state to the states a successful call can leave it in; without one the state stays
+TRIPLET_STATES = {
+    ("DG_CONTROL", "DAT_PARENT", "MSG_OPENDSM"): (2, 2, {2: (3,)}),
+    ("DG_CONTROL", "DAT_PARENT", "MSG_CLOSEDSM"): (3, 3, {3: (2,)}),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_GETDEFAULT"): (3, 7, {}),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_GETFIRST"): (3, 7, {}),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_GETNEXT"): (3, 7, {}),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_USERSELECT"): (3, 7, {}),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_OPENDS"): (3, 3, {3: (4,)}),
+    ("DG_CONTROL", "DAT_IDENTITY", "MSG_CLOSEDS"): (4, 4, {4: (3,)}),
+    ("DG_CONTROL", "DAT_ENTRYPOINT", "MSG_GET"): (3, 7, {}),
+    ("DG_CONTROL", "DAT_STATUS", "MSG_GET"): (2, 7, {}),
+    ("DG_CONTROL", "DAT_STATUSUTF8", "MSG_GET"): (3, 7, {}),
+    ("DG_CONTROL", "DAT_TWUNKIDENTITY", "MSG_GET"): (3, 7, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_GET"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_GETCURRENT"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_GETDEFAULT"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_QUERYSUPPORT"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_GETHELP"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_GETLABEL"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_GETLABELENUM"): (4, 7, {}),
+    # States 5 and 6 only for capabilities negotiated through CAP_EXTENDEDCAPS
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_SET"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_SETCONSTRAINT"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_RESET"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_CAPABILITY", "MSG_RESETALL"): (4, 4, {}),
+    ("DG_CONTROL", "DAT_CUSTOMDSDATA", "MSG_GET"): (4, 4, {}),
+    ("DG_CONTROL", "DAT_CUSTOMDSDATA", "MSG_SET"): (4, 4, {}),
+    ("DG_CONTROL", "DAT_DEVICEEVENT", "MSG_GET"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_CALLBACK", "MSG_REGISTER_CALLBACK"): (4, 4, {}),
+    ("DG_CONTROL", "DAT_CALLBACK", "MSG_INVOKE_CALLBACK"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_CALLBACK2", "MSG_REGISTER_CALLBACK"): (4, 4, {}),
+    ("DG_CONTROL", "DAT_EVENT", "MSG_PROCESSEVENT"): (5, 7, {}),
+    ("DG_CONTROL", "DAT_NULL", "MSG_XFERREADY"): (5, 5, {5: (6,)}),
+    ("DG_CONTROL", "DAT_NULL", "MSG_CLOSEDSREQ"): (5, 7, {}),
+    ("DG_CONTROL", "DAT_NULL", "MSG_CLOSEDSOK"): (5, 7, {}),
+    ("DG_CONTROL", "DAT_NULL", "MSG_DEVICEEVENT"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_USERINTERFACE", "MSG_ENABLEDS"): (4, 4, {4: (5,)}),
+    ("DG_CONTROL", "DAT_USERINTERFACE", "MSG_ENABLEDSUIONLY"): (4, 4, {4: (5,)}),
+    ("DG_CONTROL", "DAT_USERINTERFACE", "MSG_DISABLEDS"): (5, 5, {5: (4,)}),
+    ("DG_CONTROL", "DAT_PENDINGXFERS", "MSG_GET"): (4, 7, {}),
+    # Back to 5 when no transfers are left, which a log does not show
+    ("DG_CONTROL", "DAT_PENDINGXFERS", "MSG_ENDXFER"): (6, 7, {6: (5, 6), 7: (5, 6)}),
+    ("DG_CONTROL", "DAT_PENDINGXFERS", "MSG_RESET"): (6, 6, {6: (5,)}),
+    ("DG_CONTROL", "DAT_PENDINGXFERS", "MSG_STOPFEEDER"): (6, 6, {}),
+    ("DG_CONTROL", "DAT_SETUPMEMXFER", "MSG_GET"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_SETUPFILEXFER", "MSG_GET"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_SETUPFILEXFER", "MSG_GETDEFAULT"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_SETUPFILEXFER", "MSG_SET"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_SETUPFILEXFER", "MSG_RESET"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_XFERGROUP", "MSG_GET"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_XFERGROUP", "MSG_SET"): (6, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_AUTOMATICCAPTUREDIRECTORY"): (4, 4, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_CHANGEDIRECTORY"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_COPY"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_CREATEDIRECTORY"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_DELETE"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_FORMATMEDIA"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_GETCLOSE"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_GETFIRSTFILE"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_GETINFO"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_GETNEXTFILE"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_FILESYSTEM", "MSG_RENAME"): (4, 6, {}),
+    ("DG_CONTROL", "DAT_PASSTHRU", "MSG_PASSTHRU"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_METRICS", "MSG_GET"): (4, 7, {}),
+    ("DG_CONTROL", "DAT_TWAINDIRECT", "MSG_SETTASK"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_IMAGEINFO", "MSG_GET"): (6, 7, {}),
+    ("DG_IMAGE", "DAT_IMAGELAYOUT", "MSG_GET"): (4, 6, {}),
+    ("DG_IMAGE", "DAT_IMAGELAYOUT", "MSG_GETDEFAULT"): (4, 6, {}),
+    ("DG_IMAGE", "DAT_IMAGELAYOUT", "MSG_SET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_IMAGELAYOUT", "MSG_RESET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_IMAGEMEMXFER", "MSG_GET"): (6, 7, {6: (7,), 7: (7,)}),
+    ("DG_IMAGE", "DAT_IMAGEMEMFILEXFER", "MSG_GET"): (6, 7, {6: (7,), 7: (7,)}),
+    ("DG_IMAGE", "DAT_IMAGENATIVEXFER", "MSG_GET"): (6, 6, {6: (7,)}),
+    ("DG_IMAGE", "DAT_IMAGEFILEXFER", "MSG_GET"): (6, 6, {6: (7,)}),
+    ("DG_IMAGE", "DAT_CIECOLOR", "MSG_GET"): (6, 6, {}),
+    ("DG_IMAGE", "DAT_GRAYRESPONSE", "MSG_SET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_GRAYRESPONSE", "MSG_RESET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_RGBRESPONSE", "MSG_SET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_RGBRESPONSE", "MSG_RESET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_JPEGCOMPRESSION", "MSG_GET"): (4, 6, {}),
+    ("DG_IMAGE", "DAT_JPEGCOMPRESSION", "MSG_GETDEFAULT"): (4, 6, {}),
+    ("DG_IMAGE", "DAT_JPEGCOMPRESSION", "MSG_SET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_JPEGCOMPRESSION", "MSG_RESET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_PALETTE8", "MSG_GET"): (4, 6, {}),
+    ("DG_IMAGE", "DAT_PALETTE8", "MSG_GETDEFAULT"): (4, 6, {}),
+    ("DG_IMAGE", "DAT_PALETTE8", "MSG_SET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_PALETTE8", "MSG_RESET"): (4, 4, {}),
+    ("DG_IMAGE", "DAT_EXTIMAGEINFO", "MSG_GET"): (7, 7, {}),
+    ("DG_IMAGE", "DAT_ICCPROFILE", "MSG_GET"): (6, 6, {}),
+    ("DG_AUDIO", "DAT_AUDIOFILEXFER", "MSG_GET"): (6, 6, {6: (7,)}),
+    ("DG_AUDIO", "DAT_AUDIONATIVEXFER", "MSG_GET"): (6, 6, {6: (7,)}),
+    ("DG_AUDIO", "DAT_AUDIOINFO", "MSG_GET"): (6, 7, {}),
+}
+
+# Triplets that twaininfo.txt lists but TRIPLET_STATES does not are allowed in any open-source state
+DEFAULT_TRIPLET_STATES = (4, 7, {})
+
+# A log line is a call if it names a triplet; calls that report TWRC_FAILURE do not change the state
+LOG_TRIPLET = re.compile(r"(DG_\w+).*?(DAT_\w+).*?(MSG_\w+)")
+LOG_FAILURE = "TWRC_FAILURE"
+
+def state_mask(states):
+    # (3, 4) -> the mask with bits 3 and 4 set
+    mask = 0
+    for state in states:
+        mask |= STATE_BITS[state]
+    return mask
+
+def mask_states(mask):
+    # The mask with bits 3 and 4 set -> (3, 4)
+    return tuple(state for state, bit in STATE_BITS.items() if mask & bit)
+
+class StateMachine:
+    """
+    The TWAIN state machine compiled for one twaininfo.txt.
+
+    slots is a dense array over every (DG, DAT, MSG) of the name tables, holding a triplet id
+    (0 for triplets that are not known). allowed_masks[id] is the mask of states the triplet may
+    be sent in, and moves[id * 256 + mask] the mask of states a successful call leaves a session
+    in when it was in one of the states of mask. A session whose state is not known exactly, such as a
+    log that starts part way, is followed as the mask of the states it may be in.
+    """
+    def __init__(self, info, rules=TRIPLET_STATES):
+        names = {table: {name: value for value, name in info.records(table)} for table in ("dg", "dat", "msg")}
+        dgs = sorted(value for name, value in names["dg"].items() if name.startswith("DG_"))
+        self.dg_index = {value: index for index, value in enumerate(dgs)}
+        self.dat_index = {value: index for index, value in enumerate(sorted(set(names["dat"].values())))}
+        self.msg_index = {value: index for index, value in enumerate(sorted(set(names["msg"].values())))}
+        self.value_of = {name: value for table in names.values() for name, value in table.items()}
+        value_names = [{value: name for name, value in reversed(list(names[table].items()))}
+                       for table in ("dg", "dat", "msg")]
+
+        triplets = [values[1:4] for values in info.records("triplets")]
+        for dg, dat, msg in rules:
+            if dg in names["dg"] and dat in names["dat"] and msg in names["msg"]:
+                triplets.append((names["dg"][dg], names["dat"][dat], names["msg"][msg]))
+
+        self.slots = bytearray(len(self.dg_index) * len(self.dat_index) * len(self.msg_index))
+        self.allowed_masks = bytearray(1)
+        self.moves = bytearray(range(256))
+        self.triplet_names = [None]
+        self.unruled = []
+        for triplet in triplets:
+            slot = self.slot(*triplet)
+            if slot is None or self.slots[slot]:
+                continue
+            triplet_names = tuple(table.get(value, str(value)) for table, value in zip(value_names, triplet))
+            rule = rules.get(triplet_names)
+            if rule is None:
+                self.unruled.append(triplet_names)
+                rule = DEFAULT_TRIPLET_STATES
+            first, last, moves = rule
+            allowed = state_mask(range(first, last + 1))
+            next_states = {state: state_mask(moves.get(state, (state,))) for state in range(first, last + 1)}
+            row = bytearray(256)
+            for mask in range(256):
+                if mask & allowed:
+                    for state in mask_states(mask & allowed):
+                        row[mask] |= next_states[state]
+                else:
+                    # Sent in a state it is not allowed in, so the call fails and nothing changes
+                    row[mask] = mask
+            self.slots[slot] = len(self.allowed_masks)
+            self.allowed_masks.append(allowed)
+            self.moves.extend(row)
+            self.triplet_names.append(triplet_names)
+
+    def slot(self, dg, dat, msg):
+        """
+        Find where a triplet is in the dense array.
+
+        Returns:
+            int or None: The index into slots, or None if a part of the triplet has no name.
+        """
+        try:
+            return ((self.dg_index[dg] * len(self.dat_index) + self.dat_index[dat]) * len(self.msg_index)
+                    + self.msg_index[msg])
+        except KeyError:
+            return None
+
+    def triplet_id(self, dg, dat, msg):
+        """
+        Return the id of a triplet: 0 if it is not known.
+        """
+        slot = self.slot(dg, dat, msg)
+        return 0 if slot is None else self.slots[slot]
+
+    def allowed(self, dg, dat, msg, state):
+        """
+        Check whether a triplet may be sent in a state.
+
+        Parameters:
+            dg (int), dat (int), msg (int): The triplet.
+            state (int): The TWAIN state, 1 to 7.
+
+        Returns:
+            bool: True if the triplet is known and allowed in state.
+        """
+        return bool(self.allowed_masks[self.triplet_id(dg, dat, msg)] & STATE_BITS[state])
+
+    def allowed_states(self, dg, dat, msg):
+        """
+        Return the states a triplet may be sent in, e.g. (3,) for MSG_OPENDS; () if it is unknown.
+        """
+        return mask_states(self.allowed_masks[self.triplet_id(dg, dat, msg)])
+
+    def replay(self, calls, states=ANY_STATE):
+        """
+        Follow a sequence of calls through the state machine.
+
+        Parameters:
+            calls (iterable): (dg, dat, msg, succeeded) tuples, in the order they were made.
+                None entries, such as log_calls gives for lines without a call, are skipped.
+            states (int): Mask of the states the session may be in before the first call; by
+                default any, which the calls narrow down.
+
+        Yields:
+            tuple: (position in calls, triplet names, mask of the states the session may have
+                been in) for each call that is unknown (named by its values) or not allowed in
+                any of those states.
+        """
+        allowed = self.allowed_masks
+        moves = self.moves
+        # Calls repeat a few triplets, so each is looked up in the dense array once
+        triplet_ids = {}
+        for position, call in enumerate(calls):
+            if call is None:
+                continue
+            triplet = triplet_ids.get(call)
+            if triplet is None:
+                triplet = triplet_ids[call] = self.triplet_id(*call[:3])
+            if not allowed[triplet] & states:
+                yield position, self.triplet_names[triplet] or call[:3], states
+            elif call[3]:
+                states = moves[triplet * 256 + states]
+
+    def log_calls(self, lines):
+        """
+        Read the calls out of log lines that name triplets, e.g.
+        "DG_CONTROL / DAT_IDENTITY / MSG_OPENDS ... TWRC_SUCCESS".
+
+        Parameters:
+            lines (iterable): The log lines, e.g. an open log file, read one at a time.
+
+        Yields:
+            tuple: (dg, dat, msg, succeeded) for each line that names a call, names without a
+                value becoming -1, and None for every other line, so positions are line numbers.
+        """
+        value_of = self.value_of
+        search = LOG_TRIPLET.search
+        # A log names few distinct triplets, so each is turned into its failed and succeeded
+        # calls once and the same tuples are given for every line that names it
+        triplets = {}
+        for line in lines:
+            match = search(line)
+            if match is None:
+                yield None
+                continue
+            names = match.groups()
+            calls = triplets.get(names)
+            if calls is None:
+                values = tuple(value_of.get(name, -1) for name in names)
+                calls = triplets[names] = (values + (False,), values + (True,))
+            yield calls[LOG_FAILURE not in line]
+
+    def replay_log(self, lines, states=ANY_STATE):
+        """
+        Follow the calls of a log through the state machine: replay over log_calls.
+
+        Parameters:
+            lines (iterable): The log lines, e.g. an open log file, read one at a time.
+            states (int): Mask of the states the session may be in before the first call.
+
+        Yields:
+            tuple: (line number from 0, triplet names, mask of the states the session may have
+                been in) for each call that is unknown or not allowed in any of those states.
+        """
+        return self.replay(self.log_calls(lines), states)
+
+def load_state_machine(source_path=None, cache_dir=None):
+    """
+    Compile the state machine from a twaininfo.txt, through its memory-mapped compiled form.
+
+    Parameters:
+        source_path (str): The twaininfo.txt. Defaults to the first of TWAININFO_SOURCES.
+        cache_dir (str): Where compiled twaininfo files are kept.
+
+    Returns:
+        StateMachine: The compiled state machine.
+    """
+    with dtwain_twaininfo.open_twaininfo(source_path, cache_dir) as info:
+        return StateMachine(info)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python dtwain_states.py LOGFILE [twaininfo.txt]")
+        sys.exit(1)
+    machine = load_state_machine(sys.argv[2] if len(sys.argv) > 2 else None)
+    violations = 0
+    with open(sys.argv[1], errors="replace") as log:
+        for position, triplet, states in machine.replay_log(log):
+            violations += 1
+            print(f"Line {position + 1}: {'/'.join(map(str, triplet))} is not allowed in state "
+                  f"{' or '.join(map(str, mask_states(states)))}")
+    print(f"{violations} out-of-sequence calls")
+    sys.exit(1 if violations else 0)
@@ -0,0 +1,417 @@
+# name: dtwain_twaininfo
+# author: joshua dwight
+# github/jadwight
+
+# this module compiles twaininfo.txt, the whitespace-delimited tables DTWAIN reads at start-up, into a
+# versioned, fixed-layout binary file that is memory-mapped instead of re-parsed. every table is an
+# array of fixed-size records sorted by an integer key, so any lookup is a binary search in the map.
+# the compiled file is named after the SHA-256 of the text, so editing twaininfo.txt invalidates it.
+
+# usage: python dtwain_twaininfo.py [path/to/twaininfo.txt]   # compile and list the tables
+#        info = dtwain_twaininfo.open_twaininfo("dtwain_x64/twaininfo.txt")
+#        info.name("msg", 1025)          # 'MSG_OPENDS'
+#        info.triplet(1, 3, 1025)        # (1, 3, 1025, 5, 7, 0)
+#        info.enum_names("TWPT", 2)      # ('TWPT_RGB',)
+
+# imports
+import os
+import re
+import sys
+import mmap
+import struct
+import hashlib
+import tempfile
+
+# The twaininfo.txt compiled when no path is given (the variant copies are identical)
+TWAININFO_SOURCES = (
+    "dtwain_x64/twaininfo.txt",
+    "dtwain_x64_unicode/twaininfo.txt",
+    "dtwain_x86/twaininfo.txt",
+    "dtwain_x86_unicode/twaininfo.txt",
+)
+
+# Where compiled files are kept, as twaininfo-<first 16 hex digits of the text's SHA-256>.bin
+TWAININFO_CACHE_DIR = "dtwain_cache"
+
+# The compiled layout: a header, a directory of tables, the tables, a string pool and an int32 pool.
+# Every table is a sorted array of records that start with an int64 key; the directory gives each
+# table's field spec: q int64, i int32, d float64, s string and l int list (each an offset and a
+# length into its pool)
+TWAININFO_MAGIC = b"DTWINFO\0"
+TWAININFO_VERSION = 1
+TWAININFO_HEADER = struct.Struct("<8sHHI32sIIII")
+TWAININFO_ENTRY = struct.Struct("<32s16sIII")
+FIELD_FORMATS = {"q": "q", "i": "i", "d": "d", "s": "IH", "l": "IH"}
+
+# Separators of the twaininfo.txt sections
+SECTION_END = "-1000"
+ENUM_GROUP_END = "-9999"
+
+# Where the sources and the cache are looked up
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def twaininfo_source(module_dir=MODULE_DIR):
+    """
+    Find the twaininfo.txt to compile when no path is given.
+
+    Parameters:
+        module_dir (str): The directory holding the variant folders.
+
+    Returns:
+        str or None: The path of the first twaininfo.txt that exists, or None if there is none.
+    """
+    for source in TWAININFO_SOURCES:
+        source_path = os.path.join(module_dir, source)
+        if os.path.isfile(source_path):
+            return source_path
+    return None
+
+def triplet_key(dg, dat, msg):
+    # DG, DAT and MSG packed into one sortable key; DAT and MSG are 16-bit in TWAIN
+    return (dg << 32) | ((dat & 0xFFFF) << 16) | (msg & 0xFFFF)
+
+def bracketed_ints(text):
+    # "[1 4 8]" or "1 4 8" -> [1, 4, 8]
+    return [int(value) for value in text.strip("[] ").split()]
+
+def parse_twaininfo(text):
+    """
+    Split the text of twaininfo.txt into its tables.
+
+    Parameters:
+        text (str): The contents of twaininfo.txt.
+
+    Returns:
+        dict: Table name to (field spec, list of records). Each record is a tuple whose first
+            item is the int key the table is searched by.
+
+    Raises:
+        ValueError: If a section is missing or a line cannot be read.
+    """
+    lines = [(number, line.split(), line) for number, line in enumerate(text.splitlines(), 1)]
+    # The first line is a warning not to edit the file
+    lines = [line for line in lines[1:] if line[1]]
+    position = 0
+
+    def section(is_end):
+        nonlocal position
+        rows = []
+        while position < len(lines):
+            number, tokens, line = lines[position]
+            position += 1
+            if is_end(tokens):
+                return rows
+            rows.append((number, tokens, line))
+        raise ValueError("twaininfo.txt ends in the middle of a section")
+
+    tables = {}
+    try:
+        rows = section(lambda tokens: tokens[0] == SECTION_END)
+        tables["triplets"] = ("qiiiiii", [(triplet_key(*values[:3]),) + tuple(values)
+                                          for values in ([int(token) for token in tokens[:6]]
+                                                         for _, tokens, _ in rows)])
+
+        rows = section(lambda tokens: tokens[:2] == [SECTION_END, SECTION_END])
+        for table, code in (("dg", "8890"), ("dat", "8891"), ("msg", "8892")):
+            tables[table] = ("qs", [(int(tokens[1]), tokens[2]) for _, tokens, _ in rows if tokens[0] == code])
+
+        for table in ("languages", "countries"):
+            rows = section(lambda tokens: tokens[0] == SECTION_END)
+            tables[table] = ("qs", [(int(tokens[0]), " ".join(tokens[1:])) for _, tokens, _ in rows])
+
+        rows = section(lambda tokens: tokens[0] == SECTION_END)
+        tables["capabilities"] = ("qsiii", [(int(tokens[0]), tokens[1], int(tokens[2]), int(tokens[3]), int(tokens[4]))
+                                            for _, tokens, _ in rows])
+
+        rows = section(lambda tokens: tokens == ["-1", "0"])
+        tables["bitdepths"] = ("ql", [(int(tokens[0]), [int(token) for token in tokens[1:]]) for _, tokens, _ in rows])
+
+        rows = section(lambda tokens: tokens == ["-1", "0"])
+        tables["pagesizes"] = ("qsdddd", [(int(tokens[0]), tokens[1])
+                                          + tuple(float(value) for value in line[line.index("[") + 1:line.index("]")].split())
+                                          for _, tokens, line in rows])
+
+        rows = section(lambda tokens: tokens == ["-1"])
+        tables["fileformats"] = ("qss", [(int(tokens[0]), tokens[1], " ".join(tokens[2:])) for _, tokens, _ in rows])
+
+        # Enum name tables, one per TWAIN type, until the conversion table whose lines start with "["
+        groups = [[]]
+        rows = section(lambda tokens: tokens[0].startswith("["))
+        position -= 1
+        for _, tokens, _ in rows:
+            if tokens[0] == ENUM_GROUP_END:
+                groups.append([])
+            else:
+                groups[-1].append((int(tokens[0]), tokens[1]))
+        groups = [group for group in groups if group]
+        tables["enumgroups"] = ("qs", [(index, group[0][1].split("_")[0]) for index, group in enumerate(groups)])
+        for index, group in enumerate(groups):
+            tables[f"enum/{index}"] = ("qs", group)
+
+        # "[250 251] Adobe PDF [1 8 16 24] [[32 24]]": file types, name, bit depths, depth conversions
+        rows = section(lambda tokens: tokens[0] == "END")
+        conversions = []
+        for number, tokens, line in rows:
+            match = re.match(r"\[([^\]]*)\]\s*(.*?)\s*\[([^\[\]]*)\]\s*\[(.*)\]\s*$", line.strip())
+            if match is None:
+                raise ValueError(f"line {number}: not a conversion entry")
+            pairs = [value for pair in re.findall(r"\[([^\[\]]*)\]", match.group(4)) for value in bracketed_ints(pair)]
+            for file_type in bracketed_ints(match.group(1)):
+                conversions.append((file_type, match.group(2), bracketed_ints(match.group(3)), pairs))
+        tables["conversions"] = ("qsll", conversions)
+    except (IndexError, ValueError) as e:
+        number = lines[max(position - 1, 0)][0] if lines else 0
+        raise ValueError(f"twaininfo.txt line {number}: {e}") from None
+    return tables
+
+def compile_twaininfo(source_path, cache_path):
+    """
+    Compile twaininfo.txt into the binary layout read by TwainInfo.
+
+    Parameters:
+        source_path (str): The twaininfo.txt to compile.
+        cache_path (str): The file to write; it is replaced in one rename.
+
+    Returns:
+        str: cache_path.
+    """
+    with open(source_path, "rb") as source:
+        raw = source.read()
+    tables = parse_twaininfo(raw.decode("latin-1"))
+
+    strings = bytearray()
+    string_offsets = {}
+    ints = []
+
+    def add_string(text):
+        if text not in string_offsets:
+            string_offsets[text] = len(strings)
+            strings.extend(text.encode("latin-1"))
+        return string_offsets[text], len(text)
+
+    directory = []
+    body = bytearray()
+    table_start = TWAININFO_HEADER.size + TWAININFO_ENTRY.size * len(tables)
+    for name, (spec, records) in tables.items():
+        record = struct.Struct("<" + "".join(FIELD_FORMATS[field] for field in spec))
+        offset = table_start + len(body)
+        # Sorted by key; equal keys keep their order in the text
+        for values in sorted(records, key=lambda values: values[0]):
+            fields = []
+            for field, value in zip(spec, values):
+                if field == "s":
+                    fields.extend(add_string(value))
+                elif field == "l":
+                    fields.extend((len(ints), len(value)))
+                    ints.extend(value)
+                else:
+                    fields.append(value)
+            body.extend(record.pack(*fields))
+        directory.append(TWAININFO_ENTRY.pack(name.encode(), spec.encode(), offset, len(records), record.size))
+
+    strings_offset = table_start + len(body)
+    ints_offset = strings_offset + len(strings)
+    header = TWAININFO_HEADER.pack(TWAININFO_MAGIC, TWAININFO_VERSION, 0, len(tables), hashlib.sha256(raw).digest(),
+                                   strings_offset, len(strings), ints_offset, len(ints))
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as output:
+        output.write(header)
+        output.write(b"".join(directory))
+        output.write(body)
+        output.write(strings)
+        output.write(struct.pack(f"<{len(ints)}i", *ints))
+    os.replace(temp_path, cache_path)
+    return cache_path
+
+class TwainInfo:
+    """
+    Read-only view of a compiled twaininfo file through a memory map. Nothing is decoded until
+    it is looked up, and each lookup is a binary search on the record keys.
+    """
+    def __init__(self, cache_path):
+        with open(cache_path, "rb") as cache_file:
+            self.data = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, table_count, self.sha256,
+         self.strings_offset, _, self.ints_offset, _) = TWAININFO_HEADER.unpack_from(self.data)
+        if magic != TWAININFO_MAGIC or version != TWAININFO_VERSION:
+            self.data.close()
+            raise ValueError(f"{cache_path} is not a version {TWAININFO_VERSION} twaininfo cache")
+        self.tables = {}
+        for index in range(table_count):
+            name, spec, offset, count, size = TWAININFO_ENTRY.unpack_from(
+                self.data, TWAININFO_HEADER.size + index * TWAININFO_ENTRY.size)
+            spec = spec.rstrip(b"\0").decode()
+            record = struct.Struct("<" + "".join(FIELD_FORMATS[field] for field in spec))
+            self.tables[name.rstrip(b"\0").decode()] = (spec, record, offset, count)
+        self.enum_groups = {}
+        for index, prefix in self.records("enumgroups"):
+            self.enum_groups.setdefault(prefix, []).append(f"enum/{index}")
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def decode(self, spec, fields):
+        # Resolve string and int-list references into the pools
+        values = []
+        fields = iter(fields)
+        for field in spec:
+            value = next(fields)
+            if field == "s":
+                start = self.strings_offset + value
+                value = self.data[start:start + next(fields)].decode("latin-1")
+            elif field == "l":
+                count = next(fields)
+                value = list(struct.unpack_from(f"<{count}i", self.data, self.ints_offset + 4 * value))
+            values.append(value)
+        return tuple(values)
+
+    def search(self, table, key):
+        """
+        Find the first record of a table with a key.
+
+        Parameters:
+            table (str): The table name.
+            key (int): The key the table is sorted by.
+
+        Returns:
+            int or None: The index of the record, or None if no record has the key.
+        """
+        _, record, offset, count = self.tables[table]
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from("<q", self.data, offset + middle * record.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < count and struct.unpack_from("<q", self.data, offset + low * record.size)[0] == key:
+            return low
+        return None
+
+    def record(self, table, index):
+        spec, record, offset, _ = self.tables[table]
+        return self.decode(spec, record.unpack_from(self.data, offset + index * record.size))
+
+    def lookup(self, table, key):
+        """
+        Look up the first record of a table with a key.
+
+        Parameters:
+            table (str): The table name, e.g. "capabilities".
+            key (int): Its key, e.g. a capability number.
+
+        Returns:
+            tuple or None: The record, key first, or None if there is none.
+        """
+        index = self.search(table, key)
+        return None if index is None else self.record(table, index)
+
+    def lookup_all(self, table, key):
+        """
+        Look up every record of a table with a key, in the order of the text.
+
+        Returns:
+            list: The records, key first.
+        """
+        index = self.search(table, key)
+        found = []
+        while index is not None and index < self.tables[table][3]:
+            values = self.record(table, index)
+            if values[0] != key:
+                break
+            found.append(values)
+            index += 1
+        return found
+
+    def records(self, table):
+        """
+        Iterate over every record of a table in key order.
+        """
+        for index in range(self.tables[table][3]):
+            yield self.record(table, index)
+
+    def name(self, table, value):
+        """
+        Name a value from the dg, dat, msg, languages or countries table.
+
+        Returns:
+            str or None: The name, or None if the value is not in the table.
+        """
+        values = self.lookup(table, value)
+        return None if values is None else values[1]
+
+    def triplet(self, dg, dat, msg):
+        """
+        Look up a DG/DAT/MSG triplet.
+
+        Returns:
+            tuple or None: (dg, dat, msg, and the three values after them), or None if unknown.
+        """
+        values = self.lookup("triplets", triplet_key(dg, dat, msg))
+        return None if values is None else values[1:]
+
+    def enum_names(self, prefix, value):
+        """
+        Name a value of a TWAIN type from the enum tables, e.g. ("TWPT", 2) -> ("TWPT_RGB",).
+
+        Returns:
+            tuple: The names from every table of that prefix (TWPF has two); empty if none.
+        """
+        return tuple(values[1] for table in self.enum_groups.get(prefix, ())
+                     for values in self.lookup_all(table, value))
+
+def cache_path_for(digest, cache_dir=None):
+    return os.path.join(cache_dir or os.path.join(MODULE_DIR, TWAININFO_CACHE_DIR), f"twaininfo-{digest[:16]}.bin")
+
+def open_twaininfo(source_path=None, cache_dir=None):
+    """
+    Open the compiled form of a twaininfo.txt, compiling it first if there is no compiled file
+    for the current contents of the text.
+
+    Parameters:
+        source_path (str): The twaininfo.txt. Defaults to the first of TWAININFO_SOURCES.
+        cache_dir (str): Where compiled files are kept. Defaults to TWAININFO_CACHE_DIR next to
+            this module, or the temporary directory if that cannot be written.
+
+    Returns:
+        TwainInfo: The memory-mapped tables.
+    """
+    source_path = source_path or twaininfo_source()
+    if source_path is None:
+        raise FileNotFoundError(f"None of {', '.join(TWAININFO_SOURCES)} was found")
+    with open(source_path, "rb") as source:
+        digest = hashlib.sha256(source.read()).hexdigest()
+    cache_path = cache_path_for(digest, cache_dir)
+    try:
+        info = TwainInfo(cache_path)
+        if info.sha256.hex() == digest:
+            return info
+        info.close()
+    except (OSError, ValueError, struct.error):
+        pass
+    try:
+        compile_twaininfo(source_path, cache_path)
+    except OSError:
+        cache_path = cache_path_for(digest, os.path.join(tempfile.gettempdir(), TWAININFO_CACHE_DIR))
+        compile_twaininfo(source_path, cache_path)
+    return TwainInfo(cache_path)
+
+if __name__ == "__main__":
+    source_path = sys.argv[1] if len(sys.argv) > 1 else twaininfo_source()
+    if source_path is None:
+        print(f"None of {', '.join(TWAININFO_SOURCES)} was found. Pass the twaininfo.txt to compile.")
+        sys.exit(1)
+    with open_twaininfo(source_path) as info:
+        enum_tables = [name for name in info.tables if name.startswith("enum/")]
+        print(f"{source_path}: {len(info.data)} bytes compiled, sha256 {info.sha256.hex()[:16]}")
+        for name, (spec, record, _, count) in info.tables.items():
+            if not name.startswith("enum/"):
+                print(f"  {name:13} {count:5} records of {record.size} bytes ({spec})")
+        print(f"  {len(enum_tables)} enum tables, {sum(info.tables[name][3] for name in enum_tables)} names")
@@ -0,0 +1,274 @@
+# name: test_dtwain_pull
+# author: joshua dwight
+# github/jadwight
+
+# this module tests dtwain_pull against a local bare repository shaped like twain_library, built by
+# dtwain_bench.make_bare_repository and cloned over file://, so it needs git but no network.
+
+# usage: python -m pytest test_dtwain_pull.py
+#        python -m unittest test_dtwain_pull
+
+# imports
+import io
+import os
+import asyncio
+import contextlib
+import shutil
+import tempfile
+import unittest
+
+import git
+
+import dtwain_bench
+import dtwain_pull
+
+# Small binaries keep each clone short; the tests check what is checked out, not how fast
+FIXTURE_BINARY_SIZE = 64 * 1024
+FIXTURE_COMMITS = 3
+FIXTURE_SOURCE_FILES = 5
+
+# The fixture repository, built once for the module
+fixture_root = None
+repo_url = None
+
+def setUpModule():
+    global fixture_root, repo_url
+    fixture_root = tempfile.mkdtemp()
+    repo_url = dtwain_bench.make_bare_repository(fixture_root, FIXTURE_COMMITS, FIXTURE_BINARY_SIZE,
+                                                 source_files=FIXTURE_SOURCE_FILES)
+
+def tearDownModule():
+    shutil.rmtree(fixture_root, ignore_errors=True)
+
+def quiet_progress():
+    return dtwain_pull.Progress(dtwain_pull.SilentProgressSink())
+
+class CloneStrategyTests(unittest.TestCase):
+    def test_every_strategy_checks_out_the_manifest_files(self):
+        manifests = dtwain_pull.dtwain_manifests
+        sparse_paths = dtwain_pull.sparse_checkout_paths(manifests)
+        head = dtwain_pull.remote_head(repo_url)
+        for strategy in dtwain_pull.CLONE_STRATEGIES:
+            with self.subTest(strategy=strategy), tempfile.TemporaryDirectory() as clone_root:
+                local_path = os.path.join(clone_root, "twain_library")
+                repo = dtwain_pull.clone_repository(repo_url, local_path, strategy, sparse_paths, quiet_progress())
+                self.assertEqual(repo.head.commit.hexsha, head)
+                index = dtwain_pull.build_file_index(local_path)
+                self.assertIn("release_libraries.zip", index)
+                missing = dtwain_pull.classify_checkout(manifests, local_path, "release_libraries.zip", index)[1]
+                self.assertEqual(missing, {})
+
+    def test_shallow_clones_leave_out_the_history(self):
+        for strategy in ("shallow", "sparse"):
+            with self.subTest(strategy=strategy), tempfile.TemporaryDirectory() as clone_root:
+                local_path = os.path.join(clone_root, "twain_library")
+                repo = dtwain_pull.clone_repository(repo_url, local_path, strategy,
+                                                    dtwain_pull.sparse_checkout_paths(dtwain_pull.dtwain_manifests),
+                                                    quiet_progress())
+                self.assertEqual(len(list(repo.iter_commits())), 1)
+
+    def test_sparse_clone_leaves_out_unrelated_files(self):
+        with tempfile.TemporaryDirectory() as clone_root:
+            local_path = os.path.join(clone_root, "twain_library")
+            dtwain_pull.clone_repository(repo_url, local_path, "sparse",
+                                         dtwain_pull.sparse_checkout_paths(dtwain_pull.dtwain_manifests),
+                                         quiet_progress())
+            self.assertNotIn("module.cpp", dtwain_pull.build_file_index(local_path))
+            self.assertFalse(os.path.exists(os.path.join(local_path, "source")))
+
+    def test_unknown_strategy_is_rejected(self):
+        with tempfile.TemporaryDirectory() as clone_root:
+            with self.assertRaises(ValueError):
+                dtwain_pull.clone_repository(repo_url, os.path.join(clone_root, "twain_library"), "mirror")
+
+class PipelineTests(unittest.TestCase):
+    def setUp(self):
+        # Each refresh publishes into the current directory, so every test gets its own
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+
+    def refresh(self, work_dir, use_async):
+        os.chdir(work_dir)
+        run = dtwain_pull.new_run(dtwain_pull.dtwain_manifests, repo_url, progress=quiet_progress())
+        if use_async:
+            asyncio.run(dtwain_pull.run_pipeline_async(run))
+        else:
+            dtwain_pull.run_stages(run, ("fetch", "extract", "package", "publish"))
+        return run
+
+    def test_async_pipeline_publishes_what_run_stages_does(self):
+        snapshots = {}
+        for use_async in (False, True):
+            with tempfile.TemporaryDirectory() as work_dir:
+                run = self.refresh(work_dir, use_async)
+                self.assertFalse(run["up_to_date"])
+                self.assertEqual(run["missing"], {})
+                snapshots[use_async] = dtwain_bench.published_snapshot(dtwain_pull.dtwain_manifests)
+                os.chdir(fixture_root)
+        self.assertEqual(set(snapshots[True]["folders"]), set(dtwain_pull.dtwain_manifests))
+        self.assertEqual(snapshots[True], snapshots[False])
+
+    def test_async_pipeline_writes_the_variant_shims(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            self.refresh(work_dir, True)
+            shims = dtwain_pull.variant_shims(dtwain_pull.dtwain_manifests)
+            for variant, text in shims.items():
+                with open(os.path.join(variant, "dtwain.py"), 'r') as shim_file:
+                    self.assertEqual(shim_file.read(), text + "\n")
+            os.chdir(fixture_root)
+
+    def test_variants_get_the_full_dtwain_py_without_a_shared_folder(self):
+        manifests = {"dtwain_x64": ["dtwain64.dll", "twaininfo.txt"]}
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            dtwain_pull.run_stages(dtwain_pull.new_run(manifests, repo_url, progress=quiet_progress()),
+                                   ("fetch", "extract", "package", "publish"))
+            with open(os.path.join("dtwain_x64", "dtwain.py"), 'r') as module_file:
+                self.assertNotIn(dtwain_pull.SHARED_CONSTANTS, module_file.read())
+            # With a shared dtwain.py in place the variant gets a shim again
+            os.makedirs(dtwain_pull.SHARED_CONSTANTS)
+            with open(os.path.join(dtwain_pull.SHARED_CONSTANTS, "dtwain.py"), 'w') as shared_file:
+                shared_file.write("DTWAIN_FF_TIFF = 0\n")
+            run = dtwain_pull.new_run(manifests, repo_url, progress=quiet_progress())
+            dtwain_pull.run_stages(run, ("fetch", "extract", "package", "publish"))
+            self.assertFalse(run["up_to_date"])
+            with open(os.path.join("dtwain_x64", "dtwain.py"), 'r') as module_file:
+                self.assertEqual(module_file.read(), dtwain_pull.variant_shims(manifests)["dtwain_x64"] + "\n")
+            os.chdir(fixture_root)
+
+    def test_async_pipeline_finds_an_unchanged_upstream_up_to_date(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            self.refresh(work_dir, True)
+            run = self.refresh(work_dir, True)
+            self.assertTrue(run["up_to_date"])
+            self.assertNotIn("extract+package", run["timings"])
+            os.chdir(fixture_root)
+
+class ProgressTests(unittest.TestCase):
+    def test_transfer_sizes_are_read_in_every_unit(self):
+        events = []
+        sink = dtwain_pull.SilentProgressSink()
+        sink.emit = events.append
+        progress = dtwain_pull.Progress(sink, rate=0)
+        receiving = git.RemoteProgress.RECEIVING
+        progress.update(receiving | git.RemoteProgress.BEGIN, 1, 3, "224 bytes | 224.00 KiB/s")
+        progress.update(receiving, 2, 3, "12.50 MiB | 3.10 MiB/s")
+        progress.update(receiving | git.RemoteProgress.END, 3, 3, "1.00 GiB | 0 bytes/s")
+        self.assertEqual([(event["bytes"], event["bytes_per_second"]) for event in events],
+                         [(224, 224 * 1024), (int(12.5 * 1024 ** 2), int(3.1 * 1024 ** 2)), (1024 ** 3, 0)])
+
+class IntegrityTests(unittest.TestCase):
+    def test_verify_skips_the_files_the_manifest_skips(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "dtwain64.dll"), 'wb') as dll:
+                dll.write(os.urandom(4096))
+            # Left behind by an interrupted atomic write
+            with open(os.path.join(folder, "dtwain64.ini.tmp"), 'w') as leftover:
+                leftover.write("partial")
+            dtwain_pull.write_integrity_manifest(folder, workers=1)
+            report = dtwain_pull.verify_integrity(folder)
+            self.assertEqual(report["ok"], ["dtwain64.dll"])
+            self.assertEqual(report["extra"], [])
+            with open(os.path.join(folder, "notes.txt"), 'w') as extra:
+                extra.write("not delivered")
+            self.assertEqual(dtwain_pull.verify_integrity(folder)["extra"], ["notes.txt"])
+
+class DeltaTests(unittest.TestCase):
+    def round_trip(self, old_path, new_path, work_dir):
+        delta = dtwain_pull.make_delta(old_path, new_path, 512)
+        output_path = os.path.join(work_dir, "patched")
+        dtwain_pull.apply_delta(old_path, delta, output_path)
+        with open(output_path, 'rb') as patched, open(new_path, 'rb') as expected:
+            self.assertEqual(patched.read(), expected.read())
+        return delta
+
+    def test_deltas_rebuild_files_larger_than_the_window(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            old_path = os.path.join(work_dir, "old.dll")
+            edited_path = os.path.join(work_dir, "edited.dll")
+            other_path = os.path.join(work_dir, "other.dll")
+            with open(old_path, 'wb') as old_file:
+                old_file.write(os.urandom(3 * dtwain_pull.DELTA_WINDOW + 1000))
+            with open(other_path, 'wb') as other_file:
+                other_file.write(os.urandom(2 * dtwain_pull.DELTA_WINDOW + 7))
+            dtwain_bench.mutate_file(old_path, edited_path)
+            size = os.path.getsize(edited_path)
+            # A few edits cost a few blocks each, not the file
+            self.assertLess(len(self.round_trip(old_path, edited_path, work_dir)), size // 20)
+            self.round_trip(old_path, other_path, work_dir)
+            self.round_trip(None, edited_path, work_dir)
+            self.round_trip(old_path, old_path, work_dir)
+
+class VersionTests(unittest.TestCase):
+    def test_version_errors_exit_with_status_1(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            versions_dir = os.path.join(work_dir, "versions")
+            dtwain_pull.install_version("v1.0.0", dtwain_pull.dtwain_manifests, repo_url,
+                                        os.path.join(work_dir, "twain_library_tags"), versions_dir,
+                                        os.path.join(work_dir, "store"), progress=quiet_progress())
+            dtwain_pull.use_version("v1.0.0", versions_dir)
+            with contextlib.redirect_stderr(io.StringIO()) as errors:
+                self.assertEqual(dtwain_pull.main(["--use-version", "nope", "--versions", versions_dir]), 1)
+                self.assertEqual(dtwain_pull.main(["--remove-version", "v1.0.0", "--versions", versions_dir]), 1)
+            self.assertIn("nope is not installed", errors.getvalue())
+            self.assertIn("v1.0.0 is the current version", errors.getvalue())
+            self.assertEqual(dtwain_pull.current_version(versions_dir), "v1.0.0")
+
+@unittest.skipUnless(os.name == "posix", "the flaky remote is an executable script")
+class ResumableCloneTests(unittest.TestCase):
+    # The remote cuts this many connections part way through the pack
+    failures = 2
+
+    def test_dropped_fetches_are_retried(self):
+        head = dtwain_pull.remote_head(repo_url)
+        with tempfile.TemporaryDirectory() as work_dir:
+            with dtwain_bench.flaky_remote(work_dir, self.failures) as state:
+                repo = dtwain_pull.resumable_clone(repo_url, os.path.join(work_dir, "twain_library"), "full",
+                                                   progress=quiet_progress(), retries=self.failures + 1,
+                                                   backoff=0.01)
+                self.assertGreater(dtwain_bench.connections_made(state), self.failures)
+            self.assertEqual(repo.head.commit.hexsha, head)
+            self.assertEqual(len(list(repo.iter_commits())), FIXTURE_COMMITS)
+            self.assertIn("release_libraries.zip", dtwain_pull.build_file_index(repo.working_tree_dir))
+
+    def clone_until_done(self, clone, local_path):
+        # Call clone until it succeeds, as a user would rerun an interrupted refresh
+        runs = 0
+        while True:
+            runs += 1
+            try:
+                clone()
+                return runs
+            except git.GitCommandError:
+                self.assertLessEqual(runs, self.failures)
+                # What was fetched before the cut stays on disk for the next call
+                self.assertTrue(os.path.isdir(os.path.join(local_path, ".git")))
+
+    def test_interrupted_clone_resumes_on_the_next_call(self):
+        head = dtwain_pull.remote_head(repo_url)
+        with tempfile.TemporaryDirectory() as work_dir:
+            local_path = os.path.join(work_dir, "twain_library")
+            with dtwain_bench.flaky_remote(work_dir, self.failures):
+                runs = self.clone_until_done(
+                    lambda: dtwain_pull.resumable_clone(repo_url, local_path, "full", progress=quiet_progress(),
+                                                        retries=1),
+                    local_path)
+            self.assertGreater(runs, 1)
+            repo = git.Repo(local_path)
+            self.assertEqual(repo.head.commit.hexsha, head)
+            self.assertEqual(len(list(repo.iter_commits())), FIXTURE_COMMITS)
+
+    def test_pull_resumes_an_interrupted_clone(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            local_path = os.path.join(work_dir, "twain_library")
+            with dtwain_bench.flaky_remote(work_dir, self.failures):
+                runs = self.clone_until_done(
+                    lambda: dtwain_pull.pull_latest_from_repository(repo_url, local_path, "shallow",
+                                                                    progress=quiet_progress(), resumable=True,
+                                                                    retries=1),
+                    local_path)
+            self.assertGreater(runs, 1)
+            self.assertEqual(git.Repo(local_path).head.commit.hexsha, dtwain_pull.remote_head(repo_url))
+
+if __name__ == "__main__":
+    unittest.main()